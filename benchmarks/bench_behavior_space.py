@@ -0,0 +1,80 @@
+"""Benchmark: archive insertion and cell lookup per behavior space.
+
+Times `MapElitesArchive.insert` for grid and CVT behavior spaces as the
+number of dimensions grows, to check that CVT-MAP-Elites keeps per-elite
+insertion in the sub-millisecond range at 1e5 insertions.
+
+Usage:
+    python benchmarks/bench_behavior_space.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+_package_root = Path(__file__).resolve().parent.parent
+if str(_package_root) not in sys.path:
+    sys.path.insert(0, str(_package_root))
+
+from models.schemas import DiversityScores, Proposal
+from stages.diversity_archive import MapElitesArchive
+from utils.behavior_space import BehaviorDimension, CvtBehaviorSpace, GridBehaviorSpace
+
+N_INSERTS = 100_000
+EXTRA_DIMENSIONS = [0, 2, 5]  # Descriptors beyond the three LLM-scored ones
+CVT_CENTROIDS = 1024
+
+_BASE = ["paradigm_novelty", "structural_complexity", "migration_distance"]
+
+
+def _dimensions(extra: int) -> list[BehaviorDimension]:
+    names = _BASE + [f"extra_{i}" for i in range(extra)]
+    return [BehaviorDimension(name=name) for name in names]
+
+
+def _run(archive: MapElitesArchive, extra: int, rng: np.random.Generator) -> float:
+    proposal = Proposal.model_construct(architecture_name="bench", components=[], data_flow=[])
+    scores = [
+        DiversityScores.model_construct(
+            architecture_name="bench",
+            paradigm_novelty=int(rng.integers(1, 6)),
+            structural_complexity=int(rng.integers(1, 6)),
+            migration_distance=int(rng.integers(1, 6)),
+            quality_heuristic=float(rng.uniform(0, 10)),
+        )
+        for _ in range(N_INSERTS)
+    ]
+    extras = rng.uniform(1, 5, size=(N_INSERTS, extra))
+    descriptors = [
+        {f"extra_{i}": float(v) for i, v in enumerate(row)} for row in extras
+    ]
+    start = time.perf_counter()
+    for ds, values in zip(scores, descriptors):
+        archive.insert(proposal, ds, values)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'space':>6} {'dims':>5} {'cells':>12} {'build (s)':>10} {'us/insert':>10} {'occupied':>9}")
+    for extra in EXTRA_DIMENSIONS:
+        dims = _dimensions(extra)
+        for label, make in (
+            ("grid", lambda: GridBehaviorSpace(dims)),
+            ("cvt", lambda: CvtBehaviorSpace(dims, n_centroids=CVT_CENTROIDS)),
+        ):
+            start = time.perf_counter()
+            space = make()
+            build = time.perf_counter() - start
+            archive = MapElitesArchive(space=space)
+            elapsed = _run(archive, extra, rng)
+            print(
+                f"{label:>6} {len(dims):>5} {space.n_cells:>12} {build:>10.2f} "
+                f"{elapsed / N_INSERTS * 1e6:>10.1f} {archive.coverage:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
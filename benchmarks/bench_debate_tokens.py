@@ -0,0 +1,98 @@
+"""Benchmark: input-token footprint of one structured debate per context mode.
+
+Runs `run_debate_for_proposal` against the real enterprise context with a
+canned LLM (no network) that returns fixed-length arguments, and reports
+the estimated input tokens per mode (`estimate_tokens`, ~4 chars/token).
+
+Usage:
+    python benchmarks/bench_debate_tokens.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+_package_root = Path(__file__).resolve().parent.parent
+if str(_package_root) not in sys.path:
+    sys.path.insert(0, str(_package_root))
+
+import stages.structured_debate as structured_debate
+from mcp_client.context_gatherer import gather_enterprise_context
+from models.schemas import (
+    AnnotatedProposal, ArgumentText, Component, ConstraintAnnotation, DataFlowStep,
+    DebateJudgment, RefinedProposal, Risk, SteelMan,
+)
+from utils.debate_context import CONTEXT_MODES
+
+ARGUMENT_SENTENCES = 25  # Roughly the length of a real debate argument
+
+_SENTENCE = "The event log decouples producers from consumers and bounds the blast radius of schema changes. "
+
+
+async def _canned_llm(system_prompt, user_message, response_model, temperature=0.5,
+                      max_retries=None, stage=None):
+    text = _SENTENCE * ARGUMENT_SENTENCES
+    if response_model is ArgumentText:
+        return ArgumentText(text=text)
+    if response_model is SteelMan:
+        return SteelMan(agent_role="advocate", steel_man_of_opposition=text, final_argument=text)
+    return DebateJudgment(
+        architecture_name="", innovation_defense_strength=6, status_quo_weakness_exposed=6,
+        risk_mitigation_quality=6, debate_winner="innovation", key_insight="",
+        residual_concerns=[],
+    )
+
+
+def _sample_proposal() -> AnnotatedProposal:
+    names = ["Event Gateway", "Kafka Log", "Stream Processor", "Feature Store",
+             "Warehouse Sink", "Schema Registry", "Replay Service", "Metrics API"]
+    components = [
+        Component(name=n, role=f"{n} handles its part of the event pipeline end to end.",
+                  technology_suggestion="Kafka" if "Kafka" in n else None)
+        for n in names
+    ]
+    flow = [
+        DataFlowStep(step_number=i + 1, from_component=a, to_component=b,
+                     description=f"{a} publishes validated events to {b}.", pattern="pub-sub")
+        for i, (a, b) in enumerate(zip(names, names[1:]))
+    ]
+    proposal = RefinedProposal(
+        architecture_name="Log-Centric Event Mesh",
+        core_thesis="Make the append-only event log the system of record and derive every view from it.",
+        components=components,
+        data_flow=flow,
+        key_innovations=[f"Innovation {i}: derived views are rebuilt from the log on demand." for i in range(4)],
+        assumptions=[f"Assumption {i}: producers can emit schema-versioned events." for i in range(4)],
+        risks=[Risk(description=f"Risk {i}: consumer lag during peak load.", severity="medium",
+                    mitigation="Autoscale consumers on lag.") for i in range(3)],
+        paradigm_source="event-sourcing",
+        refinements_made=[],
+        refinement_round=1,
+    )
+    annotations = [
+        ConstraintAnnotation(constraint_type="resource_limits",
+                             description=f"Finding {i}: peak burst exceeds the sink's write rate.",
+                             severity="warning", affected_components=["Warehouse Sink"],
+                             suggested_mitigation="Batch writes through the log.")
+        for i in range(4)
+    ]
+    return AnnotatedProposal(proposal=proposal, annotations=annotations,
+                             hard_constraint_violations=0, overall_feasibility_note="Feasible with batching.")
+
+
+def main() -> None:
+    structured_debate.call_llm = _canned_llm
+    enterprise_context = asyncio.run(gather_enterprise_context())
+    ap = _sample_proposal()
+    print(f"{'mode':>8} {'input tokens':>13} {'vs full':>8}")
+    baseline = None
+    for mode in CONTEXT_MODES:
+        result = asyncio.run(structured_debate.run_debate_for_proposal(
+            ap, enterprise_context, context_mode=mode,
+        ))
+        baseline = baseline or result.input_tokens
+        print(f"{mode:>8} {result.input_tokens:>13,} {result.input_tokens / baseline:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark: farthest-point selection time in the diversity archive.
+
+Compares the vectorized running-min-distance selection (utils/farthest_point.py)
+with the previous pure-Python loop that re-sorted all remaining cells on
+every pick. The legacy loop is only timed where it finishes in reasonable time.
+
+Usage:
+    python benchmarks/bench_diversity_selection.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+_package_root = Path(__file__).resolve().parent.parent
+if str(_package_root) not in sys.path:
+    sys.path.insert(0, str(_package_root))
+
+from utils.farthest_point import farthest_point_selection, prepare_descriptors
+
+SIZES = [1_000, 10_000, 100_000]
+K_VALUES = [10, 100]
+LEGACY_MAX_WORK = 2_000_000  # Skip the legacy loop beyond k * n * k of this size
+DIMENSIONS = 3
+
+
+def legacy_selection(points: list[tuple[float, ...]], k: int) -> list[int]:
+    """The pre-vectorization selection loop (sort remaining on every pick)."""
+    remaining = list(range(len(points)))
+    selected: list[int] = []
+    while len(selected) < k and remaining:
+        if not selected:
+            best = remaining.pop(0)
+        else:
+            def min_distance(i: int) -> float:
+                return min(
+                    sum((a - b) ** 2 for a, b in zip(points[i], points[s])) ** 0.5
+                    for s in selected
+                )
+
+            remaining.sort(key=lambda i: -min_distance(i))
+            best = remaining.pop(0)
+        selected.append(best)
+    return selected
+
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'candidates':>10} {'k':>5} {'vectorized (ms)':>16} {'legacy (ms)':>12}")
+    for n in SIZES:
+        points = rng.uniform(1, 5, size=(n, DIMENSIONS))
+        for k in K_VALUES:
+            X = prepare_descriptors(points, weights=[1.0, 0.5, 1.0], normalize="range")
+            vectorized = _time(lambda: farthest_point_selection(X, k))
+            if k * n * k <= LEGACY_MAX_WORK:
+                as_tuples = [tuple(row) for row in points]
+                legacy = f"{_time(lambda: legacy_selection(as_tuples, k), repeat=1) * 1000:12.1f}"
+            else:
+                legacy = f"{'skipped':>12}"
+            print(f"{n:>10} {k:>5} {vectorized * 1000:16.2f} {legacy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -130,6 +130,7 @@ STAGES = [
     ("0b", "Prompt Enhancement", "✨"),
     ("1", "Paradigm Agents", "🧠"),
     ("2", "Mutation Engine", "🧬"),
+    ("2.2", "Near-Duplicate Filter", "🪞"),
     ("2.5", "Diversity Archive", "🌈"),
     ("3", "Self-Refinement", "💎"),
     ("4", "Physics Critic", "⚖️"),
@@ -274,6 +275,8 @@ with tab2:
                         "business_alignment_score": p.get("business_alignment_score", 0),
                         "migration_complexity_score": p.get("migration_complexity_score", 0),
                         "composite_score": p.get("composite_score", 0),
+                        "pareto_rank": p.get("pareto_rank"),
+                        "first_place_probability": p.get("first_place_probability"),
                         "summary": p.get("one_line_summary", "")
                     })
 
@@ -331,13 +334,18 @@ with tab2:
                     tier = proposal["tier"].replace("_", " ").title()
                     tier_emoji = {"Conservative": "🛡️", "Moderate": "⚖️", "Radical": "🚀"}.get(tier.split()[0], "📋")
                     tier_label = f"{tier_emoji} {tier.upper()}"
+                    frontier_label = ""
+                    if proposal["pareto_rank"] is not None:
+                        frontier_label += f" &nbsp;|&nbsp; <strong>Pareto Rank:</strong> {proposal['pareto_rank']}"
+                    if proposal["first_place_probability"] is not None:
+                        frontier_label += f" &nbsp;|&nbsp; <strong>P(#1):</strong> {proposal['first_place_probability']:.0%}"
 
                     with st.container():
                         st.markdown(f"""
                         <div class="proposal-card">
                             <h3>{tier_label}</h3>
                             <h4 style="color: #666; margin-top: 0.5rem;">{arch_name}</h4>
-                            <p><strong>Composite Score:</strong> {proposal['composite_score']:.2f}/10</p>
+                            <p><strong>Composite Score:</strong> {proposal['composite_score']:.2f}/10{frontier_label}</p>
                             <p style="font-style: italic; color: #555;">{proposal['summary']}</p>
                         </div>
                         """, unsafe_allow_html=True)
@@ -456,6 +464,47 @@ with tab3:
         else:
             st.info("Portfolio not generated yet — radar chart will appear after the pipeline completes.")
 
+        # Pareto frontier and weight sensitivity
+        st.markdown("**Pareto Frontier & Weight Sensitivity**")
+        if portfolio_file_analytics.exists():
+            try:
+                with open(portfolio_file_analytics, 'r', encoding='utf-8') as f:
+                    frontier_proposals = json.load(f).get("proposals", [])
+                frontier_rows = [
+                    {
+                        "Proposal": fp.get("proposal", {}).get("proposal", {}).get("architecture_name", "Unknown"),
+                        "Innovation": fp.get("innovation_score", 0),
+                        "Feasibility": fp.get("feasibility_score", 0),
+                        "Composite": fp.get("composite_score", 0),
+                        "Pareto Rank": fp.get("pareto_rank"),
+                        "P(#1)": fp.get("first_place_probability") or 0.0,
+                    }
+                    for fp in frontier_proposals
+                ]
+                if frontier_rows and frontier_rows[0]["Pareto Rank"] is not None:
+                    df_frontier = pd.DataFrame(frontier_rows)
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        fig_frontier = px.scatter(
+                            df_frontier, x="Feasibility", y="Innovation",
+                            color=df_frontier["Pareto Rank"].astype(str), size="Composite",
+                            hover_name="Proposal", labels={"color": "Pareto Rank"},
+                        )
+                        fig_frontier.update_layout(height=400, xaxis=dict(range=[0, 10.5]), yaxis=dict(range=[0, 10.5]))
+                        st.plotly_chart(fig_frontier, width="stretch")
+                    with col2:
+                        df_first = df_frontier[df_frontier["P(#1)"] > 0].sort_values("P(#1)", ascending=True)
+                        fig_first = px.bar(
+                            df_first, x="P(#1)", y="Proposal", orientation="h",
+                            labels={"P(#1)": "Probability of ranking first over random weightings"},
+                        )
+                        fig_first.update_layout(height=400, xaxis=dict(tickformat=".0%"))
+                        st.plotly_chart(fig_first, width="stretch")
+                else:
+                    st.info("No frontier analysis in this portfolio (re-rank it with rerank.py to add one).")
+            except Exception:
+                st.warning("Could not load portfolio data for the frontier analysis.")
+
         st.markdown("---")
 
         # Proposals Funnel
@@ -1,3 +1,3 @@
-from .client import call_llm
+from .client import call_llm, estimate_tokens
 
-__all__ = ["call_llm"]
+__all__ = ["call_llm", "estimate_tokens"]
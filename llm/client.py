@@ -1,3 +1,4 @@
+import asyncio
 import instructor
 import litellm
 import yaml
@@ -6,6 +7,8 @@ from pathlib import Path
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
+from utils.tokens import estimate_tokens  # Re-exported for existing callers
+
 # Load environment variables from .env file
 _env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(_env_path)
@@ -19,6 +22,10 @@ _model_name = _config["llm"]["model"]
 _max_retries = _config["llm"].get("max_retries", 3)
 _api_base = _config["llm"].get("api_base")  # e.g. "http://localhost:11434" for Ollama
 _api_key_assignments = _config["llm"].get("api_key_assignments", {})
+_max_concurrency = _config["llm"].get("max_concurrent_requests_per_key", 4)
+
+# One semaphore per API key env var: stages sharing a key share its concurrency budget
+_semaphores: dict[str, asyncio.Semaphore] = {}
 
 # Set timeout for all models
 if _model_name.startswith("ollama"):
@@ -32,6 +39,13 @@ else:
 client = instructor.from_litellm(litellm.acompletion, mode=instructor.Mode.JSON)
 
 
+def _get_semaphore(key_name: str) -> asyncio.Semaphore:
+    """Return the shared concurrency limiter for an API key (created lazily)."""
+    if key_name not in _semaphores:
+        _semaphores[key_name] = asyncio.Semaphore(_max_concurrency)
+    return _semaphores[key_name]
+
+
 async def call_llm(
     system_prompt: str,
     user_message: str,
@@ -44,6 +58,10 @@ async def call_llm(
     Every call returns a validated Pydantic model.
     Supports both cloud APIs and local models (Ollama).
 
+    Concurrent calls are bounded per API key by
+    `llm.max_concurrent_requests_per_key`, so stages can safely issue
+    their calls with asyncio.gather.
+
     Args:
         stage: Optional stage name for API key distribution (e.g., 'paradigm_agents')
     """
@@ -63,10 +81,13 @@ async def call_llm(
         kwargs["api_base"] = _api_base
 
     # Use stage-specific API key if configured
+    key_name = "default"
     if stage and stage in _api_key_assignments:
         api_key_env_var = _api_key_assignments[stage]
         api_key = os.getenv(api_key_env_var)
         if api_key:
             kwargs["api_key"] = api_key
+            key_name = api_key_env_var
 
-    return await client.chat.completions.create(**kwargs)
+    async with _get_semaphore(key_name):
+        return await client.chat.completions.create(**kwargs)
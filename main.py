@@ -17,19 +17,28 @@ from mcp_client.context_gatherer import (
     gather_enterprise_context,
     gather_patterns_context,
     gather_paradigm_patterns,
+    retrieve_paradigm_patterns,
 )
 from stages.intent_agent import run_intent_agent
-from stages.prompt_enhancement import enhance_prompts
+from stages.prompt_enhancement import enhance_prompts, patterns_query
 from stages.paradigm_agents import run_paradigm_agents
 from stages.mutation_engine import run_mutations
-from stages.diversity_archive import run_diversity_archive
-from stages.self_refinement import run_self_refinement
+from stages.deduplication import run_deduplication
+from stages.diversity_archive import run_diversity_archive, select_elites
+from stages.evolution_loop import run_evolution
+from stages.self_refinement import DEFAULT_MIN_CHANGE, run_self_refinement
+from stages.rule_critic import run_rule_critic
+from stages.capacity_simulation import run_capacity_simulation, capacity_annotations
 from stages.physics_critic import run_physics_critic
-from stages.structured_debate import run_structured_debate
+from stages.structured_debate import run_structured_debate, full_debate_calls
 from stages.domain_critics import run_all_domain_critics
 from stages.portfolio_assembly import run_portfolio_assembly
+from utils.behavior_space import build_behavior_space
+from utils.lexical_novelty import build_novelty_prescorer
+from utils.operator_bandit import OperatorBandit
 from utils.report_renderer import render_portfolio_report
 from utils.progress_tracker import get_tracker
+from utils.tokens import estimate_tokens
 
 # Configure logging
 logging.basicConfig(
@@ -66,7 +75,9 @@ async def run_pipeline():
 
         # Fetch paradigm-specific patterns for prompt enhancement
         paradigm_patterns: dict[str, str] = {}
-        if pipeline_cfg.get("prompt_enhancement", {}).get("enabled", False):
+        enhancement_cfg = pipeline_cfg.get("prompt_enhancement", {})
+        patterns_mode = enhancement_cfg.get("patterns_mode", "full")
+        if enhancement_cfg.get("enabled", False) and patterns_mode == "full":
             logger.info("Fetching paradigm-specific patterns for prompt enhancement...")
             paradigm_patterns = await gather_paradigm_patterns(config)
 
@@ -93,6 +104,20 @@ async def run_pipeline():
         if pipeline_cfg.get("prompt_enhancement", {}).get("enabled", False) and intent_brief:
             tracker.start_stage("0b", "Prompt Enhancement")
             logger.info("Stage 0b: Enhancing paradigm agent prompts with intent + patterns...")
+            if patterns_mode == "retrieval":
+                retrieval_cfg = enhancement_cfg.get("retrieval", {})
+                paradigm_patterns = await retrieve_paradigm_patterns(
+                    patterns_query(intent_brief),
+                    config,
+                    top_k=retrieval_cfg.get("top_k", 6),
+                    token_budget=retrieval_cfg.get("token_budget", 1500),
+                    chunk_tokens=retrieval_cfg.get("chunk_tokens", 250),
+                    cache_dir=retrieval_cfg.get("cache_dir", "outputs/cache"),
+                )
+                logger.info(
+                    "  -> Retrieved patterns: "
+                    + ", ".join(f"{name} ~{estimate_tokens(text)} tokens" for name, text in paradigm_patterns.items())
+                )
             enriched_prompts = await enhance_prompts(intent_brief, paradigm_patterns)
             logger.info(f"  -> {len(enriched_prompts)} enriched prompts composed")
             tracker.end_stage("0b", outputs_count=len(enriched_prompts), success=True)
@@ -125,11 +150,23 @@ async def run_pipeline():
         # ── Stage 2: Idea Mutation ──
         tracker.start_stage("2", "Mutation Engine")
         logger.info("Stage 2: Applying mutation operators...")
+        mutation_cfg = pipeline_cfg["mutation"]
+        operator_bandit = None
+        if mutation_cfg.get("selection_policy", "random") != "random":
+            operator_bandit = OperatorBandit.load(
+                _package_root / mutation_cfg.get("operator_stats_path", "./outputs/operator_stats.json"),
+                operators=mutation_cfg["available_operators"],
+                policy=mutation_cfg["selection_policy"],
+                exploration=mutation_cfg.get("exploration", 1.0),
+            )
+            logger.info(f"  Operator selection: {operator_bandit.policy} — {operator_bandit.summary()}")
         mutated_proposals = await run_mutations(
             proposals=original_proposals,
-            operators_per_proposal=pipeline_cfg["mutation"]["operators_per_proposal"],
-            available_operators=pipeline_cfg["mutation"]["available_operators"],
+            operators_per_proposal=mutation_cfg["operators_per_proposal"],
+            available_operators=mutation_cfg["available_operators"],
             temperature=llm_cfg["temperature"]["mutation_engine"],
+            operator_selector=operator_bandit,
+            response_mode=mutation_cfg.get("response_mode", "full"),
         )
         all_proposals = list(original_proposals) + list(mutated_proposals)
         logger.info(
@@ -140,9 +177,78 @@ async def run_pipeline():
             tracker.add_proposal(proposal.model_dump())
         tracker.end_stage("2", outputs_count=len(mutated_proposals), success=True)
 
+        # ── Stage 2.2 — Near-Duplicate Filter (local, no LLM) ──
+        dedup_cfg = pipeline_cfg.get("deduplication", {})
+        if dedup_cfg.get("enabled", False):
+            tracker.start_stage("2.2", "Near-Duplicate Filter")
+            logger.info("Stage 2.2: Collapsing near-duplicate proposals (MinHash/LSH)...")
+            all_proposals, dedup_result = run_deduplication(
+                proposals=all_proposals,
+                threshold=dedup_cfg.get("threshold", 0.8),
+                num_perm=dedup_cfg.get("num_perm", 128),
+                bands=dedup_cfg.get("lsh_bands", 32),
+                shingle_size=dedup_cfg.get("shingle_size", 3),
+            )
+            logger.info(
+                f"  -> {dedup_result.collapsed_count} near-duplicates collapsed, "
+                f"{len(all_proposals)} candidates remain"
+            )
+            tracker.set_custom_data("deduplication", dedup_result.model_dump())
+            tracker.end_stage("2.2", outputs_count=len(all_proposals), success=True)
+        else:
+            tracker.skip_stage("2.2", "Disabled in config")
+
         # ── NEW: Stage 2.5 — Diversity Archive (MAP-Elites) ──
         diversity_cfg = pipeline_cfg.get("diversity_archive", {})
+        evolution_cfg = pipeline_cfg.get("evolution", {})
+        behavior_space = novelty_prescorer = None
         if diversity_cfg.get("enabled", False):
+            behavior_space = build_behavior_space(diversity_cfg.get("behavior_space"))
+            novelty_prescorer = build_novelty_prescorer(
+                diversity_cfg.get("lexical_novelty"), _package_root
+            )
+        if diversity_cfg.get("enabled", False) and evolution_cfg.get("enabled", False):
+            tracker.start_stage("2.5", "Diversity Archive")
+            logger.info("Stage 2.5: Running multi-generation MAP-Elites evolution...")
+            max_generations = evolution_cfg.get("generations", 3)
+            archive_path = evolution_cfg.get("archive_path")
+            archive = await run_evolution(
+                seed_proposals=all_proposals,
+                generations=max_generations,
+                children_per_generation=evolution_cfg.get("children_per_generation", 8),
+                available_operators=pipeline_cfg["mutation"]["available_operators"],
+                mutation_temperature=llm_cfg["temperature"]["mutation_engine"],
+                scoring_temperature=diversity_cfg.get("temperature", 0.2),
+                plateau_generations=evolution_cfg.get("plateau_generations", 2),
+                max_llm_calls=evolution_cfg.get("max_llm_calls"),
+                archive_path=_package_root / archive_path if archive_path else None,
+                resume=evolution_cfg.get("resume", True),
+                progress_callback=lambda gen, details: tracker.update_stage_progress(
+                    "2.5", int(100 * gen / max(max_generations, 1)), details
+                ),
+                operator_selector=operator_bandit,
+                mutation_response_mode=mutation_cfg.get("response_mode", "full"),
+                scoring_batch_token_budget=diversity_cfg.get("batch_token_budget"),
+                scoring_max_batch_size=diversity_cfg.get("max_batch_size", 12),
+                behavior_space=behavior_space,
+                structural_descriptors=diversity_cfg.get("structural_descriptors", "llm"),
+                novelty_prescorer=novelty_prescorer,
+            )
+            diverse_proposals = select_elites(
+                archive,
+                starred_names=set(),  # No HITL stars in the automated pipeline
+                top_k=diversity_cfg.get("top_k", 10),
+                distance_weights=diversity_cfg.get("distance_weights"),
+                distance_normalization=diversity_cfg.get("distance_normalization", "none"),
+            )
+            logger.info(
+                f"  -> Selected {len(diverse_proposals)} diverse elites "
+                f"from an archive of {len(archive)}"
+            )
+            if operator_bandit is not None:
+                operator_bandit.reward_selection({p.architecture_name for p in diverse_proposals})
+            tracker.end_stage("2.5", outputs_count=len(diverse_proposals), success=True)
+        elif diversity_cfg.get("enabled", False):
             tracker.start_stage("2.5", "Diversity Archive")
             logger.info("Stage 2.5: Running diversity archive (MAP-Elites selection)...")
             diverse_proposals = await run_diversity_archive(
@@ -150,34 +256,80 @@ async def run_pipeline():
                 starred_names=set(),  # No HITL stars in the automated pipeline
                 top_k=diversity_cfg.get("top_k", 10),
                 temperature=diversity_cfg.get("temperature", 0.2),
+                batch_token_budget=diversity_cfg.get("batch_token_budget"),
+                max_batch_size=diversity_cfg.get("max_batch_size", 12),
+                distance_weights=diversity_cfg.get("distance_weights"),
+                distance_normalization=diversity_cfg.get("distance_normalization", "none"),
+                behavior_space=behavior_space,
+                structural_descriptors=diversity_cfg.get("structural_descriptors", "llm"),
+                novelty_prescorer=novelty_prescorer,
             )
             logger.info(
                 f"  -> Selected {len(diverse_proposals)} diverse candidates "
                 f"from {len(all_proposals)}"
             )
+            if operator_bandit is not None:
+                operator_bandit.reward_selection({p.architecture_name for p in diverse_proposals})
             tracker.end_stage("2.5", outputs_count=len(diverse_proposals), success=True)
         else:
             tracker.skip_stage("2.5", "Disabled in config")
             diverse_proposals = all_proposals
 
+        if operator_bandit is not None:
+            operator_bandit.save()
+
         # ── Stage 3: Self-Refinement ──
         tracker.start_stage("3", "Self-Refinement")
         rounds = pipeline_cfg["self_refinement"]["rounds"]
-        logger.info(f"Stage 3: Running {rounds} rounds of self-refinement...")
+        logger.info(f"Stage 3: Running up to {rounds} rounds of self-refinement...")
         refined_proposals = await run_self_refinement(
             proposals=diverse_proposals,
             rounds=rounds,
             temperature=llm_cfg["temperature"]["self_refinement"],
+            response_mode=pipeline_cfg["self_refinement"].get("response_mode", "full"),
+            min_change=pipeline_cfg["self_refinement"].get("min_change", DEFAULT_MIN_CHANGE),
         )
+        if operator_bandit is not None:
+            # Refinement may rename a child; keep its operator's reward attached
+            for before, after in zip(diverse_proposals, refined_proposals):
+                operator_bandit.rename_child(before.architecture_name, after.architecture_name)
         logger.info(f"  -> Refined {len(refined_proposals)} proposals")
         tracker.end_stage("3", outputs_count=len(refined_proposals), success=True)
 
         # ── Stage 4: Physics Critic ──
         tracker.start_stage("4", "Physics Critic")
         logger.info("Stage 4: Running physics critic (annotate only, no rejection)...")
+        physics_cfg = pipeline_cfg.get("physics_critic", {})
+        metadata_dir = _package_root / physics_cfg.get("metadata_dir", "./input/metadata")
+        rule_annotations = None
+        capacity_cfg = physics_cfg.get("capacity_simulation", {})
+        if physics_cfg.get("rule_checks", True):
+            rule_annotations = run_rule_critic(
+                refined_proposals,
+                metadata_dir=metadata_dir,
+                # The simulation reports undersized receivers itself
+                check_throughput=not capacity_cfg.get("enabled", False),
+            )
+        if capacity_cfg.get("enabled", False):
+            capacity_reports = run_capacity_simulation(
+                refined_proposals,
+                metadata_dir=metadata_dir,
+                horizon_seconds=capacity_cfg.get("horizon_seconds", 3600),
+                step_seconds=capacity_cfg.get("step_seconds", 10),
+                seed=capacity_cfg.get("seed", 0),
+            )
+            rule_annotations = rule_annotations or {}
+            for name, report in capacity_reports.items():
+                rule_annotations.setdefault(name, []).extend(capacity_annotations(report))
+            tracker.set_custom_data(
+                "capacity_simulation",
+                {name: report.model_dump() for name, report in capacity_reports.items()},
+            )
         annotated_proposals = await run_physics_critic(
             proposals=refined_proposals,
             temperature=llm_cfg["temperature"]["physics_critic"],
+            rule_annotations=rule_annotations,
+            skip_llm_when_rules_pass=physics_cfg.get("skip_llm_when_rules_pass", False),
         )
         critical_count = sum(
             1 for ap in annotated_proposals if ap.hard_constraint_violations > 0
@@ -207,14 +359,36 @@ async def run_pipeline():
                 advocate_temperature=debate_temps.get("advocate", 0.6),
                 devil_temperature=debate_temps.get("devil_advocate", 0.6),
                 judge_temperature=debate_temps.get("judge", 0.3),
+                max_concurrent_debates=debate_cfg.get("max_concurrent_debates", 3),
+                context_mode=debate_cfg.get("context_mode", "rolling"),
+                summary_sentences=debate_cfg.get("summary_sentences", 3),
+                context_digest_tokens=debate_cfg.get("context_digest_tokens", 800),
+                rounds=debate_cfg.get("rounds", 3),
+                early_exit=debate_cfg.get("early_exit", False),
+                early_exit_confidence=debate_cfg.get("early_exit_confidence", 0.8),
+                progress_callback=lambda done, total, details: tracker.update_stage_progress(
+                    "4.5", int(100 * done / max(total, 1)), details
+                ),
             )
             debate_won = sum(
                 1 for d in debate_results if d.judgment.debate_winner == "innovation"
             )
+            debate_calls = sum(d.llm_calls for d in debate_results)
+            debate_calls_saved = (
+                full_debate_calls(debate_cfg.get("rounds", 3)) * len(debate_results) - debate_calls
+            )
             logger.info(
                 f"  -> {len(debate_results)} debates complete. "
-                f"Innovation won {debate_won}/{len(debate_results)}"
+                f"Innovation won {debate_won}/{len(debate_results)} "
+                f"({debate_calls} LLM calls, {debate_calls_saved:+d} saved)"
             )
+            tracker.set_custom_data("structured_debate", {
+                "llm_calls": debate_calls,
+                "llm_calls_saved": debate_calls_saved,
+                "stopped_early": sum(
+                    1 for d in debate_results if d.rounds_completed < debate_cfg.get("rounds", 3)
+                ),
+            })
             tracker.save_debate_results(debate_results)  # Save for portfolio recovery
             tracker.end_stage("4.5", outputs_count=len(debate_results), success=True)
         else:
@@ -232,6 +406,13 @@ async def run_pipeline():
                 debate_results=debate_results,
                 enabled_critics=domain_cfg.get("critics"),
                 temperature=domain_cfg.get("temperature", 0.3),
+                mode=domain_cfg.get("mode", "fused"),
+                max_concurrent=domain_cfg.get("max_concurrent", 4),
+                max_attempts=domain_cfg.get("max_attempts", 3),
+                backoff_seconds=domain_cfg.get("backoff_seconds", 2.0),
+                progress_callback=lambda done, total, details: tracker.update_stage_progress(
+                    "4.7", int(100 * done / max(total, 1)), details
+                ),
             )
             total_annotations = sum(
                 r.total_critical + r.total_warning + r.total_info
@@ -256,9 +437,24 @@ async def run_pipeline():
             temperature=llm_cfg["temperature"]["portfolio_ranker"],
             debate_results=debate_results if debate_results else None,
             domain_critic_results=domain_critic_results if domain_critic_results else None,
+            ranking_mode=pipeline_cfg["portfolio"].get("ranking_mode", "absolute"),
+            swiss_rounds=pipeline_cfg["portfolio"].get("pairwise", {}).get("swiss_rounds"),
+            ranking_seed=pipeline_cfg["portfolio"].get("pairwise", {}).get("seed", 0),
+            tier_cutoffs=pipeline_cfg["portfolio"].get("tier_cutoffs"),
+            weight_samples=pipeline_cfg["portfolio"].get("weight_samples", 100_000),
+            max_samples=pipeline_cfg["portfolio"].get("sampling", {}).get("max_samples", 1),
+            sampling_confidence=pipeline_cfg["portfolio"].get("sampling", {}).get("confidence", 0.9),
         )
         tracker.end_stage("5", outputs_count=len(portfolio.proposals), success=True)
 
+        if operator_bandit is not None:
+            operator_bandit.reward_scores({
+                sp.proposal.proposal.architecture_name: sp.composite_score
+                for sp in portfolio.proposals
+            })
+            operator_bandit.save()
+            logger.info(f"Operator statistics updated: {operator_bandit.summary()}")
+
         # ── Output ──
         output_dir = Path(_package_root / output_cfg["dir"])
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -2,65 +2,151 @@
 
 Instead of MCP servers, directly read files from input directories.
 This is simpler and works the same for local files.
+
+Reads go through aiofiles so they don't block the event loop, and are
+cached for the life of the process. File contents are keyed by path and
+(mtime, size). Each assembled context is keyed by its input directories
+and the (mtime, size) of every file it was built from. A long-running
+service or multi-tenant batch therefore only stats unchanged inputs and
+re-reads files that actually changed.
+
+`retrieve_paradigm_patterns` is the retrieval alternative to
+`gather_paradigm_patterns`. It returns each agent's top BM25 chunks for a
+query, within a token budget, instead of whole knowledge-base files
+(utils/text_index.py).
 """
 
+import asyncio
 from pathlib import Path
+from typing import Any, Callable
+
+import aiofiles
+
+from utils.text_index import Bm25Index, load_or_build_chunk_index
+
+_PACKAGE_ROOT = Path(__file__).parent.parent
+_SEPARATOR = "\n\n---\n\n"
+_METADATA_SUFFIXES = (".json", ".yaml", ".yml", ".txt")
+
+# path -> ((mtime_ns, size), text)
+_file_cache: dict[Path, tuple[tuple[int, int], str]] = {}
+# (context kind, *input dirs) -> (((path, (mtime_ns, size)), ...), assembled context)
+_context_cache: dict[tuple, tuple[tuple, Any]] = {}
+# (knowledge-base dir, chunk size) -> (file signatures, chunk index)
+_chunk_indexes: dict[tuple, tuple[tuple, Bm25Index]] = {}
+
+# Knowledge-base files behind each paradigm agent's enriched prompt
+PARADIGM_FILES = {
+    "streaming": ["streaming_patterns.md"],
+    "event_sourcing": ["event_sourcing_patterns.md"],
+    "declarative": ["declarative_patterns.md"],
+    "wildcard": ["biological_analogies.md", "economic_analogies.md",
+                 "physical_analogies.md", "social_analogies.md", "emerging_patterns.md"],
+}
+
+
+def _data_dir(config: dict | None, server: str, default: str) -> Path:
+    """An MCP server's input directory from config.yaml (relative to the package root)."""
+    server_cfg = ((config or {}).get("mcp") or {}).get(server) or {}
+    return (_PACKAGE_ROOT / server_cfg.get("data_dir", default)).resolve()
+
+
+async def _list_files(directory: Path, pattern: str) -> list[Path]:
+    """Sorted matches in a directory (listed off the event loop)."""
+    return await asyncio.to_thread(
+        lambda: sorted(directory.glob(pattern)) if directory.is_dir() else []
+    )
+
+
+def _signature(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+async def _read_text(path: Path, signature: tuple[int, int]) -> str | Exception:
+    """File contents, re-read only when the file changed; a read error is returned, not raised."""
+    cached = _file_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    try:
+        async with aiofiles.open(path, encoding="utf-8") as f:
+            text = await f.read()
+    except Exception as e:
+        return e
+    _file_cache[path] = (signature, text)
+    return text
+
+
+async def _cached_context(
+    key: tuple,
+    files: list[Path],
+    build: Callable[[list[tuple[Path, str | Exception]]], Any],
+) -> Any:
+    """Assemble a context from `files` with `build`, memoized on their signatures.
+
+    Missing files are left out; a context with read errors is not memoized.
+    """
+    # One executor hop for all stats: a warm (fully cached) call does no reads
+    signatures = await asyncio.to_thread(lambda: [_signature(f) for f in files])
+    stamp = tuple((f, s) for f, s in zip(files, signatures) if s is not None)
+    cached = _context_cache.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    contents = await asyncio.gather(*(_read_text(f, s) for f, s in stamp))
+    result = build(list(zip((f for f, _ in stamp), contents)))
+    if not any(isinstance(c, Exception) for c in contents):
+        _context_cache[key] = (stamp, result)
+    return result
+
+
+def _sections(contents: list[tuple[Path, str | Exception]]) -> list[str]:
+    return [
+        f"### {file.stem}\n\n[Error reading file: {content}]" if isinstance(content, Exception)
+        else f"### {file.stem.replace('_', ' ').title()}\n\n{content}"
+        for file, content in contents
+    ]
 
 
 async def gather_enterprise_context(config=None):
     """Read all enterprise docs and metadata from local files."""
-    base_dir = Path(__file__).parent.parent
-
-    sections = []
-
-    # Read enterprise docs
-    docs_dir = base_dir / "input/enterprise_docs"
-    if docs_dir.exists():
-        for file in sorted(docs_dir.glob("*.md")):
-            if file.name != "README.md":
-                try:
-                    content = file.read_text(encoding="utf-8")
-                    sections.append(f"### {file.stem.replace('_', ' ').title()}\n\n{content}")
-                except Exception as e:
-                    sections.append(f"### {file.stem}\n\n[Error reading file: {e}]")
-
-    # Read metadata
-    metadata_dir = base_dir / "input/metadata"
-    if metadata_dir.exists():
-        for file in sorted(metadata_dir.glob("*")):
-            if file.suffix in [".json", ".yaml", ".yml", ".txt"] and file.name != "README.md":
-                try:
-                    content = file.read_text(encoding="utf-8")
-                    sections.append(f"### {file.stem.replace('_', ' ').title()}\n\n{content}")
-                except Exception as e:
-                    sections.append(f"### {file.stem}\n\n[Error reading file: {e}]")
-
-    if not sections:
-        return "[No enterprise documentation found in input/ directories]"
-
-    return "\n\n---\n\n".join(sections)
+    docs_dir = _data_dir(config, "enterprise_docs", "input/enterprise_docs")
+    metadata_dir = _data_dir(config, "metadata", "input/metadata")
+
+    docs, metadata = await asyncio.gather(
+        _list_files(docs_dir, "*.md"), _list_files(metadata_dir, "*"),
+    )
+    files = [f for f in docs if f.name != "README.md"]
+    files += [f for f in metadata if f.suffix in _METADATA_SUFFIXES and f.name != "README.md"]
+
+    def build(contents):
+        if not contents:
+            return "[No enterprise documentation found in input/ directories]"
+        return _SEPARATOR.join(_sections(contents))
+
+    return await _cached_context(("enterprise", docs_dir, metadata_dir), files, build)
 
 
 async def gather_patterns_context(config=None):
     """Read patterns from knowledge base."""
-    base_dir = Path(__file__).parent.parent
-    kb_dir = base_dir / "knowledge_base"
+    kb_dir = _data_dir(config, "patterns_knowledge", "knowledge_base")
 
-    sections = []
-    if kb_dir.exists():
-        # Read specific pattern files for general context
-        for pattern_type in ["emerging_patterns", "streaming_patterns", "event_sourcing_patterns"]:
-            for file in kb_dir.glob(f"{pattern_type}.md"):
-                try:
-                    content = file.read_text(encoding="utf-8")
-                    sections.append(f"### {file.stem.replace('_', ' ').title()}\n\n{content}")
-                except Exception as e:
-                    sections.append(f"### {file.stem}\n\n[Error reading file: {e}]")
+    # Specific pattern files for general context
+    files = [
+        kb_dir / f"{pattern_type}.md"
+        for pattern_type in ["emerging_patterns", "streaming_patterns", "event_sourcing_patterns"]
+    ]
 
-    if not sections:
-        return "[No pattern knowledge base found]"
+    def build(contents):
+        if not contents:
+            return "[No pattern knowledge base found]"
+        return _SEPARATOR.join(_sections(contents))
 
-    return "\n\n---\n\n".join(sections)
+    return await _cached_context(("patterns", kb_dir), files, build)
 
 
 async def gather_paradigm_patterns(config=None):
@@ -69,30 +155,68 @@ async def gather_paradigm_patterns(config=None):
     Returns dict mapping paradigm name to patterns text, used by Stage 0b
     (Prompt Enhancement) to enrich each agent's system prompt.
     """
-    base_dir = Path(__file__).parent.parent
-    kb_dir = base_dir / "knowledge_base"
-
-    paradigm_files = {
-        "streaming": ["streaming_patterns.md"],
-        "event_sourcing": ["event_sourcing_patterns.md"],
-        "declarative": ["declarative_patterns.md"],
-        "wildcard": ["biological_analogies.md", "economic_analogies.md",
-                     "physical_analogies.md", "social_analogies.md", "emerging_patterns.md"],
-    }
+    kb_dir = _data_dir(config, "patterns_knowledge", "knowledge_base")
+    files = list(dict.fromkeys(kb_dir / name for names in PARADIGM_FILES.values() for name in names))
+
+    def build(contents):
+        by_name = {
+            file.name: f"[Error reading {file.name}: {content}]" if isinstance(content, Exception) else content
+            for file, content in contents
+        }
+        return {
+            agent_name: _SEPARATOR.join(by_name[n] for n in filenames if n in by_name)
+            for agent_name, filenames in PARADIGM_FILES.items()
+        }
+
+    return dict(await _cached_context(("paradigm", kb_dir), files, build))
+
+
+async def retrieve_paradigm_patterns(
+    query: str,
+    config=None,
+    top_k: int = 6,
+    token_budget: int = 1500,
+    chunk_tokens: int = 250,
+    cache_dir: str | None = "outputs/cache",
+):
+    """Knowledge-base excerpts relevant to `query` for each paradigm agent.
+
+    Same keys as `gather_paradigm_patterns`, but each value holds only the
+    agent's top `top_k` BM25 chunks that fit in `token_budget` tokens. The
+    chunk index is built once per knowledge-base version: it is persisted
+    under `cache_dir` (relative to the package root; None disables) and
+    kept in memory while the files' (mtime, size) are unchanged.
+    """
+    kb_dir = _data_dir(config, "patterns_knowledge", "knowledge_base")
+    files = list(dict.fromkeys(kb_dir / name for names in PARADIGM_FILES.values() for name in names))
+    signatures = await asyncio.to_thread(lambda: [_signature(f) for f in files])
+    stamp = tuple((f, s) for f, s in zip(files, signatures) if s is not None)
+
+    key = (kb_dir, chunk_tokens)
+    cached = _chunk_indexes.get(key)
+    if cached and cached[0] == stamp:
+        index = cached[1]
+    else:
+        index = await asyncio.to_thread(
+            load_or_build_chunk_index,
+            {f.stem: [f] for f, _ in stamp},
+            _PACKAGE_ROOT / cache_dir if cache_dir else None,
+            chunk_tokens,
+        )
+        _chunk_indexes[key] = (stamp, index)
 
     results = {}
-
-    for agent_name, filenames in paradigm_files.items():
-        parts = []
-        for filename in filenames:
-            file_path = kb_dir / filename
-            if file_path.exists():
-                try:
-                    content = file_path.read_text(encoding="utf-8")
-                    parts.append(content)
-                except Exception as e:
-                    parts.append(f"[Error reading {filename}: {e}]")
-
-        results[agent_name] = "\n\n---\n\n".join(parts) if parts else ""
-
+    for agent_name, filenames in PARADIGM_FILES.items():
+        chunk_ids = index.top_chunks(
+            query, kinds={Path(n).stem for n in filenames}, top_k=top_k, token_budget=token_budget,
+        )
+        parts: list[str] = []
+        for previous, i in zip([None, *chunk_ids], chunk_ids):
+            text = index.texts[i]
+            if previous is not None and index.labels[previous] == index.labels[i] and text.startswith("## "):
+                # Same section as the previous chunk: continue it without repeating the heading
+                parts[-1] += "\n" + text.partition("\n")[2]
+            else:
+                parts.append(text)
+        results[agent_name] = "\n\n".join(parts)
     return results
@@ -9,16 +9,28 @@ from .schemas import (
     Risk,
     Proposal,
     MutatedProposal,
+    # Near-Duplicate Detection (Stage 2.2)
+    DuplicateCluster,
+    DeduplicationResult,
     RefinedProposal,
+    # Patch-based outputs (Stage 2 / Stage 3)
+    ProposalPatch,
+    MutationPatch,
+    RefinementPatch,
     ConstraintAnnotation,
+    PhysicsCritique,
     AnnotatedProposal,
     ScoredProposal,
     Portfolio,
     # Lightweight scoring (Stage 5)
     ProposalScore,
+    PairwiseJudgment,
     ExecutiveSummary,
     # Diversity Archive (Stage 2.5)
     DiversityScores,
+    DiversityScoresBatch,
+    SemanticDiversityScores,
+    SemanticDiversityScoresBatch,
     DiversityArchiveInput,
     DiversityArchiveResult,
     # Structured Debate (Stage 4.5)
@@ -30,6 +42,7 @@ from .schemas import (
     # Domain Critics (Stage 4.7)
     DomainCriticAnnotation,
     DomainCriticResult,
+    DomainCritique,
     AllDomainCriticsResult,
 )
 
@@ -42,14 +55,24 @@ __all__ = [
     "Risk",
     "Proposal",
     "MutatedProposal",
+    "DuplicateCluster",
+    "DeduplicationResult",
     "RefinedProposal",
+    "ProposalPatch",
+    "MutationPatch",
+    "RefinementPatch",
     "ConstraintAnnotation",
+    "PhysicsCritique",
     "AnnotatedProposal",
     "ScoredProposal",
     "Portfolio",
     "ProposalScore",
+    "PairwiseJudgment",
     "ExecutiveSummary",
     "DiversityScores",
+    "DiversityScoresBatch",
+    "SemanticDiversityScores",
+    "SemanticDiversityScoresBatch",
     "DiversityArchiveInput",
     "DiversityArchiveResult",
     "ArgumentText",
@@ -59,5 +82,6 @@ __all__ = [
     "DebateResult",
     "DomainCriticAnnotation",
     "DomainCriticResult",
+    "DomainCritique",
     "AllDomainCriticsResult",
 ]
@@ -133,6 +133,32 @@ class MutatedProposal(Proposal):
     )
 
 
+# ──────────────────────────────────────────────
+# Near-Duplicate Detection (Stage 2.2)
+# ──────────────────────────────────────────────
+
+class DuplicateCluster(BaseModel):
+    """A group of near-duplicate proposals collapsed into one representative."""
+    kept_name: str = Field(description="Architecture name of the proposal that advances")
+    collapsed_names: list[str] = Field(
+        description="Architecture names collapsed into the kept proposal"
+    )
+    similarities: dict[str, float] = Field(
+        description="Estimated Jaccard similarity of each collapsed proposal to the kept one"
+    )
+    lineage: dict[str, str] = Field(
+        default_factory=dict,
+        description="For each collapsed mutation, the parent it was mutated from",
+    )
+
+
+class DeduplicationResult(BaseModel):
+    """Output of the near-duplicate filter."""
+    clusters: list[DuplicateCluster]
+    kept_count: int
+    collapsed_count: int
+
+
 # ──────────────────────────────────────────────
 # Self-Refinement Output
 # ──────────────────────────────────────────────
@@ -145,6 +171,69 @@ class RefinedProposal(Proposal):
     refinement_round: int = Field(description="Which round of refinement (1 or 2)")
 
 
+# ──────────────────────────────────────────────
+# Patch-based outputs (Stage 2 / Stage 3 "patch" response mode)
+# (The LLM returns ONLY what changed; code applies the patch locally)
+# ──────────────────────────────────────────────
+
+class ProposalPatch(BaseModel):
+    """A structured edit against an input proposal. Omitted fields are unchanged."""
+    architecture_name: Optional[str] = Field(
+        default=None, description="New architecture name, or null to keep the current one"
+    )
+    core_thesis: Optional[str] = Field(
+        default=None, description="New core thesis, or null to keep the current one"
+    )
+    add_components: list[Component] = Field(
+        default_factory=list, description="Components to add"
+    )
+    remove_components: list[str] = Field(
+        default_factory=list, description="Exact names of components to remove"
+    )
+    replace_components: list[Component] = Field(
+        default_factory=list,
+        description="Updated components; each replaces the existing component with the same name",
+    )
+    add_flow_steps: list[DataFlowStep] = Field(
+        default_factory=list,
+        description="New data flow steps; step_number is where to insert (before the current "
+                    "step with that number, or at the end if larger than all)",
+    )
+    remove_flow_steps: list[int] = Field(
+        default_factory=list, description="step_numbers of data flow steps to remove"
+    )
+    replace_flow_steps: list[DataFlowStep] = Field(
+        default_factory=list,
+        description="Updated data flow steps; each replaces the current step with the same step_number",
+    )
+    key_innovations: Optional[list[str]] = Field(
+        default=None, description="Full replacement list of key innovations, or null to keep"
+    )
+    assumptions: Optional[list[str]] = Field(
+        default=None, description="Full replacement list of assumptions, or null to keep"
+    )
+    risks: Optional[list[Risk]] = Field(
+        default=None, description="Full replacement list of risks, or null to keep"
+    )
+
+
+class MutationPatch(ProposalPatch):
+    """Patch-mode response of a mutation operator."""
+    architecture_name: str = Field(
+        description="Name of the mutated architecture; must differ from the input proposal's name"
+    )
+    mutation_description: str = Field(
+        description="What specifically was changed and why"
+    )
+
+
+class RefinementPatch(ProposalPatch):
+    """Patch-mode response of a self-refinement round."""
+    refinements_made: list[str] = Field(
+        description="List of specific improvements made in this refinement round"
+    )
+
+
 # ──────────────────────────────────────────────
 # Physics Critic Output
 # ──────────────────────────────────────────────
@@ -166,6 +255,19 @@ class ConstraintAnnotation(BaseModel):
     )
 
 
+class PhysicsCritique(BaseModel):
+    """Physics critic output returned by the LLM.
+    Carries only the annotations; code attaches them to the original
+    proposal as an AnnotatedProposal, so the proposal is never re-emitted."""
+    annotations: list[ConstraintAnnotation]
+    hard_constraint_violations: int = Field(
+        description="Count of 'critical' severity annotations"
+    )
+    overall_feasibility_note: str = Field(
+        description="Brief overall assessment of physical feasibility"
+    )
+
+
 class AnnotatedProposal(BaseModel):
     """A proposal with physics critic annotations attached.
     The proposal itself is NOT modified — annotations are metadata."""
@@ -205,6 +307,26 @@ class ScoredProposal(BaseModel):
     one_line_summary: str = Field(
         description="One sentence explaining what makes this proposal distinctive"
     )
+    pareto_rank: Optional[int] = Field(
+        default=None,
+        description="Non-dominated sorting rank over the four scores (1 = Pareto frontier)",
+    )
+    first_place_probability: Optional[float] = Field(
+        default=None,
+        description="Share of uniformly sampled score weightings under which this proposal ranks first",
+    )
+    score_samples: int = Field(
+        default=1,
+        description="Scoring calls averaged into the dimension scores",
+    )
+    composite_ci: Optional[list[float]] = Field(
+        default=None,
+        description="[low, high] confidence interval of the composite score (repeated scoring only)",
+    )
+    innovation_ci: Optional[list[float]] = Field(
+        default=None,
+        description="[low, high] confidence interval of the innovation score (repeated scoring only)",
+    )
 
 
 class Portfolio(BaseModel):
@@ -230,6 +352,30 @@ class Portfolio(BaseModel):
             "innovation-risk frontier and key tradeoffs between the top options"
         )
     )
+    proposal_scores: list["ProposalScore"] = Field(
+        default_factory=list,
+        description="Raw per-proposal scores from the ranker (input order), for offline re-ranking",
+    )
+    score_weights: dict[str, float] = Field(
+        default_factory=dict,
+        description="Weights used for composite_score",
+    )
+    tier_cutoffs: Optional[list[float]] = Field(
+        default=None,
+        description="Innovation cutoffs used for tiers (None = tiers from the ranker)",
+    )
+    weight_samples: int = Field(
+        default=0,
+        description="Weight vectors sampled for first_place_probability (0 = not computed)",
+    )
+    proposal_score_samples: list[list["ProposalScore"]] = Field(
+        default_factory=list,
+        description="Every scoring sample per proposal (input order) when repeated scoring is on",
+    )
+    sampling_confidence: Optional[float] = Field(
+        default=None,
+        description="Confidence level of composite_ci / innovation_ci",
+    )
 
 
 # ──────────────────────────────────────────────
@@ -263,6 +409,19 @@ class ProposalScore(BaseModel):
     )
 
 
+class PairwiseJudgment(BaseModel):
+    """Head-to-head comparison of two proposals (pairwise ranking mode)."""
+    innovation_winner: str = Field(description="'A', 'B', or 'tie' — the more structurally novel proposal")
+    feasibility_winner: str = Field(description="'A', 'B', or 'tie' — the more technically feasible proposal")
+    business_alignment_winner: str = Field(
+        description="'A', 'B', or 'tie' — the proposal that better serves the business goals"
+    )
+    migration_complexity_winner: str = Field(
+        description="'A', 'B', or 'tie' — the proposal that is EASIER to migrate to"
+    )
+    rationale: str = Field(description="One or two sentences on the decisive differences")
+
+
 class ExecutiveSummary(BaseModel):
     """Executive summary generated after all proposals are scored."""
     executive_summary: str = Field(
@@ -303,6 +462,41 @@ class DiversityScores(BaseModel):
     one_line_summary: str
 
 
+class DiversityScoresBatch(BaseModel):
+    """Batched diversity scorer output — one entry per proposal in the request."""
+    scores: list[DiversityScores] = Field(
+        description="Scores for every proposal in the batch, using the exact architecture names"
+    )
+
+
+class SemanticDiversityScores(BaseModel):
+    """LLM-scored part of DiversityScores when structural complexity is computed locally."""
+    architecture_name: str
+    paradigm_novelty: int = Field(
+        ge=1, le=5,
+        description="1=incremental improvement, 2=novel combination of known patterns, "
+                    "3=significant departure from convention, 4=new paradigm application, "
+                    "5=completely new abstraction or paradigm"
+    )
+    migration_distance: int = Field(
+        ge=1, le=5,
+        description="1=small config changes, 2=swap some components, "
+                    "3=significant rearchitecture, 4=major rebuild, 5=complete greenfield"
+    )
+    quality_heuristic: float = Field(
+        description="0-10 overall quality estimate: coherence, completeness, "
+                    "and strength of the core thesis"
+    )
+    one_line_summary: str
+
+
+class SemanticDiversityScoresBatch(BaseModel):
+    """Batched semantic scorer output — one entry per proposal in the request."""
+    scores: list[SemanticDiversityScores] = Field(
+        description="Scores for every proposal in the batch, using the exact architecture names"
+    )
+
+
 class DiversityArchiveInput(BaseModel):
     """Input to the diversity scorer — a batch of proposals to characterize."""
     proposals: list[DiversityScores]
@@ -377,6 +571,10 @@ class DebateJudgment(BaseModel):
     residual_concerns: list[str] = Field(
         description="Concerns that were NOT adequately addressed during the debate"
     )
+    confidence: float = Field(
+        default=0.0, ge=0, le=1,
+        description="How confident the judge is that further debate would not change the winner (0-1)"
+    )
 
 
 class DebateResult(BaseModel):
@@ -385,6 +583,9 @@ class DebateResult(BaseModel):
     rounds: list[DebateRound]
     steel_mans: list[SteelMan]
     judgment: DebateJudgment
+    input_tokens: int = Field(default=0, description="Estimated prompt tokens sent for this debate")
+    rounds_completed: int = Field(default=0, description="Rounds argued before the final verdict")
+    llm_calls: int = Field(default=0, description="LLM calls made, including interim judge checks")
 
 
 # ──────────────────────────────────────────────
@@ -412,6 +613,14 @@ class DomainCriticResult(BaseModel):
     )
 
 
+class DomainCritique(BaseModel):
+    """One critic's section of a fused multi-critic response."""
+    annotations: list[DomainCriticAnnotation]
+    overall_assessment: str = Field(
+        description="1-2 sentence summary of this domain's assessment"
+    )
+
+
 class AllDomainCriticsResult(BaseModel):
     """Aggregated domain critic results for a single proposal."""
     architecture_name: str
@@ -35,8 +35,8 @@ You are an impartial judge evaluating a structured debate about an architectural
 
 You will receive:
 1. The proposal itself (with physics critic annotations)
-2. The full 3-round debate transcript
-3. Both sides' steel-man arguments
+2. The debate transcript (earlier rounds may be summarized)
+3. Both sides' steel-man arguments (final round)
 
 Evaluate:
 - INNOVATION DEFENSE STRENGTH (0-10): How well did the advocate make the case for innovation? Were the arguments specific and convincing, or vague and hand-wavy?
@@ -47,5 +47,10 @@ Evaluate:
 Also identify:
 - The KEY INSIGHT: What is the single most important thing that emerged from this debate that wasn't obvious before?
 - RESIDUAL CONCERNS: What important concerns were NOT adequately addressed?
+- CONFIDENCE (0-1): How sure you are that more debate would not change the winner.
 
 Be fair but lean toward giving innovative proposals the benefit of the doubt when the debate is close. The system is designed for innovation — a tie goes to the novel approach."""
+
+INTERIM_JUDGE_PROMPT = JUDGE_PROMPT + """
+
+This is an INTERIM ruling: the debate may not be finished and the steel-man round may not have happened yet. Judge the transcript as it stands. Set CONFIDENCE high (0.8 or above) only when the debate is clearly one-sided and further rounds are very unlikely to change the winner; if it is contested, set it low so the debate continues. If your confidence is high, this ruling becomes the final verdict."""
@@ -29,3 +29,37 @@ For each proposal, score:
 Also provide a QUALITY HEURISTIC (0-10): how coherent, complete, and well-argued is the proposal? This is used to choose between proposals that land in the same grid cell.
 
 Be consistent in your scoring. Two proposals that are structurally similar should get similar scores."""
+
+
+DIVERSITY_BATCH_SCORER_PROMPT = DIVERSITY_SCORER_PROMPT + """
+
+BATCH MODE: You will receive several proposal summaries at once. Return one score entry for EVERY proposal, using its EXACT architecture name. Score them side by side so that relative differences between proposals are reflected consistently in the scores."""
+
+
+SEMANTIC_DIVERSITY_SCORER_PROMPT = """\
+You are a diversity analyst for architectural proposals. Your job is to characterize each proposal along 2 behavioral dimensions so that a MAP-Elites diversity selection algorithm can choose the most diverse set of candidates. (Structural complexity is measured separately from the component graph — do not score it.)
+
+For each proposal, score:
+
+1. PARADIGM NOVELTY (1-5):
+   1 = Incremental improvement on conventional patterns (e.g., better ETL orchestration)
+   2 = Novel combination of known patterns (e.g., streaming + event sourcing hybrid)
+   3 = Significant departure from convention (e.g., replacing orchestration with choreography)
+   4 = Applying a paradigm from outside data engineering (e.g., market-based scheduling)
+   5 = Completely new abstraction that redefines the problem space
+
+2. MIGRATION DISTANCE (1-5):
+   1 = Small configuration/tooling changes to existing architecture
+   2 = Swap some components while keeping overall structure
+   3 = Significant rearchitecture of data flows and processing model
+   4 = Major rebuild affecting most components
+   5 = Complete greenfield — share almost nothing with current system
+
+Also provide a QUALITY HEURISTIC (0-10): how coherent, complete, and well-argued is the proposal? This is used to choose between proposals that land in the same grid cell.
+
+Be consistent in your scoring. Two proposals that are conceptually similar should get similar scores."""
+
+
+SEMANTIC_DIVERSITY_BATCH_SCORER_PROMPT = SEMANTIC_DIVERSITY_SCORER_PROMPT + """
+
+BATCH MODE: You will receive several proposal summaries at once. Return one score entry for EVERY proposal, using its EXACT architecture name. Score them side by side so that relative differences between proposals are reflected consistently in the scores."""
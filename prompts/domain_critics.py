@@ -71,6 +71,11 @@ IMPORTANT:
 - Novel data quality approaches (e.g., probabilistic validation, eventual consistency with correction) are valid — evaluate them on merit, not familiarity.
 - Severity: 'info', 'warning', 'critical'"""
 
+FUSED_CRITIC_PROMPT_HEADER = """\
+You are a panel of domain critics reviewing ONE data pipeline architecture proposal. Each critic's brief follows under its own heading. Review the proposal once per critic, independently and strictly within that critic's domain, and return one section per critic, keyed by its domain name, each with that critic's annotations and overall assessment.
+
+All critics are ANNOTATORS, not GATEKEEPERS: do NOT reject the proposal, and do not repeat a concern under several domains unless it genuinely matters to each."""
+
 DOMAIN_CRITIC_PROMPTS = {
     "security": SECURITY_CRITIC_PROMPT,
     "cost": COST_CRITIC_PROMPT,
@@ -0,0 +1,12 @@
+"""Response-format instructions for patch mode (Stage 2 mutations, Stage 3 refinement)."""
+
+PATCH_MODE_INSTRUCTIONS = """\
+
+
+RESPONSE FORMAT — PATCH MODE:
+Do NOT rewrite the whole proposal. Return ONLY a structured patch against the input proposal:
+- add_components / remove_components / replace_components: component-level edits. Removals and replacements must use the EXACT existing component names.
+- add_flow_steps / remove_flow_steps / replace_flow_steps: data flow edits, addressed by the CURRENT step_number. Steps are renumbered automatically afterwards.
+- architecture_name, core_thesis: set only if they change; otherwise null. A mutation always gives the variant a NEW architecture_name.
+- key_innovations, assumptions, risks: give the FULL new list only if it changes; otherwise null.
+Every data flow step must reference components that still exist after the patch. Leave everything that does not change out of the patch."""
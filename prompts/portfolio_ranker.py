@@ -23,6 +23,19 @@ Return the EXACT architecture_name from the input (do not rename or modify it),
 Use the debate results and domain critic annotations to inform your scoring — they provide deep analysis of the proposal's strengths and weaknesses."""
 
 
+PAIRWISE_RANKER_PROMPT = """\
+You are an architectural portfolio evaluator comparing TWO proposals, A and B, head to head. Each comes with a compact summary of its debate results and critical domain critic annotations.
+
+For each dimension, name the stronger proposal ("A" or "B"), or "tie" only if you genuinely cannot separate them:
+
+1. INNOVATION: Which is more structurally novel — new abstractions, paradigm shifts, unconventional patterns?
+2. FEASIBILITY: Which is more technically feasible given the constraint annotations and stated constraints? Weight critical annotations heavily. Ignore soft concerns like "tooling maturity" or "team readiness".
+3. BUSINESS ALIGNMENT: Which better serves the stated business goals, KPIs, and strategic priorities?
+4. MIGRATION COMPLEXITY: Which is EASIER to migrate to from the current state? This is informational, not a penalty.
+
+Judge each dimension independently — a proposal can win innovation and lose feasibility. The order in which A and B are presented means nothing. Give a short rationale naming the decisive differences."""
+
+
 PORTFOLIO_SUMMARY_PROMPT = """\
 You are an architectural portfolio summarizer. You will receive a list of scored and tiered architectural proposals. Write an executive summary (2-3 paragraphs) that:
 
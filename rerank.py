@@ -0,0 +1,149 @@
+"""Re-rank a finished portfolio offline with new score weights or tier rules.
+
+Composite scores are a weighted sum of the four ranker scores, so changing
+`portfolio.score_weights` doesn't need a pipeline re-run: this recomputes
+composites, tier tops, the Pareto / weight-sensitivity analysis and the
+markdown report from the raw scores kept in
+portfolio.json, with no LLM calls. The executive summary is kept unless
+`--summary` asks for a new one (one LLM call).
+
+Usage:
+    python rerank.py --weight innovation=0.5 --weight feasibility=0.2
+    python rerank.py --tier-cutoffs 4 7 --summary
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+_package_root = Path(__file__).resolve().parent
+if str(_package_root) not in sys.path:
+    sys.path.insert(0, str(_package_root))
+
+from models.schemas import Portfolio, ProposalScore
+from stages.portfolio_assembly import (
+    DEFAULT_SCORE_WEIGHTS, assemble_portfolio, generate_executive_summary,
+)
+from utils.report_renderer import render_portfolio_report
+
+
+def _parse_weight(text: str) -> tuple[str, float]:
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected DIMENSION=WEIGHT, got '{text}'")
+    return name.strip(), float(value)
+
+
+def raw_scores(portfolio: Portfolio) -> list[ProposalScore]:
+    """The ranker's scores in proposal order (rebuilt from the ranked entries
+    for portfolios written before raw scores were stored)."""
+    if portfolio.proposal_scores:
+        return portfolio.proposal_scores
+    return [
+        ProposalScore(
+            architecture_name=sp.proposal.proposal.architecture_name,
+            innovation_score=sp.innovation_score,
+            feasibility_score=sp.feasibility_score,
+            business_alignment_score=sp.business_alignment_score,
+            migration_complexity_score=sp.migration_complexity_score,
+            tier=sp.tier,
+            one_line_summary=sp.one_line_summary,
+        )
+        for sp in portfolio.proposals
+    ]
+
+
+def rerank(
+    portfolio: Portfolio,
+    score_weights: dict[str, float] | None = None,
+    tier_cutoffs: tuple[float, float] | None = None,
+    weight_samples: int = 100_000,
+) -> Portfolio:
+    """Recompute a portfolio from its raw scores (weights / cutoffs default to the stored ones).
+
+    The merged weights are rescaled to sum to 1 (see normalize_weights).
+    """
+    scores = raw_scores(portfolio)
+    by_name = {sp.proposal.proposal.architecture_name: sp.proposal for sp in portfolio.proposals}
+    # Portfolios saved before a dimension existed don't store its weight
+    weights = {**DEFAULT_SCORE_WEIGHTS, **portfolio.score_weights, **(score_weights or {})}
+    if tier_cutoffs is None and portfolio.tier_cutoffs:
+        tier_cutoffs = tuple(portfolio.tier_cutoffs)
+    return assemble_portfolio(
+        [by_name[ps.architecture_name] for ps in scores],
+        scores,
+        score_weights=weights,
+        tier_cutoffs=tier_cutoffs,
+        executive_summary=portfolio.executive_summary,
+        weight_samples=weight_samples,
+        score_samples=portfolio.proposal_score_samples or None,
+        confidence=portfolio.sampling_confidence or 0.9,
+    )
+
+
+def main() -> None:
+    with open(_package_root / "config.yaml") as f:
+        config = yaml.safe_load(f)
+    output_dir = _package_root / config["output"]["dir"]
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--portfolio", type=Path, default=output_dir / "portfolio.json",
+                        help="portfolio.json to re-rank (default: the configured output dir)")
+    parser.add_argument("--weight", type=_parse_weight, action="append", default=[],
+                        metavar="DIMENSION=WEIGHT",
+                        help="Override one score weight (repeatable); others keep their stored values "
+                             "and all are then rescaled to sum to 1")
+    parser.add_argument("--config-weights", action="store_true",
+                        help="Start from portfolio.score_weights in config.yaml instead of the stored weights")
+    parser.add_argument("--tier-cutoffs", type=float, nargs=2, metavar=("CONSERVATIVE_BELOW", "RADICAL_FROM"),
+                        help="Re-tier by innovation score instead of using the ranker's tiers")
+    parser.add_argument("--summary", action="store_true",
+                        help="Regenerate the executive summary (one LLM call)")
+    parser.add_argument("--output-dir", type=Path,
+                        help="Where to write portfolio.json and the report (default: next to --portfolio)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    portfolio = Portfolio.model_validate(json.loads(args.portfolio.read_text(encoding="utf-8")))
+    weights = dict(config["pipeline"]["portfolio"]["score_weights"]) if args.config_weights else {}
+    weights.update(dict(args.weight))
+    unknown = set(weights) - {"innovation", "feasibility", "business_alignment", "migration_complexity"}
+    if unknown:
+        parser.error(f"unknown score dimension(s): {', '.join(sorted(unknown))}")
+
+    try:
+        reranked = rerank(
+            portfolio, weights,
+            tuple(args.tier_cutoffs) if args.tier_cutoffs else None,
+            weight_samples=config["pipeline"]["portfolio"].get("weight_samples", 100_000),
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    if args.summary:
+        temperature = config["llm"]["temperature"]["portfolio_ranker"]
+        reranked.executive_summary = asyncio.run(generate_executive_summary(reranked, temperature))
+
+    target = args.output_dir or args.portfolio.parent
+    target.mkdir(parents=True, exist_ok=True)
+    with open(target / "portfolio.json", "w", encoding="utf-8") as f:
+        json.dump(reranked.model_dump(), f, indent=2, ensure_ascii=False)
+    if config["output"].get("render_markdown_report", True):
+        (target / "portfolio_report.md").write_text(render_portfolio_report(reranked), encoding="utf-8")
+
+    print(f"Re-ranked {len(reranked.proposals)} proposals in {elapsed * 1000:.1f} ms "
+          f"(weights: {reranked.score_weights}"
+          + (f", tier cutoffs: {reranked.tier_cutoffs}" if reranked.tier_cutoffs else "") + ")")
+    print(f"  Top conservative: {reranked.top_conservative}")
+    print(f"  Top moderate:     {reranked.top_moderate}")
+    print(f"  Top radical:      {reranked.top_radical}")
+    print(f"Written to {target}/")
+
+
+if __name__ == "__main__":
+    main()
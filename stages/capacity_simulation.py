@@ -0,0 +1,360 @@
+"""Stage 4 (pre-pass): Capacity Simulation
+
+Turns each proposal's data flow into a queueing network and simulates it
+under steady and peak load. Arrival rates come from volume_stats.json (via
+the rule critic's metadata facts); each component's capacity and base
+latency come from the throughput class of its `technology_suggestion`,
+scaled by the deployed node count listed in infrastructure_catalog.json.
+
+The model is a discrete-time fluid simulation rather than an
+event-by-event one: time advances in fixed steps, external arrivals per
+step are Poisson, every component serves up to capacity x step and keeps
+the rest as backlog, and a component's departures flow to all of its
+downstream components (pub-sub style fan-out). Cycles are broken at their
+back edges. Only components that take part in the data flow are
+simulated; the entry rate is split evenly across a proposal's sources
+(components with outgoing but no incoming flow). Per-step latency of a
+component is its base latency, the M/M/1 sojourn time at the step's
+arrival rate while below capacity, and the time to drain its backlog.
+End-to-end latency is the slowest source-to-component path.
+
+All components of all proposals are simulated together in flat arrays,
+one topological level at a time, so hundreds of proposals take about as
+long as one.
+"""
+
+import logging
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from models.schemas import ConstraintAnnotation, Proposal
+from stages.rule_critic import MetadataFacts, deployed_capacity, load_metadata_facts
+
+logger = logging.getLogger(__name__)
+
+# Base (unloaded) latency in milliseconds per throughput class. Batch and
+# sync-scheduled tools wait on average half their schedule interval.
+BASE_LATENCY_MS: dict[str, float] = {
+    "airflow": 1_800_000,   # Hourly DAGs
+    "census": 43_200_000,   # Daily syncs
+    "fivetran": 1_800_000,  # Hourly syncs
+    "dbt": 1_800_000,
+    "lambda": 100,
+    "postgres": 5,
+    "mysql": 5,
+    "rds": 5,
+    "snowflake": 2_000,
+    "redshift": 2_000,
+    "bigquery": 2_000,
+    "s3": 50,
+    "kafka": 5,
+    "redpanda": 5,
+    "pulsar": 5,
+    "kinesis": 200,
+    "flink": 50,
+}
+
+# Components whose technology matches no class
+DEFAULT_CAPACITY = 50_000.0
+DEFAULT_LATENCY_MS = 10.0
+
+
+class ComponentLoad(BaseModel):
+    """Simulated load on one component in one scenario."""
+    component: str
+    technology_class: str
+    utilization: float  # Mean arrival rate / capacity
+    queue_growth_per_second: float  # Backlog growth over the horizon (events/s)
+    saturation_events_per_second: float  # Entry rate at which this component saturates
+
+
+class ScenarioResult(BaseModel):
+    """End-to-end results of one load scenario."""
+    scenario: str
+    arrival_events_per_second: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    components: list[ComponentLoad]
+
+
+class CapacityReport(BaseModel):
+    """Capacity simulation results for one proposal."""
+    architecture_name: str
+    scenarios: list[ScenarioResult]
+    saturation_events_per_second: float  # Entry rate at which the first component saturates
+    bottleneck: str
+
+
+class _Network(NamedTuple):
+    """All proposals' components flattened into one graph."""
+    proposal: np.ndarray     # Proposal index of each node
+    names: list[str]
+    classes: list[str]
+    capacity: np.ndarray     # events/s
+    base_latency: np.ndarray  # ms
+    source_share: np.ndarray  # Share of the entry rate arriving at each source (0 elsewhere)
+    level: np.ndarray
+    paths: np.ndarray        # Entry traffic reaching each node per unit entry rate (fan-out amplification)
+    edge_src: np.ndarray
+    edge_dst: np.ndarray
+
+
+def _build_network(proposals: list[Proposal], facts: MetadataFacts) -> _Network:
+    proposal_ids, names, classes, capacity, latency = [], [], [], [], []
+    source_share, levels, paths, edge_src, edge_dst = [], [], [], [], []
+
+    for pid, p in enumerate(proposals):
+        offset = len(names)
+        local = {c.name: i for i, c in enumerate(p.components)}
+        edges = sorted({
+            (local[s.from_component], local[s.to_component]) for s in p.data_flow
+            if s.from_component in local and s.to_component in local
+            and s.from_component != s.to_component
+        })
+
+        # Topological order (Kahn); nodes left in cycles keep component order
+        n = len(p.components)
+        indegree = [0] * n
+        succ: list[list[int]] = [[] for _ in range(n)]
+        for u, v in edges:
+            succ[u].append(v)
+            indegree[v] += 1
+        order = [i for i in range(n) if indegree[i] == 0]
+        for u in order:
+            for v in succ[u]:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    order.append(v)
+        ordered = set(order)
+        order += [i for i in range(n) if i not in ordered]
+        position = {node: k for k, node in enumerate(order)}
+        dag = [(u, v) for u, v in edges if position[u] < position[v]]  # Drop back edges
+
+        # Components outside the data flow (orchestrators, catalogs) carry no traffic
+        has_pred = {v for _, v in dag}
+        sources = {u for u, _ in dag} - has_pred
+        in_flow = sorted(sources | has_pred)
+        level = [0] * n
+        count = [0.0] * n
+        preds: list[list[int]] = [[] for _ in range(n)]
+        for u, v in dag:
+            preds[v].append(u)
+        for node in order:
+            if node in sources:
+                count[node] = 1.0 / len(sources)
+            for u in preds[node]:
+                level[node] = max(level[node], level[u] + 1)
+                count[node] += count[u]
+
+        local_ids = {node: offset + k for k, node in enumerate(in_flow)}
+        for i in in_flow:
+            c = p.components[i]
+            found = deployed_capacity(c.technology_suggestion or c.name, facts)
+            proposal_ids.append(pid)
+            names.append(c.name)
+            if found is None:
+                classes.append("generic")
+                capacity.append(DEFAULT_CAPACITY)
+                latency.append(DEFAULT_LATENCY_MS)
+            else:
+                classes.append(found[0])
+                capacity.append(found[1])
+                latency.append(BASE_LATENCY_MS.get(found[0], DEFAULT_LATENCY_MS))
+            source_share.append(1.0 / len(sources) if i in sources else 0.0)
+            levels.append(level[i])
+            paths.append(count[i])
+        edge_src += [local_ids[u] for u, _ in dag]
+        edge_dst += [local_ids[v] for _, v in dag]
+
+    return _Network(
+        proposal=np.array(proposal_ids, dtype=np.int64),
+        names=names,
+        classes=classes,
+        capacity=np.array(capacity, dtype=np.float64),
+        base_latency=np.array(latency, dtype=np.float64),
+        source_share=np.array(source_share, dtype=np.float64),
+        level=np.array(levels, dtype=np.int64),
+        paths=np.array(paths, dtype=np.float64),
+        edge_src=np.array(edge_src, dtype=np.int64),
+        edge_dst=np.array(edge_dst, dtype=np.int64),
+    )
+
+
+def _simulate(
+    net: _Network,
+    n_proposals: int,
+    arrival_rate: float,
+    horizon_seconds: float,
+    step_seconds: float,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run one scenario over all proposals at once.
+
+    Returns (per-node mean arrival rate, per-node backlog growth per second,
+    per-proposal end-to-end latency in ms for every step).
+    """
+    n_nodes = len(net.names)
+    n_steps = max(1, int(horizon_seconds / step_seconds))
+    served_per_step = net.capacity * step_seconds
+    sources = np.flatnonzero(net.source_share > 0)
+    external = rng.poisson(
+        arrival_rate * step_seconds * net.source_share[sources], size=(n_steps, len(sources)),
+    ).astype(np.float64)
+
+    levels = [np.flatnonzero(net.level == lvl) for lvl in range(int(net.level.max(initial=0)) + 1)]
+    edges_into = [np.flatnonzero(net.level[net.edge_dst] == lvl) for lvl in range(len(levels))]
+
+    backlog = np.zeros(n_nodes)
+    total_arrivals = np.zeros(n_nodes)
+    e2e = np.zeros((n_steps, n_proposals))
+
+    for t in range(n_steps):
+        inflow = np.zeros(n_nodes)
+        inflow[sources] = external[t]
+        departures = np.zeros(n_nodes)
+        latency = np.zeros(n_nodes)
+        for nodes, edges in zip(levels, edges_into):
+            if len(edges):
+                np.add.at(inflow, net.edge_dst[edges], departures[net.edge_src[edges]])
+                np.maximum.at(latency, net.edge_dst[edges], latency[net.edge_src[edges]])
+            queue = backlog[nodes] + inflow[nodes]
+            departures[nodes] = np.minimum(queue, served_per_step[nodes])
+            backlog[nodes] = queue - departures[nodes]
+
+            rate = inflow[nodes] / step_seconds
+            capacity = net.capacity[nodes]
+            sojourn = np.where(rate < capacity, 1.0 / np.maximum(capacity - rate, 1e-9), 0.0)
+            latency[nodes] += net.base_latency[nodes] + 1000.0 * (sojourn + backlog[nodes] / capacity)
+        total_arrivals += inflow
+        np.maximum.at(e2e[t], net.proposal, latency)
+
+    duration = n_steps * step_seconds
+    return total_arrivals / duration, backlog / duration, e2e
+
+
+def simulate_capacity(
+    proposals: list[Proposal],
+    facts: MetadataFacts,
+    horizon_seconds: float = 3600.0,
+    step_seconds: float = 10.0,
+    seed: int = 0,
+) -> list[CapacityReport]:
+    """Simulate every proposal under steady and peak (burst-adjusted) load."""
+    if not proposals:
+        return []
+    net = _build_network(proposals, facts)
+    rng = np.random.default_rng(seed)
+    scenarios = {
+        "steady": facts.steady_events_per_second,
+        "peak": facts.peak_events_per_second * facts.burst_multiplier,
+    }
+    saturation = net.capacity / np.maximum(net.paths, 1e-9)
+
+    per_scenario = {}
+    for scenario, rate in scenarios.items():
+        if len(net.names):
+            per_scenario[scenario] = _simulate(
+                net, len(proposals), rate, horizon_seconds, step_seconds, rng
+            )
+        else:
+            per_scenario[scenario] = (np.zeros(0), np.zeros(0), np.zeros((1, len(proposals))))
+
+    reports = []
+    for pid, p in enumerate(proposals):
+        nodes = np.flatnonzero(net.proposal == pid)
+        results = []
+        for scenario, rate in scenarios.items():
+            arrivals, growth, e2e = per_scenario[scenario]
+            p50, p95, p99 = np.percentile(e2e[:, pid], [50, 95, 99])
+            results.append(ScenarioResult(
+                scenario=scenario,
+                arrival_events_per_second=rate,
+                latency_p50_ms=float(p50),
+                latency_p95_ms=float(p95),
+                latency_p99_ms=float(p99),
+                components=[
+                    ComponentLoad(
+                        component=net.names[i],
+                        technology_class=net.classes[i],
+                        utilization=float(arrivals[i] / net.capacity[i]),
+                        queue_growth_per_second=float(growth[i]),
+                        saturation_events_per_second=float(saturation[i]),
+                    )
+                    for i in nodes
+                ],
+            ))
+        weakest = nodes[np.argmin(saturation[nodes])] if len(nodes) else None
+        reports.append(CapacityReport(
+            architecture_name=p.architecture_name,
+            scenarios=results,
+            saturation_events_per_second=float(saturation[weakest]) if weakest is not None else float("inf"),
+            bottleneck=net.names[weakest] if weakest is not None else "",
+        ))
+    return reports
+
+
+def capacity_annotations(report: CapacityReport) -> list[ConstraintAnnotation]:
+    """Turn a capacity report into annotations for the critics and the ranker."""
+    peak = next(s for s in report.scenarios if s.scenario == "peak")
+    annotations = []
+    for load in peak.components:
+        if load.utilization >= 1.0:
+            severity = "critical"
+        elif load.utilization >= 0.8:
+            severity = "warning"
+        else:
+            continue
+        annotations.append(ConstraintAnnotation(
+            constraint_type="resource_limits",
+            description=(
+                f"Capacity simulation: '{load.component}' ({load.technology_class}) runs at "
+                f"{load.utilization:.0%} utilization under peak load "
+                f"({peak.arrival_events_per_second:,.0f} events/s); backlog grows by "
+                f"{load.queue_growth_per_second:,.0f} events/s and it saturates above "
+                f"{load.saturation_events_per_second:,.0f} events/s at the entry"
+            ),
+            severity=severity,
+            affected_components=[load.component],
+            suggested_mitigation="Scale out or partition this component, or buffer and batch its input",
+        ))
+
+    summary = "; ".join(
+        f"{s.scenario} {s.arrival_events_per_second:,.0f} events/s: p50 {s.latency_p50_ms:,.0f} ms, "
+        f"p95 {s.latency_p95_ms:,.0f} ms, p99 {s.latency_p99_ms:,.0f} ms"
+        for s in report.scenarios
+    )
+    annotations.append(ConstraintAnnotation(
+        constraint_type="resource_limits",
+        description=(
+            f"Capacity simulation end-to-end latency — {summary}. First saturation at "
+            f"{report.saturation_events_per_second:,.0f} events/s ({report.bottleneck or 'n/a'})."
+        ),
+        severity="info",
+        affected_components=[report.bottleneck] if report.bottleneck else [],
+    ))
+    return annotations
+
+
+def run_capacity_simulation(
+    proposals: list[Proposal],
+    metadata_dir: Path,
+    horizon_seconds: float = 3600.0,
+    step_seconds: float = 10.0,
+    seed: int = 0,
+) -> dict[str, CapacityReport]:
+    """Capacity reports for each proposal, keyed by architecture name."""
+    facts = load_metadata_facts(metadata_dir)
+    reports = simulate_capacity(proposals, facts, horizon_seconds, step_seconds, seed)
+    saturated = sum(
+        1 for r in reports
+        if any(c.utilization >= 1.0 for s in r.scenarios if s.scenario == "peak" for c in s.components)
+    )
+    logger.info(
+        f"Capacity simulation: {len(reports)} proposals, {saturated} saturate under peak load "
+        f"({facts.peak_events_per_second * facts.burst_multiplier:,.0f} events/s)"
+    )
+    return {r.architecture_name: r for r in reports}
@@ -0,0 +1,130 @@
+"""Stage 2.2: Near-Duplicate Filter
+
+Mutations like `merge` or `abstract` often return proposals that barely
+differ from their parent or from sibling mutations. Every such duplicate
+would otherwise pay for diversity scoring, refinement, critique, debate and
+ranking. This stage collapses near-duplicates locally (no LLM call) using
+shingling + MinHash/LSH, and records which proposals were folded into which.
+"""
+
+import logging
+from typing import Union
+
+from models.schemas import (
+    Proposal,
+    MutatedProposal,
+    DuplicateCluster,
+    DeduplicationResult,
+)
+from utils.similarity import (
+    LshIndex,
+    MinHasher,
+    estimate_jaccard,
+    proposal_text,
+    shingles,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _find(parent: dict[str, str], name: str) -> str:
+    while parent[name] != name:
+        parent[name] = parent[parent[name]]
+        name = parent[name]
+    return name
+
+
+def run_deduplication(
+    proposals: list[Union[Proposal, MutatedProposal]],
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    bands: int = 32,
+    shingle_size: int = 3,
+) -> tuple[list[Union[Proposal, MutatedProposal]], DeduplicationResult]:
+    """Collapse near-duplicate proposals.
+
+    Proposals whose estimated Jaccard similarity is at or above `threshold`
+    are grouped (transitively). Each group keeps one representative:
+    original (non-mutated) proposals are preferred, then input order.
+    A proposal reusing an earlier proposal's name gets a numbered suffix
+    ("Name (2)"), so it is clustered and recorded like any other.
+
+    Args:
+        proposals: All proposals from Stage 2 (originals + mutations).
+        threshold: Estimated Jaccard similarity at which proposals collapse.
+        num_perm: Number of MinHash permutations.
+        bands: LSH bands (num_perm must be divisible by bands).
+        shingle_size: Words per shingle.
+
+    Returns:
+        (kept proposals in input order, deduplication record)
+    """
+    hasher = MinHasher(num_perm=num_perm)
+    index = LshIndex(num_perm=num_perm, bands=bands)
+
+    by_name: dict[str, Union[Proposal, MutatedProposal]] = {}
+    signatures: dict[str, list[int]] = {}
+    parent: dict[str, str] = {}
+
+    for p in proposals:
+        name = p.architecture_name
+        suffix = 2
+        while name in by_name:
+            name = f"{p.architecture_name} ({suffix})"
+            suffix += 1
+        if name != p.architecture_name:
+            p = p.model_copy(update={"architecture_name": name})
+        sig = hasher.signature(shingles(proposal_text(p), k=shingle_size))
+        parent[name] = name
+        for other in index.candidates(sig):
+            if estimate_jaccard(sig, signatures[other]) >= threshold:
+                parent[_find(parent, name)] = _find(parent, other)
+        index.add(name, sig)
+        signatures[name] = sig
+        by_name[name] = p
+
+    # Group by union-find root, then pick each group's representative
+    groups: dict[str, list[str]] = {}
+    for name in by_name:
+        groups.setdefault(_find(parent, name), []).append(name)
+
+    kept_names: set[str] = set()
+    clusters: list[DuplicateCluster] = []
+    for members in groups.values():
+        # Originals first, then input order (members are already in input order)
+        members.sort(key=lambda n: isinstance(by_name[n], MutatedProposal))
+        kept = members[0]
+        kept_names.add(kept)
+        if len(members) == 1:
+            continue
+
+        collapsed = members[1:]
+        clusters.append(DuplicateCluster(
+            kept_name=kept,
+            collapsed_names=collapsed,
+            similarities={
+                n: round(estimate_jaccard(signatures[kept], signatures[n]), 3)
+                for n in collapsed
+            },
+            lineage={
+                n: by_name[n].parent_architecture_name
+                for n in collapsed
+                if isinstance(by_name[n], MutatedProposal)
+            },
+        ))
+        logger.info(
+            f"  Collapsed {len(collapsed)} near-duplicate(s) into '{kept}': "
+            f"{', '.join(collapsed)}"
+        )
+
+    kept_proposals = [p for p in by_name.values() if p.architecture_name in kept_names]
+    result = DeduplicationResult(
+        clusters=clusters,
+        kept_count=len(kept_proposals),
+        collapsed_count=len(proposals) - len(kept_proposals),
+    )
+    logger.info(
+        f"Deduplication: Kept {result.kept_count} of {len(proposals)} proposals "
+        f"({result.collapsed_count} near-duplicates collapsed, threshold={threshold})."
+    )
+    return kept_proposals, result
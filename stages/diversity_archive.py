@@ -2,149 +2,554 @@
 
 Selects a top-K set of maximally diverse candidates from post-mutation
 proposals using MAP-Elites behavioral characterization.
+
+The grid itself lives in `MapElitesArchive`, which can be persisted to disk
+so the multi-generation evolution loop (stages/evolution_loop.py) keeps its
+elites across generations and across killed runs.
+
+Structural descriptors (component count, flow depth, fan-in/out, cycles,
+pattern mix) are computed locally from each proposal. With
+`structural_descriptors="local"` the LLM no longer scores structural
+complexity; with "local_only" no scoring call is made at all. An optional
+lexical prescorer (utils/lexical_novelty.py) estimates paradigm novelty and
+migration distance locally and either replaces the scoring call or gates
+which proposals still get one.
 """
 
+import asyncio
+import json
 import logging
-from typing import Union
+import os
+import random
+from pathlib import Path
+from typing import NamedTuple, Union
+
+import numpy as np
 
 from llm.client import call_llm
 from models.schemas import (
     Proposal,
     MutatedProposal,
     DiversityScores,
+    DiversityScoresBatch,
+    SemanticDiversityScores,
+    SemanticDiversityScoresBatch,
 )
-from prompts.diversity_scorer import DIVERSITY_SCORER_PROMPT
+from prompts.diversity_scorer import (
+    DIVERSITY_SCORER_PROMPT,
+    DIVERSITY_BATCH_SCORER_PROMPT,
+    SEMANTIC_DIVERSITY_SCORER_PROMPT,
+    SEMANTIC_DIVERSITY_BATCH_SCORER_PROMPT,
+)
+from utils.behavior_space import BehaviorSpace, Cell, GridBehaviorSpace
+from utils.compact_format import to_compact
+from utils.farthest_point import farthest_point_selection, prepare_descriptors
+from utils.lexical_novelty import LexicalEstimate, NoveltyPrescorer
+from utils.structural_descriptors import structural_metrics
+from utils.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+# How structural_complexity is obtained: scored by the LLM, computed locally
+# (LLM scores the rest), or computed locally with no LLM scoring call at all.
+STRUCTURAL_MODES = ("llm", "local", "local_only")
 
-async def run_diversity_archive(
-    proposals: list[Union[Proposal, MutatedProposal]],
-    starred_names: set[str] | None = None,
-    top_k: int = 10,
+
+def descriptor_values(ds: DiversityScores) -> dict[str, float]:
+    """Default behavioral descriptors: the numeric DiversityScores fields."""
+    return {
+        name: float(value)
+        for name, value in ds.model_dump().items()
+        if isinstance(value, (int, float))
+    }
+
+
+def proposal_descriptors(
+    p: Union[Proposal, MutatedProposal],
+    ds: DiversityScores,
+    extra: dict[str, float] | None = None,
+) -> dict[str, float]:
+    """All named descriptors of a scored proposal: local structural metrics
+    plus the DiversityScores dimensions, with `extra` added on top."""
+    return {
+        **structural_metrics(p).descriptors(),
+        **descriptor_values(ds),
+        **(extra or {}),
+    }
+
+
+class Elite(NamedTuple):
+    """The occupant of one archive cell."""
+    scores: DiversityScores
+    proposal: Union[Proposal, MutatedProposal]
+    descriptors: dict[str, float]
+
+
+def _default_scores(
+    p: Union[Proposal, MutatedProposal],
+    summary: str = "scoring failed",
+) -> DiversityScores:
+    """Mid-range scores used when scoring fails, so the proposal isn't lost."""
+    return DiversityScores(
+        architecture_name=p.architecture_name,
+        paradigm_novelty=3,
+        structural_complexity=3,
+        migration_distance=3,
+        quality_heuristic=5.0,
+        one_line_summary=f"{p.architecture_name} ({summary})",
+    )
+
+
+def _with_local_structure(
+    scores: Union[DiversityScores, SemanticDiversityScores],
+    p: Union[Proposal, MutatedProposal],
+) -> DiversityScores:
+    """Fill structural_complexity from the proposal's component count."""
+    data = scores.model_dump()
+    data["structural_complexity"] = structural_metrics(p).complexity_level
+    return DiversityScores(**data)
+
+
+def _lexical_scores(p: Union[Proposal, MutatedProposal], estimate: LexicalEstimate) -> DiversityScores:
+    """Scores from the lexical estimate and local structure; quality stays neutral."""
+    return DiversityScores(
+        architecture_name=p.architecture_name,
+        paradigm_novelty=estimate.paradigm_novelty,
+        structural_complexity=structural_metrics(p).complexity_level,
+        migration_distance=estimate.migration_distance,
+        quality_heuristic=5.0,
+        one_line_summary=(
+            f"{p.architecture_name} (lexical estimate, nearest pattern: "
+            f"{estimate.nearest_pattern or 'none'})"
+        ),
+    )
+
+
+async def score_proposal(
+    p: Union[Proposal, MutatedProposal],
     temperature: float = 0.2,
-) -> list[Union[Proposal, MutatedProposal]]:
+    structural_descriptors: str = "llm",
+) -> DiversityScores:
+    """Score a single proposal on the behavioral dimensions (one LLM call)."""
+    local = structural_descriptors != "llm"
+    try:
+        ds = await call_llm(
+            system_prompt=SEMANTIC_DIVERSITY_SCORER_PROMPT if local else DIVERSITY_SCORER_PROMPT,
+            user_message=(
+                f"Score this single proposal:\n\n"
+                f"Proposal: {p.architecture_name}\n{to_compact(p)}"
+            ),
+            response_model=SemanticDiversityScores if local else DiversityScores,
+            temperature=temperature,
+            stage="diversity_archive",
+        )
+    except Exception as e:
+        logger.error(f"Diversity scoring failed for '{p.architecture_name}': {e}")
+        ds = _default_scores(p)
+        return _with_local_structure(ds, p) if local else ds
+
+    ds.architecture_name = p.architecture_name  # Ensure exact name
+    if local:
+        ds = _with_local_structure(ds, p)
+    logger.info(
+        f"  Scored '{p.architecture_name}': "
+        f"novelty={ds.paradigm_novelty}, complexity={ds.structural_complexity}, "
+        f"distance={ds.migration_distance}, quality={ds.quality_heuristic:.1f}"
+    )
+    return ds
+
+
+def _proposal_summary(p: Union[Proposal, MutatedProposal]) -> str:
+    """Compact summary carrying what the 3 behavioral dimensions depend on."""
+    components = ", ".join(
+        f"{c.name} ({c.technology_suggestion})" if c.technology_suggestion else c.name
+        for c in p.components
+    )
+    patterns: dict[str, int] = {}
+    for step in p.data_flow:
+        patterns[step.pattern] = patterns.get(step.pattern, 0) + 1
+    lines = [
+        f"### {p.architecture_name}",
+        f"Paradigm: {p.paradigm_source}",
+        f"Thesis: {p.core_thesis}",
+        f"Components ({len(p.components)}): {components}",
+        f"Data flow: {len(p.data_flow)} steps; patterns: "
+        + ", ".join(f"{k} x{v}" for k, v in patterns.items()),
+        "Key innovations: " + "; ".join(p.key_innovations),
+    ]
+    return "\n".join(lines)
+
+
+def _pack_batches(
+    summaries: list[tuple[int, str]],
+    token_budget: int,
+    max_batch_size: int,
+) -> list[list[tuple[int, str]]]:
+    """Greedily pack (index, summary) pairs into batches under a token budget."""
+    batches: list[list[tuple[int, str]]] = []
+    current: list[tuple[int, str]] = []
+    current_tokens = 0
+    for item in summaries:
+        tokens = estimate_tokens(item[1])
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _score_batch(
+    batch: list[tuple[int, str]],
+    names: list[str],
+    temperature: float,
+    local: bool = False,
+) -> dict[int, Union[DiversityScores, SemanticDiversityScores]]:
+    """Score one batch in a single call. Returns scores for the entries it got back.
+
+    With `local=True` structural complexity is left out of the request.
     """
-    MAP-Elites diversity selection:
+    try:
+        result = await call_llm(
+            system_prompt=(
+                SEMANTIC_DIVERSITY_BATCH_SCORER_PROMPT if local else DIVERSITY_BATCH_SCORER_PROMPT
+            ),
+            user_message=(
+                f"Score each of these {len(batch)} proposals:\n\n"
+                + "\n\n".join(summary for _, summary in batch)
+            ),
+            response_model=SemanticDiversityScoresBatch if local else DiversityScoresBatch,
+            temperature=temperature,
+            stage="diversity_archive",
+        )
+    except Exception as e:
+        logger.error(f"Batched diversity scoring failed for {len(batch)} proposals: {e}")
+        return {}
 
-    1. Score all proposals on 3 behavioral dimensions via LLM.
-    2. Place them in a 5x5x5 MAP-Elites grid.
-    3. Keep only the best (by quality_heuristic) in each occupied cell.
-    4. Select top-K most diverse candidates.
-    5. Always include starred proposals.
+    by_key = {names[i].strip().lower(): i for i, _ in batch}
+    found: dict[int, Union[DiversityScores, SemanticDiversityScores]] = {}
+    for ds in result.scores:
+        i = by_key.get(ds.architecture_name.strip().lower())
+        if i is not None and i not in found:
+            ds.architecture_name = names[i]  # Ensure exact name
+            found[i] = ds
+    return found
 
-    Args:
-        proposals: All proposals from Stage 2 (originals + mutations).
-        starred_names: Names of human-starred proposals (always included).
-        top_k: Maximum number of proposals to advance.
-        temperature: LLM temperature for scoring (low for consistency).
+
+async def score_proposals_batched(
+    proposals: list[Union[Proposal, MutatedProposal]],
+    temperature: float = 0.2,
+    batch_token_budget: int = 6000,
+    max_batch_size: int = 12,
+    max_attempts: int = 3,
+    structural_descriptors: str = "llm",
+) -> tuple[list[DiversityScores], int]:
+    """Score many proposals per call using compact summaries.
+
+    Batches are sized by `batch_token_budget` (estimated prompt tokens of the
+    summaries) and run concurrently. Entries missing from a response are
+    re-queued into the next attempt; after `max_attempts` they get default
+    mid-range scores.
 
     Returns:
-        Selected diverse subset of proposals.
+        (scores in input order, number of LLM calls made)
     """
-    if starred_names is None:
-        starred_names = set()
+    local = structural_descriptors != "llm"
+    names = [p.architecture_name for p in proposals]
+    summaries = {i: _proposal_summary(p) for i, p in enumerate(proposals)}
+    scores: dict[int, Union[DiversityScores, SemanticDiversityScores]] = {}
 
-    if len(proposals) <= top_k:
+    pending = list(range(len(proposals)))
+    calls = 0
+    for attempt in range(1, max_attempts + 1):
+        if not pending:
+            break
+        batches = _pack_batches(
+            [(i, summaries[i]) for i in pending], batch_token_budget, max_batch_size
+        )
         logger.info(
-            f"Diversity Archive: Only {len(proposals)} proposals, "
-            f"all advance (top_k={top_k}). No filtering needed."
+            f"  Diversity scoring attempt {attempt}: {len(pending)} proposals "
+            f"in {len(batches)} batch(es)"
         )
-        return proposals
+        results = await asyncio.gather(
+            *(_score_batch(batch, names, temperature, local) for batch in batches)
+        )
+        calls += len(batches)
+        for found in results:
+            scores.update(found)
+        pending = [i for i in pending if i not in scores]
+        if pending:
+            logger.warning(f"  {len(pending)} proposals missing from batch responses, re-queued.")
+
+    for i in pending:
+        logger.error(f"Diversity scoring failed for '{names[i]}' after {max_attempts} attempts")
+        scores[i] = _default_scores(proposals[i])
+
+    for i in range(len(proposals)):
+        if local:
+            scores[i] = _with_local_structure(scores[i], proposals[i])
+        ds = scores[i]
+        logger.info(
+            f"  Scored '{ds.architecture_name}': "
+            f"novelty={ds.paradigm_novelty}, complexity={ds.structural_complexity}, "
+            f"distance={ds.migration_distance}, quality={ds.quality_heuristic:.1f}"
+        )
+    return [scores[i] for i in range(len(proposals))], calls
+
+
+async def score_proposals(
+    proposals: list[Union[Proposal, MutatedProposal]],
+    temperature: float = 0.2,
+    batch_token_budget: int | None = None,
+    max_batch_size: int = 12,
+    structural_descriptors: str = "llm",
+    novelty_prescorer: NoveltyPrescorer | None = None,
+) -> tuple[list[DiversityScores], int]:
+    """Score proposals concurrently (bounded by the per-key limit in llm.client).
+
+    Returns (scores in input order, number of LLM calls made).
 
-    # Step 1: Score each proposal individually (one LLM call per proposal)
-    logger.info(f"Diversity Archive: Scoring {len(proposals)} proposals one at a time...")
-    all_scores: list[DiversityScores] = []
-    for p in proposals:
-        try:
-            ds = await call_llm(
-                system_prompt=DIVERSITY_SCORER_PROMPT,
-                user_message=(
-                    f"Score this single proposal:\n\n"
-                    f"Proposal: {p.architecture_name}\n{p.model_dump_json(indent=2)}"
-                ),
-                response_model=DiversityScores,
+    If `batch_token_budget` is set, several proposals are scored per call
+    (see score_proposals_batched); otherwise one call per proposal.
+
+    `structural_descriptors` is one of STRUCTURAL_MODES. In "local_only" mode
+    no call is made: structural complexity comes from the component graph and
+    the LLM-only dimensions get neutral mid-range values, so the behavior
+    space should be built from local descriptors (e.g. component_count,
+    flow_depth, async_ratio).
+
+    With a `novelty_prescorer`, every proposal is first pre-scored lexically;
+    in "prescore" mode that is the final score, in "gate" mode only the
+    proposals the prescorer flags get the LLM call.
+    """
+    if structural_descriptors not in STRUCTURAL_MODES:
+        raise ValueError(
+            f"Unknown structural_descriptors mode '{structural_descriptors}' "
+            f"(expected one of {STRUCTURAL_MODES})"
+        )
+    if not proposals:
+        return [], 0
+    if novelty_prescorer is not None:
+        estimates = [novelty_prescorer.estimate(p) for p in proposals]
+        scores = [_lexical_scores(p, e) for p, e in zip(proposals, estimates)]
+        gated = [] if structural_descriptors == "local_only" else [
+            i for i, e in enumerate(estimates) if novelty_prescorer.needs_llm(e)
+        ]
+        logger.info(
+            f"  Lexical pre-scores for {len(proposals)} proposals; "
+            f"{len(gated)} sent to the LLM"
+        )
+        calls = 0
+        if gated:
+            llm_scores, calls = await score_proposals(
+                [proposals[i] for i in gated],
                 temperature=temperature,
-                stage="diversity_archive",
+                batch_token_budget=batch_token_budget,
+                max_batch_size=max_batch_size,
+                structural_descriptors=structural_descriptors,
             )
-            ds.architecture_name = p.architecture_name  # Ensure exact name
-            all_scores.append(ds)
-            logger.info(
-                f"  Scored '{p.architecture_name}': "
-                f"novelty={ds.paradigm_novelty}, complexity={ds.structural_complexity}, "
-                f"distance={ds.migration_distance}, quality={ds.quality_heuristic:.1f}"
+            for i, ds in zip(gated, llm_scores):
+                scores[i] = ds
+        return scores, calls
+    if structural_descriptors == "local_only":
+        logger.info(f"  Scoring {len(proposals)} proposals locally (no LLM call)")
+        return [
+            _with_local_structure(_default_scores(p, "structure only"), p) for p in proposals
+        ], 0
+    if batch_token_budget:
+        return await score_proposals_batched(
+            proposals,
+            temperature=temperature,
+            batch_token_budget=batch_token_budget,
+            max_batch_size=max_batch_size,
+            structural_descriptors=structural_descriptors,
+        )
+    return list(await asyncio.gather(*(
+        score_proposal(p, temperature=temperature, structural_descriptors=structural_descriptors)
+        for p in proposals
+    ))), len(proposals)
+
+
+class MapElitesArchive:
+    """MAP-Elites archive holding the best proposal (by quality_heuristic) per cell.
+
+    Cells come from a pluggable behavior space (utils/behavior_space.py);
+    the default is the original 5x5x5 grid over the DiversityScores
+    dimensions. If `path` is set, `save()` writes the archive as JSON
+    (atomically) and `load()` restores it, so elites survive between
+    generations and runs.
+    """
+
+    def __init__(self, path: Path | None = None, space: BehaviorSpace | None = None):
+        self.path = Path(path) if path else None
+        self.space = space or GridBehaviorSpace()
+        self.elites: dict[Cell, Elite] = {}
+
+    def __len__(self) -> int:
+        return len(self.elites)
+
+    @property
+    def coverage(self) -> int:
+        """Number of occupied cells."""
+        return len(self.elites)
+
+    def names(self) -> set[str]:
+        return {e.proposal.architecture_name for e in self.elites.values()}
+
+    def insert(
+        self,
+        proposal: Union[Proposal, MutatedProposal],
+        scores: DiversityScores,
+        descriptors: dict[str, float] | None = None,
+    ) -> bool:
+        """Place a proposal in its cell. Returns True if it became the cell's elite.
+
+        Descriptors available to the behavior space are the DiversityScores
+        dimensions plus the local structural metrics (see proposal_descriptors);
+        `descriptors` adds or overrides values.
+        """
+        values = proposal_descriptors(proposal, scores, descriptors)
+        cell = self.space.cell(values)
+        incumbent = self.elites.get(cell)
+        if incumbent is None or scores.quality_heuristic > incumbent.scores.quality_heuristic:
+            self.elites[cell] = Elite(scores, proposal, values)
+            return True
+        return False
+
+    def sample(self, n: int, rng: random.Random | None = None) -> list[Union[Proposal, MutatedProposal]]:
+        """Sample n elites uniformly at random (with replacement) as mutation parents."""
+        if not self.elites:
+            return []
+        rng = rng or random
+        pool = [e.proposal for e in self.elites.values()]
+        return rng.choices(pool, k=n)
+
+    def save(self) -> None:
+        """Persist the archive to `self.path` (no-op if no path is set)."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "behavior_space": {"type": self.space.kind, "dimensions": self.space.names},
+            "cells": [
+                {
+                    "cell": list(cell),
+                    "scores": e.scores.model_dump(),
+                    "descriptors": e.descriptors,
+                    "proposal": e.proposal.model_dump(),
+                }
+                for cell, e in self.elites.items()
+            ],
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path: Path, space: BehaviorSpace | None = None) -> "MapElitesArchive":
+        """Restore an archive from disk. Returns an empty archive if the file is missing.
+
+        Elites are re-inserted through `space`, so a changed behavior-space
+        configuration re-bins the saved elites instead of invalidating them.
+        """
+        archive = cls(path, space)
+        if not archive.path.exists():
+            return archive
+        with open(archive.path, encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data.get("cells", []):
+            raw = entry["proposal"]
+            proposal_cls = MutatedProposal if "mutation_applied" in raw else Proposal
+            archive.insert(
+                proposal_cls.model_validate(raw),
+                DiversityScores.model_validate(entry["scores"]),
+                entry.get("descriptors"),
             )
-        except Exception as e:
-            logger.error(f"Diversity scoring failed for '{p.architecture_name}': {e}")
-            # Assign default mid-range scores so the proposal isn't lost
-            all_scores.append(DiversityScores(
-                architecture_name=p.architecture_name,
-                paradigm_novelty=3,
-                structural_complexity=3,
-                migration_distance=3,
-                quality_heuristic=5.0,
-                one_line_summary=f"{p.architecture_name} (scoring failed)",
-            ))
+        return archive
 
-    # Build name->scores lookup
-    scores_by_name: dict[str, DiversityScores] = {
-        ds.architecture_name: ds for ds in all_scores
-    }
 
-    # Step 2-3: Build grid, keep best per cell
-    grid: dict[tuple[int, int, int], DiversityScores] = {}
-    for ds in all_scores:
-        cell = (ds.paradigm_novelty, ds.structural_complexity, ds.migration_distance)
-        if cell not in grid or ds.quality_heuristic > grid[cell].quality_heuristic:
-            grid[cell] = ds
+def select_diverse(
+    archive: MapElitesArchive,
+    starred_descriptors: list[dict[str, float]],
+    starred_names: set[str],
+    top_k: int,
+    distance_weights: list[float] | None = None,
+    distance_normalization: str = "none",
+) -> set[str]:
+    """Farthest-point selection of up to top_k elites, starred ones first.
 
-    # Step 4: Select top-K from unique cells, prioritizing diversity
-    selected_names: set[str] = set()
-
-    # Always include starred proposals first
-    for name in starred_names:
-        if any(p.architecture_name == name for p in proposals):
-            selected_names.add(name)
-
-    # Greedy diverse selection: pick the cell farthest from all already-selected cells
-    selected_cells: list[tuple[int, int, int]] = []
-
-    # Pre-populate selected_cells for starred proposals
-    for name in selected_names:
-        if name in scores_by_name:
-            ds = scores_by_name[name]
-            cell = (ds.paradigm_novelty, ds.structural_complexity, ds.migration_distance)
-            if cell not in selected_cells:
-                selected_cells.append(cell)
-
-    remaining_cells = [
-        (cell, ds) for cell, ds in grid.items()
-        if ds.architecture_name not in selected_names
+    Elites are compared by the centers of their cells; distances are
+    (optionally weighted and normalized) Euclidean distances, see
+    utils/farthest_point.py. Starred proposals' cells act as anchors.
+    """
+    space = archive.space
+    selected_names: set[str] = set(starred_names)
+
+    starred_cells = {space.cell(values) for values in starred_descriptors}
+
+    remaining = [
+        (cell, e.scores) for cell, e in archive.elites.items()
+        if e.proposal.architecture_name not in selected_names
     ]
+    slots = top_k - len(selected_names)
+    if slots <= 0 or not remaining:
+        return selected_names
 
-    while len(selected_names) < top_k and remaining_cells:
-        if not selected_cells:
-            # First pick: highest quality among highest novelty
-            remaining_cells.sort(key=lambda x: (-x[0][0], -x[1].quality_heuristic))
-            best_cell, best_ds = remaining_cells.pop(0)
-        else:
-            # Subsequent picks: maximize minimum distance to all selected cells
-            def min_distance(cell: tuple[int, int, int]) -> float:
-                return min(
-                    sum((a - b) ** 2 for a, b in zip(cell, sc)) ** 0.5
-                    for sc in selected_cells
-                )
+    centers = np.array(
+        [space.cell_center(cell) for cell, _ in remaining]
+        + [space.cell_center(cell) for cell in sorted(starred_cells)],
+        dtype=np.float64,
+    )
+    X = prepare_descriptors(centers, weights=distance_weights, normalize=distance_normalization)
+    candidates, anchors = X[:len(remaining)], X[len(remaining):]
 
-            remaining_cells.sort(key=lambda x: -min_distance(x[0]))
-            best_cell, best_ds = remaining_cells.pop(0)
+    # Without anchors, first pick: highest quality among highest first-dimension
+    # value (paradigm novelty by default)
+    first = min(
+        range(len(remaining)),
+        key=lambda i: (-centers[i][0], -remaining[i][1].quality_heuristic),
+    )
+    for i in farthest_point_selection(candidates, slots, anchors=anchors, first=first):
+        selected_names.add(remaining[i][1].architecture_name)
 
-        selected_cells.append(best_cell)
-        selected_names.add(best_ds.architecture_name)
+    return selected_names
 
-    # Step 5: Filter original proposals to only selected names
-    selected_proposals = [p for p in proposals if p.architecture_name in selected_names]
 
-    # Log what was dropped and why
+def select_elites(
+    archive: MapElitesArchive,
+    starred_names: set[str] | None = None,
+    top_k: int = 10,
+    distance_weights: list[float] | None = None,
+    distance_normalization: str = "none",
+) -> list[Union[Proposal, MutatedProposal]]:
+    """Select the top-K most diverse elites straight from an (evolved) archive."""
+    starred = {
+        e.proposal.architecture_name: e.descriptors
+        for e in archive.elites.values()
+        if e.proposal.architecture_name in (starred_names or set())
+    }
+    selected_names = select_diverse(
+        archive,
+        starred_descriptors=list(starred.values()),
+        starred_names=set(starred),
+        top_k=top_k,
+        distance_weights=distance_weights,
+        distance_normalization=distance_normalization,
+    )
+    return [e.proposal for e in archive.elites.values() if e.proposal.architecture_name in selected_names]
+
+
+def log_selection(
+    proposals: list[Union[Proposal, MutatedProposal]],
+    selected_proposals: list[Union[Proposal, MutatedProposal]],
+    scores_by_name: dict[str, DiversityScores],
+    archive: MapElitesArchive,
+) -> None:
+    """Log what was dropped and why, plus grid coverage."""
+    selected_names = {p.architecture_name for p in selected_proposals}
     dropped = [p for p in proposals if p.architecture_name not in selected_names]
     if dropped:
         logger.info(
@@ -163,10 +568,99 @@ async def run_diversity_archive(
         logger.info(f"Diversity Archive: All {len(selected_proposals)} proposals selected.")
 
     # Log grid coverage
-    occupied = len(grid)
     logger.info(
-        f"Diversity Archive: Grid coverage = {occupied}/125 cells occupied, "
+        f"Diversity Archive: Grid coverage = {archive.coverage}/{archive.space.n_cells} cells occupied, "
         f"{len(selected_proposals)} selected from {len(proposals)} candidates."
     )
 
+
+async def run_diversity_archive(
+    proposals: list[Union[Proposal, MutatedProposal]],
+    starred_names: set[str] | None = None,
+    top_k: int = 10,
+    temperature: float = 0.2,
+    batch_token_budget: int | None = None,
+    max_batch_size: int = 12,
+    distance_weights: list[float] | None = None,
+    distance_normalization: str = "none",
+    behavior_space: BehaviorSpace | None = None,
+    structural_descriptors: str = "llm",
+    novelty_prescorer: NoveltyPrescorer | None = None,
+) -> list[Union[Proposal, MutatedProposal]]:
+    """
+    MAP-Elites diversity selection:
+
+    1. Score all proposals on the behavioral dimensions (LLM and/or local).
+    2. Place them in a MAP-Elites grid (5x5x5 by default, or any behavior space).
+    3. Keep only the best (by quality_heuristic) in each occupied cell.
+    4. Select top-K most diverse candidates.
+    5. Always include starred proposals.
+
+    Args:
+        proposals: All proposals from Stage 2 (originals + mutations).
+        starred_names: Names of human-starred proposals (always included).
+        top_k: Maximum number of proposals to advance.
+        temperature: LLM temperature for scoring (low for consistency).
+        batch_token_budget: If set, score several compact proposal summaries
+                            per call, with batches sized to this many tokens.
+        max_batch_size: Maximum proposals per batched call.
+        distance_weights: Per-dimension weights for cell distances.
+        distance_normalization: "none", "range", or "std" per-dimension scaling.
+        behavior_space: Archive behavior space (defaults to the 5x5x5 grid).
+        structural_descriptors: "llm", "local", or "local_only" (see score_proposals).
+        novelty_prescorer: Optional lexical prescorer (see score_proposals).
+
+    Returns:
+        Selected diverse subset of proposals.
+    """
+    if starred_names is None:
+        starred_names = set()
+
+    if len(proposals) <= top_k:
+        logger.info(
+            f"Diversity Archive: Only {len(proposals)} proposals, "
+            f"all advance (top_k={top_k}). No filtering needed."
+        )
+        return proposals
+
+    # Step 1: Score all proposals (one call each, or batched)
+    logger.info(f"Diversity Archive: Scoring {len(proposals)} proposals...")
+    all_scores, _ = await score_proposals(
+        proposals,
+        temperature=temperature,
+        batch_token_budget=batch_token_budget,
+        max_batch_size=max_batch_size,
+        structural_descriptors=structural_descriptors,
+        novelty_prescorer=novelty_prescorer,
+    )
+
+    # Build name->scores lookup
+    scores_by_name: dict[str, DiversityScores] = {
+        ds.architecture_name: ds for ds in all_scores
+    }
+
+    # Step 2-3: Build grid, keep best per cell
+    archive = MapElitesArchive(space=behavior_space)
+    for p, ds in zip(proposals, all_scores):
+        archive.insert(p, ds)
+
+    # Step 4: Select top-K from unique cells, prioritizing diversity
+    present_names = {p.architecture_name for p in proposals}
+    starred = {name for name in starred_names if name in present_names}
+    selected_names = select_diverse(
+        archive,
+        starred_descriptors=[
+            proposal_descriptors(p, scores_by_name[p.architecture_name])
+            for p in proposals if p.architecture_name in starred
+        ],
+        starred_names=starred,
+        top_k=top_k,
+        distance_weights=distance_weights,
+        distance_normalization=distance_normalization,
+    )
+
+    # Step 5: Filter original proposals to only selected names
+    selected_proposals = [p for p in proposals if p.architecture_name in selected_names]
+    log_selection(proposals, selected_proposals, scores_by_name, archive)
+
     return selected_proposals
@@ -5,33 +5,48 @@ soft, domain-specific constraints. Like the physics critic, they
 annotate only — they CANNOT reject or eliminate proposals.
 
 Critics: Security, Cost, Organizational Readiness, Data Quality.
+
+In "fused" mode each proposal gets ONE call that returns every enabled
+critic's section (a response model keyed by domain), so the proposal and
+enterprise context are sent once instead of once per critic. Sections
+that are missing or fail validation are re-run as separate per-critic
+calls ("per_critic" mode runs every critic that way).
+
+Calls go through a bounded work pool (utils/work_pool.py): earlier
+proposals first, failed calls retried with backoff, and results
+aggregated as they arrive so progress can be reported live.
 """
 
-import asyncio
+import functools
 import logging
+from typing import Annotated, Any, Callable, Optional
+
+from pydantic import BaseModel, Field, ValidationError, WrapValidator, create_model
 
 from llm.client import call_llm
 from models.schemas import (
     AnnotatedProposal,
     DebateResult,
     DomainCriticResult,
+    DomainCritique,
     AllDomainCriticsResult,
 )
-from prompts.domain_critics import DOMAIN_CRITIC_PROMPTS
+from prompts.domain_critics import DOMAIN_CRITIC_PROMPTS, FUSED_CRITIC_PROMPT_HEADER
+from utils.compact_format import to_compact
+from utils.tokens import estimate_tokens
+from utils.work_pool import WorkPool
 
 logger = logging.getLogger(__name__)
 
+CRITIC_MODES = ("fused", "per_critic")
 
-async def run_domain_critic(
-    critic_domain: str,
-    critic_prompt: str,
+
+def _critic_message(
     annotated_proposal: AnnotatedProposal,
     enterprise_context: str,
     debate_result: DebateResult | None = None,
-    temperature: float = 0.3,
-) -> DomainCriticResult:
-    """Run a single domain critic against a single proposal."""
-
+) -> str:
+    """The user message shared by every critic of one proposal."""
     debate_context = ""
     if debate_result:
         debate_context = (
@@ -40,15 +55,91 @@ async def run_domain_critic(
             f"Residual concerns: {', '.join(debate_result.judgment.residual_concerns)}\n"
             f"Risk mitigation quality: {debate_result.judgment.risk_mitigation_quality}/10"
         )
+    return (
+        f"Review this architectural proposal:\n\n"
+        f"{to_compact(annotated_proposal)}\n\n"
+        f"Enterprise context:\n{enterprise_context}"
+        f"{debate_context}"
+    )
+
+
+def _none_if_invalid(value: Any, handler) -> Any:
+    """Let one malformed critic section fall back instead of failing the whole response."""
+    try:
+        return handler(value)
+    except ValidationError:
+        return None
+
+
+@functools.lru_cache(maxsize=16)
+def fused_response_model(domains: tuple[str, ...]) -> type[BaseModel]:
+    """Response model with one optional DomainCritique field per critic domain."""
+    fields = {
+        domain: (
+            Annotated[Optional[DomainCritique], WrapValidator(_none_if_invalid)],
+            Field(default=None, description=f"The {domain} critic's annotations and assessment"),
+        )
+        for domain in domains
+    }
+    return create_model("FusedDomainCritique", **fields)
+
+
+def fused_critic_prompt(domains: tuple[str, ...]) -> str:
+    """System prompt combining the enabled critics' briefs under their domain names."""
+    sections = [FUSED_CRITIC_PROMPT_HEADER]
+    for domain in domains:
+        sections.append(f"## Critic: {domain}\n\n{DOMAIN_CRITIC_PROMPTS[domain]}")
+    return "\n\n".join(sections)
+
+
+async def run_fused_domain_critics(
+    domains: tuple[str, ...],
+    annotated_proposal: AnnotatedProposal,
+    enterprise_context: str,
+    debate_result: DebateResult | None = None,
+    temperature: float = 0.3,
+) -> dict[str, DomainCriticResult]:
+    """Run several domain critics against one proposal in a single call.
+
+    Returns the critics whose sections came back valid, keyed by domain.
+    """
+    arch_name = annotated_proposal.proposal.architecture_name
+    response = await call_llm(
+        system_prompt=fused_critic_prompt(domains),
+        user_message=_critic_message(annotated_proposal, enterprise_context, debate_result),
+        response_model=fused_response_model(domains),
+        temperature=temperature,
+        stage="domain_critics",
+    )
+
+    results: dict[str, DomainCriticResult] = {}
+    for domain in domains:
+        critique = getattr(response, domain)
+        if critique is None:
+            continue
+        for ann in critique.annotations:
+            ann.critic_domain = domain
+        results[domain] = DomainCriticResult(
+            architecture_name=arch_name,
+            critic_domain=domain,
+            annotations=critique.annotations,
+            overall_assessment=critique.overall_assessment,
+        )
+    return results
 
+
+async def run_domain_critic(
+    critic_domain: str,
+    critic_prompt: str,
+    annotated_proposal: AnnotatedProposal,
+    enterprise_context: str,
+    debate_result: DebateResult | None = None,
+    temperature: float = 0.3,
+) -> DomainCriticResult:
+    """Run a single domain critic against a single proposal."""
     result = await call_llm(
         system_prompt=critic_prompt,
-        user_message=(
-            f"Review this architectural proposal:\n\n"
-            f"{annotated_proposal.model_dump_json(indent=2)}\n\n"
-            f"Enterprise context:\n{enterprise_context}"
-            f"{debate_context}"
-        ),
+        user_message=_critic_message(annotated_proposal, enterprise_context, debate_result),
         response_model=DomainCriticResult,
         temperature=temperature,
         stage="domain_critics",
@@ -61,14 +152,39 @@ async def run_domain_critic(
     return result
 
 
+def _aggregate(arch_name: str, results: list[DomainCriticResult]) -> AllDomainCriticsResult:
+    """Combine one proposal's critic results and count annotations by severity."""
+    aggregated = AllDomainCriticsResult(
+        architecture_name=arch_name,
+        critic_results=results,
+        total_critical=0,
+        total_warning=0,
+        total_info=0,
+    )
+    for result in results:
+        for ann in result.annotations:
+            if ann.severity == "critical":
+                aggregated.total_critical += 1
+            elif ann.severity == "warning":
+                aggregated.total_warning += 1
+            else:
+                aggregated.total_info += 1
+    return aggregated
+
+
 async def run_all_domain_critics(
     annotated_proposals: list[AnnotatedProposal],
     enterprise_context: str,
     debate_results: list[DebateResult] | None = None,
     enabled_critics: list[str] | None = None,
     temperature: float = 0.3,
+    mode: str = "fused",
+    max_concurrent: int = 4,
+    max_attempts: int = 3,
+    backoff_seconds: float = 2.0,
+    progress_callback: Callable[[int, int, dict], None] | None = None,
 ) -> dict[str, AllDomainCriticsResult]:
-    """Run all enabled domain critics against all proposals in parallel.
+    """Run all enabled domain critics against all proposals through a bounded work pool.
 
     Args:
         annotated_proposals: Proposals annotated by the physics critic.
@@ -76,73 +192,151 @@ async def run_all_domain_critics(
         debate_results: Results from structured debate (Stage 4.5).
         enabled_critics: List of critic domains to run. Defaults to all.
         temperature: LLM temperature for critics.
+        mode: "fused" (one call per proposal for all critics, per-critic
+              fallback) or "per_critic" (one call per proposal x critic).
+        max_concurrent: Calls in flight at once.
+        max_attempts: Attempts per call before it is given up (or, for a
+                      fused call, replaced by per-critic calls).
+        backoff_seconds: Base of the exponential retry backoff.
+        progress_callback: Called as (completed, total, details) each time
+                           all critics of a proposal have finished.
 
     Returns:
         Dict mapping architecture_name to aggregated results.
     """
+    if mode not in CRITIC_MODES:
+        raise ValueError(f"Unknown domain critic mode '{mode}' (expected one of {CRITIC_MODES})")
     if debate_results is None:
         debate_results = []
 
     if enabled_critics is None:
         enabled_critics = list(DOMAIN_CRITIC_PROMPTS.keys())
 
+    domains = []
+    for domain in enabled_critics:
+        if domain not in DOMAIN_CRITIC_PROMPTS:
+            logger.warning(f"Unknown domain critic '{domain}', skipping.")
+        elif domain not in domains:
+            domains.append(domain)
+    domains = tuple(domains)
+
     # Build debate lookup
     debate_map = {dr.architecture_name: dr for dr in debate_results}
 
-    # Launch all critic × proposal combinations in parallel
-    tasks = []
-    task_metadata: list[str] = []  # Track which proposal each task belongs to
-
+    # Rough input size of both modes, for the stage log
+    fused_tokens = per_critic_tokens = 0
     for ap in annotated_proposals:
-        arch_name = ap.proposal.architecture_name
-        for domain in enabled_critics:
-            prompt = DOMAIN_CRITIC_PROMPTS.get(domain)
-            if prompt is None:
-                logger.warning(f"Unknown domain critic '{domain}', skipping.")
-                continue
-            tasks.append(
-                run_domain_critic(
+        message = estimate_tokens(
+            _critic_message(ap, enterprise_context, debate_map.get(ap.proposal.architecture_name))
+        )
+        per_critic_tokens += sum(message + estimate_tokens(DOMAIN_CRITIC_PROMPTS[d]) for d in domains)
+        if domains:
+            fused_tokens += message + estimate_tokens(fused_critic_prompt(domains))
+
+    logger.info(
+        f"Domain Critics: Running {len(annotated_proposals)} proposals × {len(domains)} critics "
+        f"({mode} mode)..."
+    )
+
+    pool = WorkPool(
+        max_workers=max_concurrent,
+        max_attempts=max_attempts,
+        backoff_base=backoff_seconds,
+        name="Domain critics",
+    )
+
+    def submit_per_critic(index: int, ap: AnnotatedProposal, missing: list[str]) -> None:
+        for domain in missing:
+            pool.submit(
+                functools.partial(
+                    run_domain_critic,
                     critic_domain=domain,
-                    critic_prompt=prompt,
+                    critic_prompt=DOMAIN_CRITIC_PROMPTS[domain],
                     annotated_proposal=ap,
                     enterprise_context=enterprise_context,
-                    debate_result=debate_map.get(arch_name),
+                    debate_result=debate_map.get(ap.proposal.architecture_name),
                     temperature=temperature,
-                )
+                ),
+                priority=index,  # Earlier proposals first, so they complete first
+                key=(index, domain),
             )
-            task_metadata.append(arch_name)
-
-    logger.info(
-        f"Domain Critics: Running {len(tasks)} evaluations "
-        f"({len(annotated_proposals)} proposals × {len(enabled_critics)} critics)..."
-    )
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    fused = mode == "fused" and len(domains) > 1
+    for index, ap in enumerate(annotated_proposals):
+        if fused:
+            pool.submit(
+                functools.partial(
+                    run_fused_domain_critics, domains, ap, enterprise_context,
+                    debate_map.get(ap.proposal.architecture_name), temperature,
+                ),
+                priority=index,
+                key=(index, None),
+            )
+        else:
+            submit_per_critic(index, ap, list(domains))
 
-    # Aggregate by proposal
+    # Results stream in as calls finish; a proposal is complete once every
+    # critic has a result or has failed for good
+    collected: list[dict[str, DomainCriticResult]] = [{} for _ in annotated_proposals]
+    unresolved = [set(domains) for _ in annotated_proposals]
+    completed = calls = failed = 0
     aggregated: dict[str, AllDomainCriticsResult] = {}
-    for arch_name, result in zip(task_metadata, results):
-        if isinstance(result, Exception):
-            logger.error(f"Domain critic failed for '{arch_name}': {result}")
+    async for result in pool.as_completed():
+        index, domain = result.key
+        ap = annotated_proposals[index]
+        arch_name = ap.proposal.architecture_name
+        calls += result.attempts
+        if domain is None:
+            if result.ok:
+                collected[index].update(result.value)
+            else:
+                logger.warning(
+                    f"Fused domain critics failed for '{arch_name}' ({result.error}); running per critic."
+                )
+            missing = [d for d in domains if d not in collected[index]]
+            if missing and result.ok:
+                logger.info(f"Domain Critics: '{arch_name}' falling back per critic for {missing}")
+            submit_per_critic(index, ap, missing)
+            unresolved[index] &= set(missing)
+        else:
+            if result.ok:
+                collected[index][domain] = result.value
+            else:
+                failed += 1
+                logger.error(
+                    f"Domain critic '{domain}' failed for '{arch_name}' after "
+                    f"{result.attempts} attempts: {result.error}"
+                )
+            unresolved[index].discard(domain)
+
+        if unresolved[index]:
             continue
+        results = [collected[index][d] for d in domains if d in collected[index]]
+        if results:
+            aggregated[arch_name] = _aggregate(arch_name, results)
+        completed += 1
+        if progress_callback:
+            progress_callback(completed, len(annotated_proposals), {
+                "architecture_name": arch_name,
+                "critics": len(results),
+                "failed": len(domains) - len(results),
+            })
 
-        if arch_name not in aggregated:
-            aggregated[arch_name] = AllDomainCriticsResult(
-                architecture_name=arch_name,
-                critic_results=[],
-                total_critical=0,
-                total_warning=0,
-                total_info=0,
-            )
-        aggregated[arch_name].critic_results.append(result)
-        for ann in result.annotations:
-            if ann.severity == "critical":
-                aggregated[arch_name].total_critical += 1
-            elif ann.severity == "warning":
-                aggregated[arch_name].total_warning += 1
-            else:
-                aggregated[arch_name].total_info += 1
+    logger.info(
+        f"Domain Critics: {calls} calls ({pool.retries} retries, {failed} critic evaluations failed; "
+        f"per-critic mode without retries: {len(annotated_proposals) * len(domains)})."
+    )
+    if fused:
+        logger.info(
+            f"Domain Critics: ~{fused_tokens} input tokens before fallbacks "
+            f"vs ~{per_critic_tokens} per critic."
+        )
 
+    # Keep the input order of proposals
+    aggregated = {
+        ap.proposal.architecture_name: aggregated[ap.proposal.architecture_name]
+        for ap in annotated_proposals if ap.proposal.architecture_name in aggregated
+    }
     total_annotations = sum(
         r.total_critical + r.total_warning + r.total_info
         for r in aggregated.values()
@@ -0,0 +1,235 @@
+"""Stage 2.5 (iterative mode): Multi-Generation MAP-Elites Evolution
+
+Instead of a single mutate-then-select pass, repeatedly:
+
+1. Sample parent elites from the archive.
+2. Mutate them (all mutation calls of a generation run concurrently).
+3. Score ONLY the new children (concurrently).
+4. Insert the children into the grid and persist the archive.
+
+Stops on a generation count, a coverage plateau (no new cells for N
+generations), or an LLM-call budget. Because the archive is saved after
+every generation, a killed run resumes from its last elites.
+"""
+
+import asyncio
+import logging
+import random
+from pathlib import Path
+from typing import Callable, Union
+
+from models.schemas import Proposal, MutatedProposal
+from prompts.mutation_operators import OPERATOR_PROMPTS
+from stages.diversity_archive import MapElitesArchive, score_proposals
+from stages.mutation_engine import mutate_proposal
+from utils.behavior_space import BehaviorSpace
+from utils.lexical_novelty import NoveltyPrescorer
+from utils.operator_bandit import OperatorBandit
+
+logger = logging.getLogger(__name__)
+
+
+def _dedupe_name(child: MutatedProposal, taken: set[str], generation: int) -> None:
+    """Rename a child whose architecture_name collides with an existing elite."""
+    if child.architecture_name not in taken:
+        return
+    base = f"{child.architecture_name} (gen {generation})"
+    name, suffix = base, 2
+    while name in taken:
+        name = f"{base} #{suffix}"
+        suffix += 1
+    child.architecture_name = name
+
+
+async def run_evolution(
+    seed_proposals: list[Union[Proposal, MutatedProposal]],
+    generations: int = 3,
+    children_per_generation: int = 8,
+    available_operators: list[str] | None = None,
+    mutation_temperature: float = 0.85,
+    scoring_temperature: float = 0.2,
+    plateau_generations: int = 2,
+    max_llm_calls: int | None = None,
+    archive_path: Path | None = None,
+    resume: bool = True,
+    progress_callback: Callable[[int, dict], None] | None = None,
+    operator_selector: OperatorBandit | None = None,
+    mutation_response_mode: str = "full",
+    scoring_batch_token_budget: int | None = None,
+    scoring_max_batch_size: int = 12,
+    behavior_space: BehaviorSpace | None = None,
+    structural_descriptors: str = "llm",
+    novelty_prescorer: NoveltyPrescorer | None = None,
+) -> MapElitesArchive:
+    """Evolve the MAP-Elites archive over multiple generations.
+
+    Args:
+        seed_proposals: Initial population (Stage 1 originals + Stage 2 mutations).
+        generations: Maximum number of generations to run.
+        children_per_generation: Mutation calls issued per generation.
+        available_operators: Mutation operators to sample from. Defaults to all.
+        mutation_temperature: LLM temperature for mutation calls.
+        scoring_temperature: LLM temperature for diversity scoring calls.
+        plateau_generations: Stop after this many consecutive generations
+                             that add no new cells (0 disables the check).
+        max_llm_calls: Budget of mutation + scoring calls for the whole loop,
+                       including seed scoring. None means unlimited. Scoring is
+                       counted as one call per proposal (an upper bound when batched).
+        archive_path: Where to persist the archive after every generation.
+        resume: If True and archive_path exists, continue from the saved elites.
+        progress_callback: Called as (generation, details) after each generation.
+        operator_selector: Optional bandit that picks operators and is rewarded
+                           when a child becomes a cell's elite.
+        mutation_response_mode: "full" or "patch" (see mutate_proposal).
+        scoring_batch_token_budget: If set, score children in batched calls
+                                    (see score_proposals_batched).
+        scoring_max_batch_size: Maximum proposals per batched scoring call.
+        behavior_space: Archive behavior space (defaults to the 5x5x5 grid).
+        structural_descriptors: "llm", "local", or "local_only" (see
+                                score_proposals). "local_only" scoring costs
+                                no LLM calls.
+        novelty_prescorer: Optional lexical prescorer (see score_proposals);
+                           in "prescore" mode scoring costs no LLM calls.
+
+    Returns:
+        The evolved archive.
+    """
+    if available_operators is None:
+        available_operators = list(OPERATOR_PROMPTS.keys())
+
+    if resume and archive_path is not None:
+        archive = MapElitesArchive.load(archive_path, space=behavior_space)
+        if len(archive):
+            logger.info(
+                f"Evolution: Resumed archive from {archive_path} "
+                f"({archive.coverage}/{archive.space.n_cells} cells occupied)"
+            )
+    else:
+        archive = MapElitesArchive(archive_path, space=behavior_space)
+
+    calls_used = 0
+    # LLM calls per scored proposal, for budgeting (an upper bound in gate or
+    # batched mode; the calls actually made are what gets counted)
+    scoring_cost = 0 if (
+        structural_descriptors == "local_only"
+        or (novelty_prescorer is not None and novelty_prescorer.mode == "prescore")
+    ) else 1
+
+    def remaining_budget() -> int | None:
+        return None if max_llm_calls is None else max(0, max_llm_calls - calls_used)
+
+    # Seed: score only proposals the (possibly resumed) archive hasn't seen
+    known_names = archive.names()
+    new_seeds = [p for p in seed_proposals if p.architecture_name not in known_names]
+    budget = remaining_budget()
+    if budget is not None and scoring_cost and len(new_seeds) > budget:
+        logger.warning(
+            f"Evolution: Budget allows scoring only {budget}/{len(new_seeds)} seed proposals."
+        )
+        new_seeds = new_seeds[:budget]
+    if new_seeds:
+        logger.info(f"Evolution: Scoring {len(new_seeds)} seed proposals...")
+        seed_scores, scoring_calls = await score_proposals(
+            new_seeds,
+            temperature=scoring_temperature,
+            batch_token_budget=scoring_batch_token_budget,
+            max_batch_size=scoring_max_batch_size,
+            structural_descriptors=structural_descriptors,
+            novelty_prescorer=novelty_prescorer,
+        )
+        calls_used += scoring_calls
+        for p, ds in zip(new_seeds, seed_scores):
+            archive.insert(p, ds)
+        archive.save()
+
+    stale_generations = 0
+    for generation in range(1, generations + 1):
+        # Each child costs one mutation call (+ one scoring call unless scored locally)
+        n_children = children_per_generation
+        budget = remaining_budget()
+        if budget is not None:
+            n_children = min(n_children, budget // (1 + scoring_cost))
+        if n_children <= 0:
+            logger.info(f"Evolution: LLM-call budget exhausted after {calls_used} calls.")
+            break
+
+        parents = archive.sample(n_children)
+        if not parents:
+            logger.warning("Evolution: Archive is empty, nothing to evolve.")
+            break
+        if operator_selector is not None:
+            operators = operator_selector.select(
+                available_operators, k=len(parents), distinct=False
+            )
+        else:
+            operators = [random.choice(available_operators) for _ in parents]
+
+        logger.info(
+            f"Evolution: Generation {generation}/{generations} — "
+            f"mutating {len(parents)} elites..."
+        )
+        results = await asyncio.gather(*(
+            mutate_proposal(
+                parent, op_name,
+                temperature=mutation_temperature,
+                response_mode=mutation_response_mode,
+            )
+            for parent, op_name in zip(parents, operators)
+        ))
+        calls_used += len(parents)
+
+        children = [c for c in results if c is not None]
+        taken = archive.names()
+        for child in children:
+            _dedupe_name(child, taken, generation)
+            taken.add(child.architecture_name)
+        if operator_selector is not None:
+            for op_name, result in zip(operators, results):
+                operator_selector.record_pull(
+                    op_name, result.architecture_name if result is not None else None
+                )
+
+        child_scores, scoring_calls = await score_proposals(
+            children,
+            temperature=scoring_temperature,
+            batch_token_budget=scoring_batch_token_budget,
+            max_batch_size=scoring_max_batch_size,
+            structural_descriptors=structural_descriptors,
+            novelty_prescorer=novelty_prescorer,
+        )
+        calls_used += scoring_calls
+
+        coverage_before = archive.coverage
+        placed_names = {
+            child.architecture_name for child, ds in zip(children, child_scores)
+            if archive.insert(child, ds)
+        }
+        improved = len(placed_names)
+        if operator_selector is not None:
+            operator_selector.reward_selection(placed_names)
+        new_cells = archive.coverage - coverage_before
+        archive.save()
+
+        logger.info(
+            f"Evolution: Generation {generation} — {len(children)} children, "
+            f"{improved} elites placed ({new_cells} new cells), "
+            f"coverage {archive.coverage}/{archive.space.n_cells}, {calls_used} LLM calls used"
+        )
+        if progress_callback:
+            progress_callback(generation, {
+                "generation": generation,
+                "children": len(children),
+                "elites_placed": improved,
+                "new_cells": new_cells,
+                "coverage": archive.coverage,
+                "llm_calls": calls_used,
+            })
+
+        stale_generations = stale_generations + 1 if new_cells == 0 else 0
+        if plateau_generations and stale_generations >= plateau_generations:
+            logger.info(
+                f"Evolution: Coverage plateaued for {stale_generations} generations, stopping."
+            )
+            break
+
+    return archive
@@ -9,49 +9,140 @@ import logging
 import random
 
 from llm.client import call_llm
-from models.schemas import Proposal, MutatedProposal
+from models.schemas import Proposal, MutatedProposal, MutationPatch
 from prompts.mutation_operators import OPERATOR_PROMPTS
+from prompts.patch_mode import PATCH_MODE_INSTRUCTIONS
+from utils.compact_format import to_compact
+from utils.operator_bandit import OperatorBandit
+from utils.proposal_patch import PatchError, apply_patch
 
 logger = logging.getLogger(__name__)
 
 
+async def _mutate_with_patch(
+    proposal: Proposal,
+    op_name: str,
+    temperature: float,
+) -> MutatedProposal:
+    """Ask for a MutationPatch and apply it locally (raises PatchError if it doesn't fit).
+
+    A variant that keeps its parent's name is renamed after the operator, so
+    deduplication and the archive/bandit keys don't mistake it for the parent.
+    """
+    patch = await call_llm(
+        system_prompt=OPERATOR_PROMPTS[op_name] + PATCH_MODE_INSTRUCTIONS,
+        user_message=(
+            "Here is the architectural proposal to mutate:\n\n"
+            f"{to_compact(proposal)}"
+        ),
+        response_model=MutationPatch,
+        temperature=temperature,
+        stage="mutation_engine",
+    )
+    if patch.architecture_name.strip().casefold() == proposal.architecture_name.strip().casefold():
+        patch.architecture_name = f"{proposal.architecture_name} ({op_name})"
+    return apply_patch(
+        proposal,
+        patch,
+        MutatedProposal,
+        mutation_applied=op_name,
+        parent_architecture_name=proposal.architecture_name,
+    )
+
+
+async def mutate_proposal(
+    proposal: Proposal,
+    op_name: str,
+    temperature: float = 0.85,
+    response_mode: str = "full",
+) -> MutatedProposal | None:
+    """Apply a single mutation operator to a proposal. Returns None on failure.
+
+    With response_mode="patch" the LLM returns only the edits, which are
+    applied locally; a patch that doesn't fit falls back to full regeneration.
+    """
+    try:
+        result = None
+        if response_mode == "patch":
+            try:
+                result = await _mutate_with_patch(proposal, op_name, temperature)
+            except PatchError as e:
+                logger.warning(
+                    f"Patch for '{op_name}' on '{proposal.architecture_name}' "
+                    f"did not apply ({e}); regenerating the full proposal."
+                )
+        if result is None:
+            result = await call_llm(
+                system_prompt=OPERATOR_PROMPTS[op_name],
+                user_message=(
+                    "Here is the architectural proposal to mutate:\n\n"
+                    f"{to_compact(proposal)}"
+                ),
+                response_model=MutatedProposal,
+                temperature=temperature,
+                stage="mutation_engine",
+            )
+    except Exception as e:
+        logger.error(f"Mutation '{op_name}' on '{proposal.architecture_name}' failed: {e}")
+        return None
+
+    result.mutation_applied = op_name
+    result.parent_architecture_name = proposal.architecture_name
+    result.paradigm_source = f"{proposal.paradigm_source}+mutation-{op_name}"
+    logger.info(f"  ✓ Mutated '{proposal.architecture_name}' with {op_name}")
+    return result
+
+
+def _unique_name(child: MutatedProposal, taken: set[str]) -> None:
+    """Suffix a child's architecture_name ("Name (2)") if another candidate already uses it."""
+    base, suffix = child.architecture_name, 2
+    while child.architecture_name in taken:
+        child.architecture_name = f"{base} ({suffix})"
+        suffix += 1
+    taken.add(child.architecture_name)
+
+
 async def run_mutations(
     proposals: list[Proposal],
     operators_per_proposal: int = 3,
     available_operators: list[str] | None = None,
     temperature: float = 0.85,
+    operator_selector: OperatorBandit | None = None,
+    response_mode: str = "full",
 ) -> list[MutatedProposal]:
-    """Apply random mutation operators to each proposal."""
+    """Apply mutation operators to each proposal.
+
+    Operators are sampled uniformly at random unless an `operator_selector`
+    (bandit) is given, in which case it picks them and is told about every
+    pull so it can be rewarded later. `response_mode` is "full" (regenerate
+    the proposal) or "patch" (return only the edits). A child named like an
+    earlier candidate gets a numbered suffix, so names stay unique keys.
+    """
     if available_operators is None:
         available_operators = list(OPERATOR_PROMPTS.keys())
 
     # Run mutations SEQUENTIALLY
     mutated = []
+    taken = {p.architecture_name for p in proposals}
 
     for proposal in proposals:
         k = min(operators_per_proposal, len(available_operators))
-        selected_ops = random.sample(available_operators, k=k)
+        if operator_selector is not None:
+            selected_ops = operator_selector.select(available_operators, k=k)
+        else:
+            selected_ops = random.sample(available_operators, k=k)
 
         for op_name in selected_ops:
-            system_prompt = OPERATOR_PROMPTS[op_name]
-            try:
-                result = await call_llm(
-                    system_prompt=system_prompt,
-                    user_message=(
-                        "Here is the architectural proposal to mutate:\n\n"
-                        f"{proposal.model_dump_json(indent=2)}"
-                    ),
-                    response_model=MutatedProposal,
-                    temperature=temperature,
-                    stage="mutation_engine",
+            result = await mutate_proposal(
+                proposal, op_name, temperature=temperature, response_mode=response_mode
+            )
+            if result is not None:
+                _unique_name(result, taken)
+            if operator_selector is not None:
+                operator_selector.record_pull(
+                    op_name, result.architecture_name if result is not None else None
                 )
-                result.mutation_applied = op_name
-                result.parent_architecture_name = proposal.architecture_name
-                result.paradigm_source = f"{proposal.paradigm_source}+mutation-{op_name}"
+            if result is not None:
                 mutated.append(result)
-                logger.info(f"  ✓ Mutated '{proposal.architecture_name}' with {op_name}")
-            except Exception as e:
-                logger.error(f"Mutation '{op_name}' on '{proposal.architecture_name}' failed: {e}")
-                continue
 
     return mutated
@@ -0,0 +1,281 @@
+"""Stage 5 (alternative): Pairwise Tournament Ranking
+
+Instead of asking for absolute 0-10 scores one proposal at a time, the LLM
+compares two proposals at a time and names the stronger one on each of the
+four portfolio dimensions. Pairings follow a Swiss system: each round sorts
+proposals by their points so far and pairs neighbours that have not met,
+so ~ceil(log2 n) + 1 rounds of n/2 concurrent comparisons (O(n log n)
+calls in total) separate a portfolio of hundreds.
+
+Outcomes are aggregated per dimension with a Bradley-Terry model (MM
+updates, ties as half wins, one virtual win and loss against an average
+opponent as a prior). A proposal's calibrated score is 10x its modelled
+probability of beating an average proposal, and is returned as a
+ProposalScore so the composite score and tier logic in
+portfolio_assembly apply unchanged.
+"""
+
+import asyncio
+import logging
+import math
+import random
+
+import numpy as np
+
+from llm.client import call_llm
+from models.schemas import (
+    AnnotatedProposal,
+    AllDomainCriticsResult,
+    DebateResult,
+    PairwiseJudgment,
+    ProposalScore,
+)
+from prompts.portfolio_ranker import PAIRWISE_RANKER_PROMPT
+from utils.debate_context import context_digest, proposal_digest
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("innovation", "feasibility", "business_alignment", "migration_complexity")
+
+_OUTCOME = {"A": 1.0, "B": 0.0, "tie": 0.5}
+
+# Innovation score below the first cutoff is conservative, at or above the
+# second radical (the ranker prompt's tiering rules: <= 4, 5-7, >= 8)
+DEFAULT_TIER_CUTOFFS = (4.5, 7.5)
+
+
+def tier_for_innovation(
+    innovation_score: float,
+    cutoffs: tuple[float, float] = DEFAULT_TIER_CUTOFFS,
+) -> str:
+    """Tier by innovation score."""
+    conservative_below, radical_from = cutoffs
+    if innovation_score < conservative_below:
+        return "conservative"
+    if innovation_score >= radical_from:
+        return "radical"
+    return "moderate_innovation"
+
+
+def swiss_pairings(
+    points: np.ndarray,
+    played: set[tuple[int, int]],
+    rng: random.Random,
+) -> list[tuple[int, int]]:
+    """Pair players with similar points that have not met yet.
+
+    Players are ordered by points (random tie-break) and each takes the
+    nearest unpaired opponent below it it hasn't played; with an odd
+    count the last unpaired player gets a bye.
+    """
+    order = sorted(range(len(points)), key=lambda i: (-points[i], rng.random()))
+    unpaired = list(order)
+    pairs = []
+    while len(unpaired) > 1:
+        i = unpaired.pop(0)
+        partner = next(
+            (j for j in unpaired if (min(i, j), max(i, j)) not in played),
+            unpaired[0],  # Everyone left has met i already: allow a rematch
+        )
+        unpaired.remove(partner)
+        pairs.append((i, partner))
+    return pairs
+
+
+def bradley_terry(
+    n: int,
+    pairs: np.ndarray,
+    outcomes: np.ndarray,
+    prior_games: float = 1.0,
+    iterations: int = 200,
+    tol: float = 1e-8,
+) -> np.ndarray:
+    """Bradley-Terry strengths from pairwise outcomes (MM algorithm).
+
+    Args:
+        n: Number of players.
+        pairs: (m, 2) array of player indices (a, b).
+        outcomes: (m,) array, 1 if a won, 0 if b won, 0.5 for a tie.
+        prior_games: Virtual games split evenly against an average
+                     (strength 1) opponent; keeps undefeated and winless
+                     players finite.
+
+    Returns:
+        (n,) strengths normalized to a geometric mean of 1.
+    """
+    a, b = pairs[:, 0], pairs[:, 1]
+    wins = np.full(n, prior_games / 2)
+    np.add.at(wins, a, outcomes)
+    np.add.at(wins, b, 1.0 - outcomes)
+
+    strength = np.ones(n)
+    for _ in range(iterations):
+        inv = 1.0 / (strength[a] + strength[b])
+        denom = np.full(n, prior_games / (strength + 1.0))
+        np.add.at(denom, a, inv)
+        np.add.at(denom, b, inv)
+        updated = wins / denom
+        updated /= np.exp(np.log(updated).mean())
+        if np.max(np.abs(np.log(updated) - np.log(strength))) < tol:
+            strength = updated
+            break
+        strength = updated
+    return strength
+
+
+def calibrated_scores(strength: np.ndarray) -> np.ndarray:
+    """0-10 scores: 10x the probability of beating an average (strength 1) opponent."""
+    return 10.0 * strength / (strength + 1.0)
+
+
+def _comparison_text(
+    ap: AnnotatedProposal,
+    debate_result: DebateResult | None,
+    domain_critic_result: AllDomainCriticsResult | None,
+) -> str:
+    """Compact description of one side of a comparison."""
+    lines = [proposal_digest(ap)]
+    if debate_result:
+        j = debate_result.judgment
+        lines.append(
+            f"Debate: winner {j.debate_winner}, innovation defense "
+            f"{j.innovation_defense_strength}/10, risk mitigation {j.risk_mitigation_quality}/10; "
+            f"key insight: {j.key_insight}"
+        )
+        if j.residual_concerns:
+            lines.append("Residual concerns: " + "; ".join(j.residual_concerns))
+    if domain_critic_result:
+        lines.append(
+            f"Domain critics: {domain_critic_result.total_critical} critical, "
+            f"{domain_critic_result.total_warning} warning, {domain_critic_result.total_info} info"
+        )
+        lines.extend(
+            f"  - [{ann.severity}] {ann.concern}"
+            for cr in domain_critic_result.critic_results
+            for ann in cr.annotations if ann.severity == "critical"
+        )
+    return "\n".join(lines)
+
+
+async def _compare(
+    texts: list[str],
+    i: int,
+    j: int,
+    context: str,
+    temperature: float,
+    rng: random.Random,
+) -> tuple[int, int, dict[str, float]] | None:
+    """One comparison; proposals are shown in random order to offset position bias."""
+    a, b = (i, j) if rng.random() < 0.5 else (j, i)
+    try:
+        judgment = await call_llm(
+            system_prompt=PAIRWISE_RANKER_PROMPT,
+            user_message=(
+                f"Enterprise context (digest):\n{context}\n\n"
+                f"PROPOSAL A:\n{texts[a]}\n\n"
+                f"PROPOSAL B:\n{texts[b]}"
+            ),
+            response_model=PairwiseJudgment,
+            temperature=temperature,
+            stage="portfolio_ranker",
+            max_retries=2,
+        )
+    except Exception as e:
+        logger.error(f"Pairwise comparison failed ({a} vs {b}): {e}")
+        return None
+    outcomes = {
+        dim: _OUTCOME.get(getattr(judgment, f"{dim}_winner").strip(), 0.5)
+        for dim in DIMENSIONS
+    }
+    return a, b, outcomes
+
+
+async def run_pairwise_ranking(
+    annotated_proposals: list[AnnotatedProposal],
+    enterprise_context: str,
+    temperature: float = 0.3,
+    debate_results: list[DebateResult] | None = None,
+    domain_critic_results: dict[str, AllDomainCriticsResult] | None = None,
+    swiss_rounds: int | None = None,
+    seed: int = 0,
+    context_digest_tokens: int = 800,
+) -> list[ProposalScore]:
+    """Rank proposals with a Swiss-system tournament of pairwise LLM comparisons.
+
+    Args:
+        swiss_rounds: Tournament rounds; None uses ceil(log2 n) + 1.
+        seed: Seeds pairing tie-breaks and A/B presentation order.
+        context_digest_tokens: Size of the enterprise-context digest sent
+                               with each comparison.
+
+    Returns:
+        One ProposalScore per proposal, in input order.
+    """
+    n = len(annotated_proposals)
+    if n == 0:
+        return []
+    debate_map = {dr.architecture_name: dr for dr in debate_results or []}
+    domain_map = domain_critic_results or {}
+    texts = [
+        _comparison_text(
+            ap,
+            debate_map.get(ap.proposal.architecture_name),
+            domain_map.get(ap.proposal.architecture_name),
+        )
+        for ap in annotated_proposals
+    ]
+    context = context_digest(enterprise_context, context_digest_tokens)
+    rng = random.Random(seed)
+    if swiss_rounds is None:
+        swiss_rounds = math.ceil(math.log2(n)) + 1 if n > 1 else 0
+
+    pairs: list[tuple[int, int]] = []
+    results: list[dict[str, float]] = []
+    played: set[tuple[int, int]] = set()
+    points = np.zeros(n)
+    for round_number in range(1, swiss_rounds + 1):
+        round_pairs = swiss_pairings(points, played, rng)
+        outcomes = await asyncio.gather(*(
+            _compare(texts, i, j, context, temperature, rng) for i, j in round_pairs
+        ))
+        for (i, j), outcome in zip(round_pairs, outcomes):
+            played.add((min(i, j), max(i, j)))
+            if outcome is None:
+                continue
+            a, b, by_dim = outcome
+            pairs.append((a, b))
+            results.append(by_dim)
+            mean = sum(by_dim.values()) / len(by_dim)
+            points[a] += mean
+            points[b] += 1.0 - mean
+        logger.info(
+            f"Pairwise ranking: round {round_number}/{swiss_rounds} "
+            f"({len(round_pairs)} comparisons, {len(results)} total)"
+        )
+
+    pair_array = np.array(pairs, dtype=int).reshape(-1, 2)
+    scores = {
+        dim: calibrated_scores(bradley_terry(
+            n, pair_array, np.array([r[dim] for r in results], dtype=float),
+        ))
+        for dim in DIMENSIONS
+    }
+
+    proposal_scores = []
+    for k, ap in enumerate(annotated_proposals):
+        innovation = round(float(scores["innovation"][k]), 2)
+        proposal_scores.append(ProposalScore(
+            architecture_name=ap.proposal.architecture_name,
+            innovation_score=innovation,
+            feasibility_score=round(float(scores["feasibility"][k]), 2),
+            business_alignment_score=round(float(scores["business_alignment"][k]), 2),
+            migration_complexity_score=round(float(scores["migration_complexity"][k]), 2),
+            tier=tier_for_innovation(innovation),
+            one_line_summary=ap.proposal.core_thesis,
+        ))
+
+    logger.info(
+        f"Pairwise ranking: {len(results)} comparisons over {swiss_rounds} rounds "
+        f"for {n} proposals (all-pairs would need {n * (n - 1) // 2})"
+    )
+    return proposal_scores
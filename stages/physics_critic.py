@@ -2,49 +2,112 @@
 
 Annotates each proposal with hard-constraint violations.
 Does NOT reject or modify proposals — only attaches metadata.
+
+The LLM returns only a PhysicsCritique (annotations + feasibility note);
+code attaches it to the original proposal object.
+
+Findings of the rule-based pre-pass (stages/rule_critic.py) are passed to
+the LLM so it focuses on what the rules cannot decide, and are merged into
+the final annotations. Proposals that pass every rule can optionally skip
+the LLM critic.
 """
 
 import asyncio
 import logging
 
 from llm.client import call_llm
-from models.schemas import RefinedProposal, AnnotatedProposal
+from models.schemas import (
+    RefinedProposal,
+    AnnotatedProposal,
+    ConstraintAnnotation,
+    PhysicsCritique,
+)
 from prompts.physics_critic import PHYSICS_CRITIC_PROMPT
+from utils.compact_format import to_compact
 
 logger = logging.getLogger(__name__)
 
 
+def _annotated(
+    p: RefinedProposal,
+    annotations: list[ConstraintAnnotation],
+    note: str,
+) -> AnnotatedProposal:
+    """Attach annotations to the original proposal; criticals are counted here."""
+    return AnnotatedProposal(
+        proposal=p,
+        annotations=annotations,
+        hard_constraint_violations=sum(
+            a.severity.strip().lower() == "critical" for a in annotations
+        ),
+        overall_feasibility_note=note,
+    )
+
+
+def _rule_findings_message(annotations: list[ConstraintAnnotation]) -> str:
+    lines = "\n".join(
+        f"- [{a.severity}] {a.constraint_type}: {a.description}" for a in annotations
+    )
+    return (
+        "\n\nAutomated rule checks (volume and infrastructure metadata) already "
+        "recorded these findings. Do NOT repeat them; annotate only what they miss:\n"
+        f"{lines}"
+    )
+
+
 async def run_physics_critic(
     proposals: list[RefinedProposal],
     temperature: float = 0.3,
+    rule_annotations: dict[str, list[ConstraintAnnotation]] | None = None,
+    skip_llm_when_rules_pass: bool = False,
 ) -> list[AnnotatedProposal]:
-    """Annotate all proposals with physics constraints. Never reject."""
+    """Annotate all proposals with physics constraints. Never reject.
+
+    Args:
+        proposals: Refined proposals to annotate.
+        temperature: LLM temperature.
+        rule_annotations: Rule-critic (and capacity simulation) findings keyed
+                          by architecture name (see stages/rule_critic.py),
+                          merged into the result.
+        skip_llm_when_rules_pass: If True, proposals whose rule findings are
+                                  all 'info' are not sent to the LLM critic.
+    """
+    rule_annotations = rule_annotations or {}
     # Run physics critics SEQUENTIALLY (instructor doesn't support parallel)
     annotated = []
     for p in proposals:
+        rule_findings = rule_annotations.get(p.architecture_name, [])
+        passed_rules = p.architecture_name in rule_annotations and all(
+            a.severity.strip().lower() == "info" for a in rule_findings
+        )
+        if skip_llm_when_rules_pass and passed_rules:
+            annotated.append(_annotated(
+                p, rule_findings, "Passed all rule-based checks; LLM physics critic skipped."
+            ))
+            continue
         try:
             result = await call_llm(
                 system_prompt=PHYSICS_CRITIC_PROMPT,
                 user_message=(
                     "Here is the architectural proposal to annotate:\n\n"
-                    f"{p.model_dump_json(indent=2)}"
+                    f"{to_compact(p)}"
+                    + (_rule_findings_message(rule_findings) if rule_findings else "")
                 ),
-                response_model=AnnotatedProposal,
+                response_model=PhysicsCritique,
                 temperature=temperature,
                 stage="physics_critic",
             )
-            annotated.append(result)
+            # Reattach to the original proposal; recount criticals rather than trusting the LLM
+            annotated.append(_annotated(
+                p, rule_findings + result.annotations, result.overall_feasibility_note
+            ))
         except Exception as e:
             logger.error(
                 f"Physics critic failed for '{p.architecture_name}': {e}"
             )
-            # Create a minimal annotation so the pipeline continues
-            fallback = AnnotatedProposal(
-                proposal=p,
-                annotations=[],
-                hard_constraint_violations=0,
-                overall_feasibility_note="[Physics critic evaluation failed]",
-            )
-            annotated.append(fallback)
+            # Keep the rule findings so the pipeline continues
+            annotated.append(_annotated(
+                p, rule_findings, "[Physics critic evaluation failed]"
+            ))
 
     return annotated
@@ -6,10 +6,25 @@ to tiers, and produces the final ranked portfolio with an executive summary.
 Each proposal is scored in its own LLM call (one at a time) to avoid token
 overflow. The full output of Stage 4.7 (domain critics) and Stage 4.5
 (structured debate) for that proposal is sent as context.
+
+With `ranking_mode="pairwise"` the scores come instead from a Swiss-system
+tournament of head-to-head comparisons (stages/pairwise_ranking.py); the
+composite score, tiers and summary are computed the same way.
+
+With `max_samples > 1` (absolute mode) scoring is sequential sampling:
+after the first pass, proposals whose composite confidence interval
+overlaps their tier's leader, or whose innovation interval straddles a
+tier cutoff, are re-scored concurrently, one extra sample per round,
+until the decisions are separated or `max_samples` is reached
+(utils/score_sampling.py). Scores are the sample means.
 """
 
+import asyncio
 import json
 import logging
+from collections import Counter
+
+import numpy as np
 
 from llm.client import call_llm
 from models.schemas import (
@@ -17,13 +32,113 @@ from models.schemas import (
     Portfolio,
     ScoredProposal,
     ProposalScore,
+    ExecutiveSummary,
     DebateResult,
     AllDomainCriticsResult,
 )
 from prompts.portfolio_ranker import PORTFOLIO_RANKER_PROMPT, PORTFOLIO_SUMMARY_PROMPT
+from stages.pairwise_ranking import run_pairwise_ranking, tier_for_innovation
+from utils.compact_format import to_compact
+from utils.portfolio_analysis import SCORE_FIELDS, first_place_probability, pareto_ranks, score_matrix
+from utils.score_sampling import contested, interval_half_widths
 
 logger = logging.getLogger(__name__)
 
+RANKING_MODES = ("absolute", "pairwise")
+
+
+DEFAULT_SCORE_WEIGHTS = {
+    "innovation": 0.35,
+    "feasibility": 0.25,
+    "business_alignment": 0.25,
+    "migration_complexity": 0.15,
+}
+
+TIERS = ("conservative", "moderate_innovation", "radical")
+
+
+def normalize_weights(score_weights: dict[str, float]) -> dict[str, float]:
+    """Scale weights to sum to 1, so composites stay on the 0-10 score scale.
+
+    Raises:
+        ValueError: If a weight is negative or they sum to zero.
+    """
+    total = sum(score_weights.values())
+    if total <= 0 or any(w < 0 for w in score_weights.values()):
+        raise ValueError(f"Score weights must be non-negative with a positive sum: {score_weights}")
+    return {name: w / total for name, w in score_weights.items()}
+
+
+def composite_score(ps: ProposalScore, score_weights: dict[str, float]) -> float:
+    """Weighted composite of a proposal's four dimension scores."""
+    return (
+        ps.innovation_score * score_weights["innovation"]
+        + ps.feasibility_score * score_weights["feasibility"]
+        + ps.business_alignment_score * score_weights["business_alignment"]
+        + ps.migration_complexity_score * score_weights["migration_complexity"]
+    )
+
+
+def _scored_proposal(
+    ap: AnnotatedProposal,
+    ps: ProposalScore,
+    score_weights: dict[str, float],
+    tier_cutoffs: tuple[float, float] | None = None,
+) -> ScoredProposal:
+    """Combine a proposal's dimension scores into its composite score.
+
+    With `tier_cutoffs` the tier is re-derived from the innovation score
+    instead of taken from the ranker.
+    """
+    return ScoredProposal(
+        proposal=ap,
+        innovation_score=ps.innovation_score,
+        feasibility_score=ps.feasibility_score,
+        business_alignment_score=ps.business_alignment_score,
+        migration_complexity_score=ps.migration_complexity_score,
+        composite_score=composite_score(ps, score_weights),
+        tier=tier_for_innovation(ps.innovation_score, tier_cutoffs) if tier_cutoffs else ps.tier,
+        one_line_summary=ps.one_line_summary,
+    )
+
+
+def _fallback_score(arch_name: str) -> ProposalScore:
+    """Neutral scores for a proposal whose scoring failed."""
+    return ProposalScore(
+        architecture_name=arch_name,
+        innovation_score=5.0,
+        feasibility_score=5.0,
+        business_alignment_score=5.0,
+        migration_complexity_score=5.0,
+        tier="moderate_innovation",
+        one_line_summary=f"{arch_name} (scoring failed)",
+    )
+
+
+def mean_score(samples: list[ProposalScore]) -> ProposalScore:
+    """Average of a proposal's scoring samples; the tier is the most common label."""
+    if len(samples) == 1:
+        return samples[0]
+    update = {field: round(float(np.mean([getattr(s, field) for s in samples])), 2) for field in SCORE_FIELDS}
+    update["tier"] = Counter(s.tier for s in samples).most_common(1)[0][0]
+    return samples[0].model_copy(update=update)
+
+
+def _score_intervals(
+    score_samples: list[list[ProposalScore]],
+    score_weights: dict[str, float],
+    confidence: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Composite and innovation means and interval half-widths per proposal."""
+    composites = [np.array([composite_score(ps, score_weights) for ps in s]) for s in score_samples]
+    innovations = [np.array([ps.innovation_score for ps in s]) for s in score_samples]
+    return (
+        np.array([c.mean() for c in composites]),
+        interval_half_widths(composites, confidence),
+        np.array([v.mean() for v in innovations]),
+        interval_half_widths(innovations, confidence),
+    )
+
 
 async def _score_single_proposal(
     ap: AnnotatedProposal,
@@ -35,7 +150,7 @@ async def _score_single_proposal(
     """Score a single proposal by sending its full context to the LLM."""
 
     # Build the full proposal context (the complete annotated proposal)
-    proposal_json = ap.model_dump_json(indent=2)
+    proposal_text = to_compact(ap)
 
     # Build debate context for this specific proposal (from Stage 4.5)
     debate_context = ""
@@ -85,7 +200,7 @@ async def _score_single_proposal(
         system_prompt=PORTFOLIO_RANKER_PROMPT,
         user_message=(
             f"Enterprise context:\n{enterprise_context}\n\n"
-            f"Annotated architectural proposal to evaluate:\n{proposal_json}"
+            f"Annotated architectural proposal to evaluate:\n{proposal_text}"
             f"{debate_context}"
             f"{domain_context}"
         ),
@@ -100,119 +215,129 @@ async def _score_single_proposal(
     return result
 
 
-async def run_portfolio_assembly(
-    annotated_proposals: list[AnnotatedProposal],
-    enterprise_context: str,
-    score_weights: dict[str, float] | None = None,
-    temperature: float = 0.3,
-    debate_results: list[DebateResult] | None = None,
-    domain_critic_results: dict[str, AllDomainCriticsResult] | None = None,
-) -> Portfolio:
-    """Score, tier, and rank all proposals into a final portfolio.
-
-    Each proposal is scored individually (one LLM call per proposal) to avoid
-    token overflow. The full Stage 4.5 and 4.7 output for each proposal is
-    sent as context.
+async def _resample_contested(
+    score_samples: list[list[ProposalScore]],
+    failed: set[int],
+    score_one,
+    score_weights: dict[str, float],
+    tier_cutoffs: tuple[float, float] | None,
+    max_samples: int,
+    confidence: float,
+) -> int:
+    """Re-score contested proposals, one concurrent round at a time, until separated.
 
-    Args:
-        annotated_proposals: Proposals with physics critic annotations.
-        enterprise_context: Full enterprise context string.
-        score_weights: Weights for composite score dimensions.
-        temperature: LLM temperature for ranking.
-        debate_results: Results from Stage 4.5 (structured debate).
-        domain_critic_results: Results from Stage 4.7 (domain critics).
+    `score_one(k)` returns a coroutine scoring proposal k. Samples are
+    appended in place; a failed proposal's fallback score is replaced by
+    its first successful sample. Returns the number of extra scoring calls.
     """
-    if score_weights is None:
-        score_weights = {
-            "innovation": 0.35,
-            "feasibility": 0.25,
-            "business_alignment": 0.25,
-            "migration_complexity": 0.15,
-        }
-
-    # Build lookup maps for debate and domain critic results
-    debate_map: dict[str, DebateResult] = {}
-    if debate_results:
-        debate_map = {dr.architecture_name: dr for dr in debate_results}
-
-    domain_map: dict[str, AllDomainCriticsResult] = {}
-    if domain_critic_results:
-        domain_map = domain_critic_results  # Already a dict keyed by arch name
+    attempts = [1] * len(score_samples)
+    # Without cutoffs the tiers are the ranker's labels: only label
+    # disagreement (split_tiers) makes a tier contested
+    cutoffs = tuple(tier_cutoffs) if tier_cutoffs else ()
+    extra_calls = 0
+    while True:
+        composite, composite_hw, innovation, innovation_hw = _score_intervals(
+            score_samples, score_weights, confidence,
+        )
+        if tier_cutoffs:
+            tiers = [tier_for_innovation(v, cutoffs) for v in innovation]
+            split_tiers = None
+        else:
+            tiers = [mean_score(s).tier for s in score_samples]
+            split_tiers = np.array([len({ps.tier for ps in s}) > 1 for s in score_samples])
+        flags = contested(composite, composite_hw, innovation, innovation_hw, tiers, cutoffs, split_tiers)
+        todo = [int(k) for k in np.flatnonzero(flags) if attempts[k] < max_samples]
+        if not todo:
+            return extra_calls
 
-    # Score each proposal one at a time
-    scored_proposals: list[ScoredProposal] = []
-    for ap in annotated_proposals:
-        arch_name = ap.proposal.architecture_name
-        logger.info(f"Portfolio: Scoring '{arch_name}'...")
+        logger.info(f"Portfolio: {len(todo)} contested proposal(s), drawing another scoring sample...")
+        results = await asyncio.gather(*(score_one(k) for k in todo), return_exceptions=True)
+        for k, result in zip(todo, results):
+            attempts[k] += 1
+            extra_calls += 1
+            if isinstance(result, Exception):
+                logger.warning(f"Extra scoring sample failed for proposal {k}: {result}")
+            elif k in failed:
+                score_samples[k] = [result]
+                failed.discard(k)
+            else:
+                score_samples[k].append(result)
 
-        try:
-            ps = await _score_single_proposal(
-                ap=ap,
-                enterprise_context=enterprise_context,
-                debate_result=debate_map.get(arch_name),
-                domain_critic_result=domain_map.get(arch_name),
-                temperature=temperature,
-            )
 
-            composite = (
-                ps.innovation_score * score_weights["innovation"]
-                + ps.feasibility_score * score_weights["feasibility"]
-                + ps.business_alignment_score * score_weights["business_alignment"]
-                + ps.migration_complexity_score * score_weights["migration_complexity"]
-            )
+def assemble_portfolio(
+    annotated_proposals: list[AnnotatedProposal],
+    proposal_scores: list[ProposalScore],
+    score_weights: dict[str, float] | None = None,
+    tier_cutoffs: tuple[float, float] | None = None,
+    executive_summary: str = "",
+    weight_samples: int = 100_000,
+    seed: int = 0,
+    score_samples: list[list[ProposalScore]] | None = None,
+    confidence: float = 0.9,
+) -> Portfolio:
+    """Rank scored proposals and pick the top of each tier (pure, no LLM calls).
 
-            scored_proposals.append(ScoredProposal(
-                proposal=ap,
-                innovation_score=ps.innovation_score,
-                feasibility_score=ps.feasibility_score,
-                business_alignment_score=ps.business_alignment_score,
-                migration_complexity_score=ps.migration_complexity_score,
-                composite_score=composite,
-                tier=ps.tier,
-                one_line_summary=ps.one_line_summary,
-            ))
+    Each proposal also gets its Pareto rank and the probability that it
+    ranks first under `weight_samples` random weightings
+    (utils/portfolio_analysis.py). With `score_samples` (repeated scoring)
+    the scores are their means and each proposal gets composite and
+    innovation confidence intervals. The raw scores and weights are kept on
+    the portfolio, so it can be re-ranked offline with different weights
+    or tier rules (see rerank.py). Weights are normalized to sum to 1.
+    """
+    score_weights = normalize_weights(score_weights or DEFAULT_SCORE_WEIGHTS)
+    scored_proposals = [
+        _scored_proposal(ap, ps, score_weights, tier_cutoffs)
+        for ap, ps in zip(annotated_proposals, proposal_scores)
+    ]
 
-            logger.info(
-                f"  -> '{arch_name}': innovation={ps.innovation_score}, "
-                f"feasibility={ps.feasibility_score}, "
-                f"alignment={ps.business_alignment_score}, "
-                f"migration={ps.migration_complexity_score}, "
-                f"tier={ps.tier}, composite={composite:.2f}"
-            )
+    if score_samples:
+        composite, composite_hw, innovation, innovation_hw = _score_intervals(
+            score_samples, score_weights, confidence,
+        )
+        for k, sp in enumerate(scored_proposals):
+            sp.score_samples = len(score_samples[k])
+            sp.composite_ci = [round(float(composite[k] + sign * composite_hw[k]), 2) for sign in (-1, 1)]
+            sp.innovation_ci = [round(float(innovation[k] + sign * innovation_hw[k]), 2) for sign in (-1, 1)]
 
-        except Exception as e:
-            logger.error(f"Scoring failed for '{arch_name}': {e}")
-            scored_proposals.append(ScoredProposal(
-                proposal=ap,
-                innovation_score=5.0,
-                feasibility_score=5.0,
-                business_alignment_score=5.0,
-                migration_complexity_score=5.0,
-                composite_score=5.0,
-                tier="moderate_innovation",
-                one_line_summary=f"{arch_name} (scoring failed)",
-            ))
+    # Frontier and weight sensitivity over the four scores
+    scores = score_matrix(scored_proposals)
+    ranks = pareto_ranks(scores)
+    p_first = first_place_probability(scores, weight_samples, seed=seed, ranks=ranks)
+    for sp, rank, probability in zip(scored_proposals, ranks, p_first):
+        sp.pareto_rank = int(rank)
+        sp.first_place_probability = float(probability) if weight_samples > 0 else None
 
     # Sort by composite score descending
     scored_proposals.sort(key=lambda x: x.composite_score, reverse=True)
 
     # Identify top per tier
-    top_conservative = None
-    top_moderate = None
-    top_radical = None
-    for tier_name in ["conservative", "moderate_innovation", "radical"]:
-        tier_proposals = [p for p in scored_proposals if p.tier == tier_name]
-        top = (
-            tier_proposals[0].proposal.proposal.architecture_name
-            if tier_proposals
-            else None
+    top = {
+        tier_name: next(
+            (sp.proposal.proposal.architecture_name for sp in scored_proposals if sp.tier == tier_name),
+            None,
         )
-        if tier_name == "conservative":
-            top_conservative = top
-        elif tier_name == "moderate_innovation":
-            top_moderate = top
-        elif tier_name == "radical":
-            top_radical = top
+        for tier_name in TIERS
+    }
+
+    return Portfolio(
+        proposals=scored_proposals,
+        top_conservative=top["conservative"],
+        top_moderate=top["moderate_innovation"],
+        top_radical=top["radical"],
+        executive_summary=executive_summary,
+        proposal_scores=proposal_scores,
+        score_weights=dict(score_weights),
+        tier_cutoffs=list(tier_cutoffs) if tier_cutoffs else None,
+        weight_samples=max(weight_samples, 0),
+        proposal_score_samples=score_samples or [],
+        sampling_confidence=confidence if score_samples else None,
+    )
+
+
+async def generate_executive_summary(portfolio: Portfolio, temperature: float = 0.3) -> str:
+    """Executive summary of a ranked portfolio (one LLM call, with a local fallback)."""
+    scored_proposals = portfolio.proposals
 
     # Generate executive summary with a compact view of all scores
     scores_summary = json.dumps([
@@ -231,36 +356,159 @@ async def run_portfolio_assembly(
 
     logger.info("Portfolio: Generating executive summary...")
     try:
-        from models.schemas import ExecutiveSummary
         summary_result = await call_llm(
             system_prompt=PORTFOLIO_SUMMARY_PROMPT,
             user_message=(
                 f"Here are the scored proposals (ranked by composite score):\n\n"
                 f"{scores_summary}\n\n"
-                f"Top conservative: {top_conservative}\n"
-                f"Top moderate: {top_moderate}\n"
-                f"Top radical: {top_radical}"
+                f"Top conservative: {portfolio.top_conservative}\n"
+                f"Top moderate: {portfolio.top_moderate}\n"
+                f"Top radical: {portfolio.top_radical}"
             ),
             response_model=ExecutiveSummary,
             temperature=temperature,
             stage="portfolio_ranker",
         )
-        executive_summary = summary_result.executive_summary
+        return summary_result.executive_summary
     except Exception as e:
         logger.error(f"Executive summary generation failed: {e}")
-        executive_summary = (
+        return (
             f"Portfolio contains {len(scored_proposals)} proposals across "
             f"{len(set(sp.tier for sp in scored_proposals))} tiers. "
             f"Top-ranked: {scored_proposals[0].proposal.proposal.architecture_name} "
             f"(composite: {scored_proposals[0].composite_score:.2f})."
         )
 
-    portfolio = Portfolio(
-        proposals=scored_proposals,
-        top_conservative=top_conservative,
-        top_moderate=top_moderate,
-        top_radical=top_radical,
-        executive_summary=executive_summary,
-    )
 
+async def run_portfolio_assembly(
+    annotated_proposals: list[AnnotatedProposal],
+    enterprise_context: str,
+    score_weights: dict[str, float] | None = None,
+    temperature: float = 0.3,
+    debate_results: list[DebateResult] | None = None,
+    domain_critic_results: dict[str, AllDomainCriticsResult] | None = None,
+    ranking_mode: str = "absolute",
+    swiss_rounds: int | None = None,
+    ranking_seed: int = 0,
+    tier_cutoffs: tuple[float, float] | None = None,
+    weight_samples: int = 100_000,
+    max_samples: int = 1,
+    sampling_confidence: float = 0.9,
+) -> Portfolio:
+    """Score, tier, and rank all proposals into a final portfolio.
+
+    Each proposal is scored individually (one LLM call per proposal) to avoid
+    token overflow. The full Stage 4.5 and 4.7 output for each proposal is
+    sent as context.
+
+    Args:
+        annotated_proposals: Proposals with physics critic annotations.
+        enterprise_context: Full enterprise context string.
+        score_weights: Weights for composite score dimensions.
+        temperature: LLM temperature for ranking.
+        debate_results: Results from Stage 4.5 (structured debate).
+        domain_critic_results: Results from Stage 4.7 (domain critics).
+        ranking_mode: "absolute" (one scoring call per proposal) or
+                      "pairwise" (Swiss-system tournament, Bradley-Terry scores).
+        swiss_rounds: Tournament rounds in pairwise mode (None = ceil(log2 n) + 1).
+        ranking_seed: Seed for pairings and presentation order in pairwise mode.
+        tier_cutoffs: (conservative below, radical from) innovation cutoffs;
+                      None keeps the ranker's tiers.
+        weight_samples: Weight vectors sampled for first-place probabilities.
+        max_samples: Scoring calls allowed per proposal in absolute mode;
+                     above 1, contested proposals are re-scored until their
+                     tier and top-pick decisions are separated.
+        sampling_confidence: Confidence level of the intervals used to decide.
+    """
+    if ranking_mode not in RANKING_MODES:
+        raise ValueError(f"Unknown ranking mode '{ranking_mode}' (expected one of {RANKING_MODES})")
+    score_weights = normalize_weights(score_weights or DEFAULT_SCORE_WEIGHTS)
+
+    # Build lookup maps for debate and domain critic results
+    debate_map: dict[str, DebateResult] = {}
+    if debate_results:
+        debate_map = {dr.architecture_name: dr for dr in debate_results}
+
+    domain_map: dict[str, AllDomainCriticsResult] = {}
+    if domain_critic_results:
+        domain_map = domain_critic_results  # Already a dict keyed by arch name
+
+    score_samples: list[list[ProposalScore]] | None = None
+    if ranking_mode == "pairwise":
+        try:
+            proposal_scores = await run_pairwise_ranking(
+                annotated_proposals,
+                enterprise_context,
+                temperature=temperature,
+                debate_results=debate_results,
+                domain_critic_results=domain_critic_results,
+                swiss_rounds=swiss_rounds,
+                seed=ranking_seed,
+            )
+        except Exception as e:
+            logger.error(f"Pairwise ranking failed: {e}")
+            proposal_scores = [
+                _fallback_score(ap.proposal.architecture_name) for ap in annotated_proposals
+            ]
+    else:
+        # Score each proposal one at a time
+        proposal_scores: list[ProposalScore] = []
+        failed: set[int] = set()
+        for k, ap in enumerate(annotated_proposals):
+            arch_name = ap.proposal.architecture_name
+            logger.info(f"Portfolio: Scoring '{arch_name}'...")
+
+            try:
+                ps = await _score_single_proposal(
+                    ap=ap,
+                    enterprise_context=enterprise_context,
+                    debate_result=debate_map.get(arch_name),
+                    domain_critic_result=domain_map.get(arch_name),
+                    temperature=temperature,
+                )
+                proposal_scores.append(ps)
+
+                logger.info(
+                    f"  -> '{arch_name}': innovation={ps.innovation_score}, "
+                    f"feasibility={ps.feasibility_score}, "
+                    f"alignment={ps.business_alignment_score}, "
+                    f"migration={ps.migration_complexity_score}, "
+                    f"tier={ps.tier}, composite={composite_score(ps, score_weights):.2f}"
+                )
+
+            except Exception as e:
+                logger.error(f"Scoring failed for '{arch_name}': {e}")
+                proposal_scores.append(_fallback_score(arch_name))
+                failed.add(k)
+
+        if max_samples > 1 and proposal_scores:
+            def score_one(k: int):
+                ap = annotated_proposals[k]
+                arch_name = ap.proposal.architecture_name
+                return _score_single_proposal(
+                    ap=ap,
+                    enterprise_context=enterprise_context,
+                    debate_result=debate_map.get(arch_name),
+                    domain_critic_result=domain_map.get(arch_name),
+                    temperature=temperature,
+                )
+
+            score_samples = [[ps] for ps in proposal_scores]
+            extra_calls = await _resample_contested(
+                score_samples, failed, score_one, score_weights, tier_cutoffs,
+                max_samples, sampling_confidence,
+            )
+            proposal_scores = [mean_score(s) for s in score_samples]
+            logger.info(
+                f"Portfolio: {extra_calls} extra scoring sample(s) "
+                f"({len(annotated_proposals) * (max_samples - 1)} if every proposal were re-scored)"
+            )
+
+    portfolio = assemble_portfolio(
+        annotated_proposals, proposal_scores, score_weights, tier_cutoffs,
+        weight_samples=weight_samples,
+        score_samples=score_samples,
+        confidence=sampling_confidence,
+    )
+    portfolio.executive_summary = await generate_executive_summary(portfolio, temperature)
     return portfolio
@@ -6,6 +6,11 @@ Dynamically enriches paradigm agent system prompts with:
 - Anti-goals and success criteria
 
 This is pure Python string composition — NO LLM call required.
+
+With `patterns_mode: "retrieval"` the patterns are not whole knowledge-base
+files. They are the chunks that best match `patterns_query(intent_brief)`
+(the pain diagnosis and paradigm shift candidates), fetched by
+mcp_client.context_gatherer.retrieve_paradigm_patterns.
 """
 
 import logging
@@ -28,6 +33,14 @@ _PARADIGM_TEMPLATES = {
 }
 
 
+def patterns_query(intent_brief: IntentBrief) -> str:
+    """Retrieval query for knowledge-base patterns: pain diagnosis and paradigm shift candidates."""
+    parts = list(intent_brief.pain_diagnosis)
+    for ps in intent_brief.paradigm_shift_candidates:
+        parts.append(f"{ps.paradigm} {ps.target_area} {ps.rationale}")
+    return "\n".join(parts)
+
+
 async def enhance_prompts(
     intent_brief: IntentBrief,
     patterns_context: dict[str, str],
@@ -0,0 +1,326 @@
+"""Stage 4 (pre-pass): Rule-Based Critic
+
+Deterministic checks that need no LLM, run before the physics critic.
+Facts come from `input/metadata/volume_stats.json` and
+`infrastructure_catalog.json`; each finding is a ConstraintAnnotation.
+
+Rules:
+- Flow steps that reference components the proposal doesn't define.
+- Components receiving the event stream whose technology's throughput
+  class (scaled by its deployed broker/worker count when the catalog lists
+  it) is below the peak (burst-adjusted) event rate.
+- Replay / reprocessing assumptions that outlast the Kafka retention window.
+- Components that take part in no data flow step.
+
+Checks are plain Python over the proposal, so thousands of archive
+candidates are checked in well under a second.
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from models.schemas import ConstraintAnnotation, Proposal
+from utils.structural_descriptors import classify_pattern
+
+logger = logging.getLogger(__name__)
+
+# Rough sustained write throughput (events/second) of a single node / worker
+# of each technology class. Order-of-magnitude figures, used only to flag
+# components that are clearly undersized for the event stream.
+THROUGHPUT_CLASSES: dict[str, float] = {
+    "airflow": 50,
+    "census": 50,
+    "fivetran": 500,
+    "dbt": 500,
+    "lambda": 1_000,
+    "postgres": 5_000,
+    "mysql": 5_000,
+    "rds": 5_000,
+    "snowflake": 20_000,
+    "redshift": 20_000,
+    "bigquery": 100_000,
+    "s3": 100_000,
+    "kafka": 500_000,
+    "redpanda": 500_000,
+    "pulsar": 500_000,
+    "kinesis": 100_000,
+    "flink": 500_000,
+}
+
+# Other names of a throughput class's technology
+_CLASS_ALIASES = {"postgresql": "postgres", "msk": "kafka", "aurora": "rds"}
+# Whole-word technology names, longest first so e.g. "postgresql" wins over "postgres"
+_CLASS_RE = re.compile(
+    r"\b(" + "|".join(sorted([*THROUGHPUT_CLASSES, *_CLASS_ALIASES], key=len, reverse=True)) + r")\b"
+)
+
+_EVENT_TERMS = ("event", "clickstream", "click", "telemetry", "tracking", "product")
+_REPLAY_TERMS = ("replay", "reprocess", "re-process", "rebuild", "backfill", "rehydrate")
+_LONG_TERM_STORAGE = ("tiered storage", "s3", "iceberg", "delta", "hudi", "archive",
+                      "object storage", "data lake", "lakehouse", "glacier")
+_FULL_HISTORY_TERMS = ("full history", "entire history", "from the beginning",
+                       "all history", "since inception", "from scratch", "indefinitely")
+
+_RATE_RE = re.compile(r"([\d.]+)\s*([kmb])?\b[^/]*/\s*(second|sec|s|minute|min|hour|hr|h|day|d)\b", re.I)
+_DAYS_RE = re.compile(r"(\d+)\s*-?\s*(day|week|month|year)s?", re.I)
+_MULTIPLIER_RE = re.compile(r"(\d+(?:\.\d+)?)\s*x", re.I)
+
+# infrastructure_catalog.json keys giving the number of nodes a deployment runs
+_UNIT_KEYS = ("brokers", "workers", "concurrent_jobs")
+
+_SCALE = {None: 1, "k": 1e3, "m": 1e6, "b": 1e9}
+_PER_SECOND = {"second": 1, "sec": 1, "s": 1, "minute": 60, "min": 60,
+               "hour": 3600, "hr": 3600, "h": 3600, "day": 86400, "d": 86400}
+_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+
+class MetadataFacts(BaseModel):
+    """Numbers the rules check proposals against."""
+    peak_events_per_second: float = 0.0
+    steady_events_per_second: float = 0.0
+    burst_multiplier: float = 1.0
+    kafka_retention_days: float | None = None
+    # Deployed nodes per throughput class, from infrastructure_catalog.json
+    deployed_units: dict[str, int] = {}
+
+
+def parse_rate(text: str) -> float | None:
+    """Events per second from strings like '~8M/hour' or '~50M events/day'."""
+    match = _RATE_RE.search(text)
+    if not match:
+        return None
+    value = float(match.group(1)) * _SCALE[(match.group(2) or "").lower() or None]
+    return value / _PER_SECOND[match.group(3).lower()]
+
+
+def parse_days(text: str) -> float | None:
+    """Duration in days from strings like '7-day retention' or '30 days'."""
+    match = _DAYS_RE.search(text)
+    return float(match.group(1)) * _DAYS[match.group(2).lower()] if match else None
+
+
+def _read_json(path: Path) -> dict:
+    """A metadata file's contents ({} if it is missing or unreadable)."""
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"Rule critic: could not read {path}: {e}")
+        return {}
+
+
+def load_metadata_facts(metadata_dir: Path) -> MetadataFacts:
+    """Extract rule facts from volume_stats.json and infrastructure_catalog.json.
+
+    Missing files give defaults.
+    """
+    facts = MetadataFacts()
+    stats = _read_json(Path(metadata_dir) / "volume_stats.json")
+
+    # Peak ingest: the highest rate quoted for any source (the "peak:" figure if
+    # given); steady ingest: the highest average rate
+    for value in stats.get("ingestion_rates", {}).values():
+        steady, _, peak = str(value).partition("peak:")
+        steady_rate = parse_rate(steady)
+        peak_rate = parse_rate(peak) if peak else steady_rate
+        if steady_rate is not None:
+            facts.steady_events_per_second = max(facts.steady_events_per_second, steady_rate)
+        if peak_rate is not None:
+            facts.peak_events_per_second = max(facts.peak_events_per_second, peak_rate)
+
+    for value in stats.get("peak_load", {}).values():
+        match = _MULTIPLIER_RE.search(str(value))
+        if match:
+            facts.burst_multiplier = max(facts.burst_multiplier, float(match.group(1)))
+
+    retention = stats.get("storage_sizes", {}).get("kafka_retention")
+    if retention:
+        facts.kafka_retention_days = parse_days(str(retention))
+
+    catalog = _read_json(Path(metadata_dir) / "infrastructure_catalog.json")
+    for entries in catalog.values():
+        for entry in entries if isinstance(entries, list) else []:
+            found = throughput_class(" ".join(str(entry.get(k, "")) for k in ("name", "deployment")))
+            units = next((entry[k] for k in _UNIT_KEYS if isinstance(entry.get(k), int)), None)
+            if found is not None and units:
+                facts.deployed_units[found[0]] = units
+    return facts
+
+
+def throughput_class(technology: str) -> tuple[str, float] | None:
+    """Throughput class of the first technology named (as a whole word) in a string.
+
+    "Flink (Lambda architecture)" is Flink and "Snowflake with dbt models"
+    is Snowflake: the primary technology comes first.
+    """
+    match = _CLASS_RE.search(technology.lower())
+    if match is None:
+        return None
+    name = _CLASS_ALIASES.get(match.group(1), match.group(1))
+    return name, THROUGHPUT_CLASSES[name]
+
+
+def deployed_capacity(technology: str, facts: MetadataFacts) -> tuple[str, float] | None:
+    """Throughput class of a technology, scaled by its deployed node count."""
+    found = throughput_class(technology)
+    if found is None:
+        return None
+    tech_class, rate = found
+    return tech_class, rate * facts.deployed_units.get(tech_class, 1)
+
+
+def _check_flow_references(p: Proposal) -> list[ConstraintAnnotation]:
+    names = {c.name for c in p.components}
+    annotations = []
+    for step in p.data_flow:
+        missing = [n for n in (step.from_component, step.to_component) if n not in names]
+        if missing:
+            annotations.append(ConstraintAnnotation(
+                constraint_type="data_integrity",
+                description=(
+                    f"Data flow step {step.step_number} references undefined "
+                    f"component(s): {', '.join(missing)}"
+                ),
+                severity="warning",
+                affected_components=missing,
+                suggested_mitigation="Define the component or route the step through an existing one",
+            ))
+    return annotations
+
+
+def _check_throughput(p: Proposal, facts: MetadataFacts) -> list[ConstraintAnnotation]:
+    required = facts.peak_events_per_second * facts.burst_multiplier
+    if required <= 0:
+        return []
+    tech = {c.name: c.technology_suggestion or c.name for c in p.components}
+    receivers = {
+        step.to_component for step in p.data_flow
+        if classify_pattern(step.pattern) == "async"
+        and any(term in step.description.lower() for term in _EVENT_TERMS)
+    }
+    annotations = []
+    for name in sorted(receivers & tech.keys()):
+        found = deployed_capacity(tech[name], facts)
+        if found is None:
+            continue
+        tech_class, capacity = found
+        units = facts.deployed_units.get(tech_class, 1)
+        if required > capacity:
+            severity = "critical"
+        elif required > 0.5 * capacity:
+            severity = "warning"
+        else:
+            continue
+        annotations.append(ConstraintAnnotation(
+            constraint_type="resource_limits",
+            description=(
+                f"'{name}' ({tech_class}) receives the event stream: peak "
+                f"{facts.peak_events_per_second:,.0f} events/s x{facts.burst_multiplier:g} burst "
+                f"= {required:,.0f}/s against a ~{capacity:,.0f}/s throughput class"
+                + (f" ({units} deployed nodes)" if units > 1 else "")
+            ),
+            severity=severity,
+            affected_components=[name],
+            suggested_mitigation="Buffer through a log/queue and batch writes, or partition the load",
+        ))
+    return annotations
+
+
+def _check_retention(p: Proposal, facts: MetadataFacts) -> list[ConstraintAnnotation]:
+    if facts.kafka_retention_days is None:
+        return []
+    kafka = [c.name for c in p.components if "kafka" in (c.technology_suggestion or c.name).lower()]
+    if not kafka:
+        return []
+    statements = [p.core_thesis, *p.key_innovations, *p.assumptions] + [c.role for c in p.components]
+    replay = [s for s in statements if any(term in s.lower() for term in _REPLAY_TERMS)]
+    if not replay:
+        return []
+
+    text = "\n".join(statements).lower()
+    has_long_term_storage = any(term in text for term in _LONG_TERM_STORAGE) or any(
+        term in (c.technology_suggestion or "").lower()
+        for c in p.components for term in _LONG_TERM_STORAGE
+    )
+    windows = [d for d in (parse_days(s) for s in replay) if d is not None]
+    longest = max(windows, default=None)
+    full_history = any(term in s.lower() for s in replay for term in _FULL_HISTORY_TERMS)
+
+    if longest is not None and longest > facts.kafka_retention_days:
+        detail, severity = f"a {longest:g}-day replay window", "critical"
+    elif full_history:
+        detail, severity = "replay of the full history", "critical"
+    else:
+        detail, severity = "log replay", "warning"
+    if has_long_term_storage and severity == "critical":
+        severity = "warning"
+    elif has_long_term_storage:
+        return []
+
+    return [ConstraintAnnotation(
+        constraint_type="data_integrity",
+        description=(
+            f"Proposal relies on {detail}, but Kafka retention is "
+            f"{facts.kafka_retention_days:g} days"
+            + ("" if has_long_term_storage else " and no long-term event archive is described")
+        ),
+        severity=severity,
+        affected_components=kafka,
+        suggested_mitigation="Add tiered storage or archive the log to object storage for replay",
+    )]
+
+
+def _check_orphans(p: Proposal) -> list[ConstraintAnnotation]:
+    used = {n for step in p.data_flow for n in (step.from_component, step.to_component)}
+    orphans = [c.name for c in p.components if c.name not in used]
+    if not orphans or not p.data_flow:
+        return []
+    return [ConstraintAnnotation(
+        constraint_type="complexity_bounds",
+        description=f"Component(s) not part of any data flow step: {', '.join(orphans)}",
+        severity="info",
+        affected_components=orphans,
+        suggested_mitigation="Describe how these components receive or emit data",
+    )]
+
+
+def check_proposal(
+    p: Proposal,
+    facts: MetadataFacts,
+    check_throughput: bool = True,
+) -> list[ConstraintAnnotation]:
+    """Run every rule against one proposal (optionally without the throughput rule)."""
+    return (
+        _check_flow_references(p)
+        + (_check_throughput(p, facts) if check_throughput else [])
+        + _check_retention(p, facts)
+        + _check_orphans(p)
+    )
+
+
+def run_rule_critic(
+    proposals: list[Proposal],
+    metadata_dir: Path,
+    check_throughput: bool = True,
+) -> dict[str, list[ConstraintAnnotation]]:
+    """Rule annotations for each proposal, keyed by architecture name.
+
+    Pass `check_throughput=False` when the capacity simulation runs: it
+    reports the same undersized receivers, and a second critical for one
+    bottleneck would double-count it as a hard constraint violation.
+    """
+    facts = load_metadata_facts(metadata_dir)
+    results = {p.architecture_name: check_proposal(p, facts, check_throughput) for p in proposals}
+    flagged = sum(1 for annotations in results.values() if annotations)
+    logger.info(
+        f"Rule critic: {flagged}/{len(proposals)} proposals flagged "
+        f"(peak {facts.peak_events_per_second:,.0f} events/s, "
+        f"burst x{facts.burst_multiplier:g}, Kafka retention "
+        f"{facts.kafka_retention_days if facts.kafka_retention_days is not None else '?'} days)"
+    )
+    return results
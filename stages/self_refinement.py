@@ -1,58 +1,172 @@
 """Stage 3: Self-Refinement
 
-Each proposal gets multiple rounds of self-refinement. The LLM critiques
+Each proposal gets up to N rounds of self-refinement. The LLM critiques
 the proposal and produces a stronger version without making it more conservative.
+
+Proposals are refined concurrently. A proposal stops early once a round
+changes it by less than `min_change` (a local diff of components, data
+flow steps and text), so extra rounds only cost what they are worth.
 """
 
 import asyncio
+import difflib
 import logging
 
 from llm.client import call_llm
-from models.schemas import Proposal, MutatedProposal, RefinedProposal
+from models.schemas import Proposal, MutatedProposal, RefinedProposal, RefinementPatch
+from prompts.patch_mode import PATCH_MODE_INSTRUCTIONS
 from prompts.self_refinement import SELF_REFINEMENT_PROMPT
+from utils.compact_format import to_compact
+from utils.proposal_patch import PatchError, apply_patch
 
 logger = logging.getLogger(__name__)
 
+# Change ratio below which a proposal counts as converged (config.yaml ships the same value)
+DEFAULT_MIN_CHANGE = 0.05
+
+
+async def _refine_with_patch(
+    p: Proposal | MutatedProposal,
+    round_num: int,
+    temperature: float,
+) -> RefinedProposal:
+    """Ask for a RefinementPatch and apply it locally (raises PatchError if it doesn't fit)."""
+    patch = await call_llm(
+        system_prompt=SELF_REFINEMENT_PROMPT + PATCH_MODE_INSTRUCTIONS,
+        user_message=(
+            f"Refinement round {round_num}. "
+            f"Here is the proposal to refine:\n\n"
+            f"{to_compact(p)}"
+        ),
+        response_model=RefinementPatch,
+        temperature=temperature,
+        stage="self_refinement",
+    )
+    return apply_patch(p, patch, RefinedProposal, refinement_round=round_num)
+
+
+async def _refine_once(
+    p: Proposal | MutatedProposal,
+    round_num: int,
+    temperature: float,
+    response_mode: str,
+) -> RefinedProposal:
+    """One refinement round for one proposal (patch mode falls back to full)."""
+    if response_mode == "patch":
+        try:
+            return await _refine_with_patch(p, round_num, temperature)
+        except PatchError as e:
+            logger.warning(
+                f"Refinement patch for '{p.architecture_name}' did not apply ({e}); "
+                f"regenerating the full proposal."
+            )
+
+    return await call_llm(
+        system_prompt=SELF_REFINEMENT_PROMPT,
+        user_message=(
+            f"Refinement round {round_num}. "
+            f"Here is the proposal to refine:\n\n"
+            f"{to_compact(p)}"
+        ),
+        response_model=RefinedProposal,
+        temperature=temperature,
+        stage="self_refinement",
+    )
+
+
+def _change_ratio(before: Proposal, after: Proposal) -> float:
+    """How much a refinement round changed a proposal, from 0 (identical) to 1.
+
+    Mean of three parts: the share of components and of data flow steps
+    that were added, removed or edited, and the text dissimilarity of the
+    thesis, innovations and assumptions.
+    """
+    def changed_share(a: set, b: set) -> float:
+        union = a | b
+        return len(a ^ b) / len(union) if union else 0.0
+
+    components = changed_share(
+        {(c.name, c.role, c.technology_suggestion) for c in before.components},
+        {(c.name, c.role, c.technology_suggestion) for c in after.components},
+    )
+    flow = changed_share(
+        {(s.from_component, s.to_component, s.pattern, s.description) for s in before.data_flow},
+        {(s.from_component, s.to_component, s.pattern, s.description) for s in after.data_flow},
+    )
+
+    def text(p: Proposal) -> str:
+        return "\n".join([p.core_thesis, *p.key_innovations, *p.assumptions])
+
+    text_change = 1.0 - difflib.SequenceMatcher(None, text(before), text(after)).ratio()
+    return (components + flow + text_change) / 3
+
+
+def _as_refined(p: Proposal | MutatedProposal, **fields) -> RefinedProposal:
+    """Wrap any proposal (including an already refined one) as a RefinedProposal."""
+    return RefinedProposal.model_validate({**p.model_dump(), **fields})
+
+
+async def _refine_proposal(
+    p: Proposal | MutatedProposal,
+    rounds: int,
+    temperature: float,
+    response_mode: str,
+    min_change: float,
+) -> RefinedProposal:
+    """Refine one proposal for up to `rounds` rounds, stopping once it converges."""
+    current: Proposal | MutatedProposal = p
+    refinements: list[str] = []
+    rounds_run = 0
+
+    for round_num in range(1, rounds + 1):
+        rounds_run = round_num
+        try:
+            result = await _refine_once(current, round_num, temperature, response_mode)
+        except Exception as e:
+            logger.error(
+                f"Refinement round {round_num} failed for "
+                f"'{current.architecture_name}': {e}"
+            )
+            # On failure keep the last good version so the pipeline continues
+            refinements.append(f"[Refinement round {round_num} failed]")
+            continue
+
+        change = _change_ratio(current, result)
+        refinements.extend(result.refinements_made)
+        current = result
+        if change < min_change:
+            logger.info(
+                f"  '{current.architecture_name}' converged after round {round_num} "
+                f"(change {change:.3f} < {min_change})"
+            )
+            break
+
+    return _as_refined(current, refinements_made=refinements, refinement_round=rounds_run)
+
 
 async def run_self_refinement(
     proposals: list[Proposal | MutatedProposal],
     rounds: int = 2,
     temperature: float = 0.5,
+    response_mode: str = "full",
+    min_change: float = DEFAULT_MIN_CHANGE,
 ) -> list[RefinedProposal]:
-    """Run N rounds of self-refinement on all proposals."""
-    current = proposals
+    """Run up to N rounds of self-refinement on all proposals, concurrently.
 
-    for round_num in range(1, rounds + 1):
-        # Run refinements SEQUENTIALLY (instructor doesn't support parallel)
-        refined = []
-        for p in current:
-            try:
-                result = await call_llm(
-                    system_prompt=SELF_REFINEMENT_PROMPT,
-                    user_message=(
-                        f"Refinement round {round_num}. "
-                        f"Here is the proposal to refine:\n\n"
-                        f"{p.model_dump_json(indent=2)}"
-                    ),
-                    response_model=RefinedProposal,
-                    temperature=temperature,
-                    stage="self_refinement",
-                )
-                result.refinement_round = round_num
-                refined.append(result)
-            except Exception as e:
-                logger.error(
-                    f"Refinement round {round_num} failed for "
-                    f"'{p.architecture_name}': {e}"
-                )
-                # On failure, wrap the original as a RefinedProposal so the pipeline continues
-                fallback = RefinedProposal(
-                    **p.model_dump(),
-                    refinements_made=[f"[Refinement round {round_num} failed]"],
-                    refinement_round=round_num,
-                )
-                refined.append(fallback)
-
-        current = refined
-
-    return current
+    `response_mode` is "full" (regenerate the proposal) or "patch" (the LLM
+    returns only the edits, applied locally). A proposal stops early when a
+    round changes it by less than `min_change` (see _change_ratio; 0 always
+    runs every round). Each result carries all refinements made and, in
+    `refinement_round`, the number of rounds actually run.
+    """
+    refined = list(await asyncio.gather(*(
+        _refine_proposal(p, rounds, temperature, response_mode, min_change)
+        for p in proposals
+    )))
+
+    rounds_run = sum(r.refinement_round for r in refined)
+    logger.info(
+        f"Self-refinement: {rounds_run} rounds run for {len(refined)} proposals "
+        f"({len(refined) * rounds - rounds_run} skipped after convergence)"
+    )
+    return refined
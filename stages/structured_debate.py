@@ -6,13 +6,21 @@ Asymmetric, innovation-favoring debate for each proposal:
 - Steel-manning is mandatory
 - Judge evaluates and scores
 
+The number of rounds is configurable (`rounds`); with `early_exit` an
+interim judge can end a lopsided debate before the remaining rounds.
+
 Debates CANNOT eliminate proposals — they produce annotations and scores
 that feed into Portfolio Assembly.
+
+Debates for different proposals run concurrently (at most
+`max_concurrent_debates` at a time, on top of the per-key request limit
+in llm.client); the phases within one debate stay sequential. Later rounds
+get rolling summaries instead of the full context (utils/debate_context.py).
 """
 
 import asyncio
-import json
 import logging
+from typing import Callable
 
 from llm.client import call_llm
 from models.schemas import (
@@ -23,164 +31,219 @@ from models.schemas import (
     DebateJudgment,
     DebateResult,
 )
-from prompts.debate_agents import ADVOCATE_PROMPT, DEVIL_ADVOCATE_PROMPT, JUDGE_PROMPT
+from prompts.debate_agents import (
+    ADVOCATE_PROMPT,
+    DEVIL_ADVOCATE_PROMPT,
+    JUDGE_PROMPT,
+    INTERIM_JUDGE_PROMPT,
+)
+from utils.debate_context import DebateContext
 
 logger = logging.getLogger(__name__)
 
 
+def full_debate_calls(rounds: int) -> int:
+    """LLM calls of a debate that runs every round: two per round plus the judge."""
+    return 2 * rounds + 1
+
+
 async def run_debate_for_proposal(
     annotated_proposal: AnnotatedProposal,
     enterprise_context: str,
     advocate_temperature: float = 0.6,
     devil_temperature: float = 0.6,
     judge_temperature: float = 0.3,
+    context_mode: str = "rolling",
+    summary_sentences: int = 3,
+    context_digest_tokens: int = 800,
+    rounds: int = 3,
+    early_exit: bool = False,
+    early_exit_confidence: float = 0.8,
 ) -> DebateResult:
-    """Run a 3-round structured debate for a single proposal."""
+    """Run an N-round structured debate for a single proposal.
 
-    proposal_text = annotated_proposal.model_dump_json(indent=2)
-    arch_name = annotated_proposal.proposal.architecture_name
-
-    logger.info(f"Debate: Starting for '{arch_name}'...")
-
-    # Round 1: Opening arguments (can run in parallel)
-    advocate_r1_task = call_llm(
-        system_prompt=ADVOCATE_PROMPT,
-        user_message=(
-            f"Round 1: Present your opening case for this proposal.\n\n"
-            f"Proposal:\n{proposal_text}\n\n"
-            f"Enterprise context:\n{enterprise_context}"
-        ),
-        response_model=ArgumentText,
-        temperature=advocate_temperature,
-    )
+    Round 1 is the opening, the last round (when rounds >= 2) is the
+    mandatory steel-man, and rounds in between are cross-examination.
+    With `early_exit`, an interim judge rules on the transcript after each
+    round before the last; once its confidence reaches
+    `early_exit_confidence` its verdict is final and the remaining rounds
+    are skipped.
 
-    devil_r1_task = call_llm(
-        system_prompt=DEVIL_ADVOCATE_PROMPT,
-        user_message=(
-            f"Round 1: Attack the status quo. Here is the current enterprise context "
-            f"and the proposal being considered as a replacement.\n\n"
-            f"Enterprise context:\n{enterprise_context}\n\n"
-            f"Proposal under consideration:\n{proposal_text}"
-        ),
-        response_model=ArgumentText,
-        temperature=devil_temperature,
-    )
-
-    advocate_r1, devil_r1 = await asyncio.gather(advocate_r1_task, devil_r1_task)
-
-    # Round 2: Cross-examination (depends on Round 1, can run in parallel)
-    annotations_json = json.dumps(
-        [a.model_dump() for a in annotated_proposal.annotations], indent=2
-    )
-
-    advocate_r2_task = call_llm(
-        system_prompt=ADVOCATE_PROMPT,
-        user_message=(
-            f"Round 2: Address the physics critic annotations and known risks.\n\n"
-            f"Your Round 1 argument:\n{advocate_r1.text}\n\n"
-            f"Devil's advocate Round 1 (attacking status quo):\n{devil_r1.text}\n\n"
-            f"Physics critic annotations:\n{annotations_json}"
-        ),
-        response_model=ArgumentText,
-        temperature=advocate_temperature,
+    `context_mode` "rolling" sends the heavy context once per role and
+    compact summaries afterwards; "full" resends everything (see
+    utils/debate_context.py).
+    """
+    rounds = max(1, rounds)
+    ctx = DebateContext(
+        annotated_proposal, enterprise_context,
+        mode=context_mode,
+        summary_sentences=summary_sentences,
+        context_digest_tokens=context_digest_tokens,
     )
+    arch_name = annotated_proposal.proposal.architecture_name
 
-    devil_r2_task = call_llm(
-        system_prompt=DEVIL_ADVOCATE_PROMPT,
-        user_message=(
-            f"Round 2: The advocate has addressed the risks. Now argue why the status quo "
-            f"has WORSE versions of similar problems.\n\n"
-            f"Advocate's risk mitigation argument:\n{advocate_r1.text}\n\n"
-            f"Enterprise context (evidence of status quo problems):\n{enterprise_context}"
-        ),
-        response_model=ArgumentText,
-        temperature=devil_temperature,
-    )
+    async def ask(system_prompt: str, user_message: str, response_model, temperature: float):
+        return await call_llm(
+            system_prompt=system_prompt,
+            user_message=ctx.record(system_prompt, user_message),
+            response_model=response_model,
+            temperature=temperature,
+            stage="structured_debate",
+        )
 
-    advocate_r2, devil_r2 = await asyncio.gather(advocate_r2_task, devil_r2_task)
+    logger.info(f"Debate: Starting for '{arch_name}' (up to {rounds} rounds)...")
 
-    # Round 3: Steel-man + final arguments (depends on Round 2, can run in parallel)
-    debate_transcript = (
-        f"Advocate R1: {advocate_r1.text}\n"
-        f"Devil R1: {devil_r1.text}\n"
-        f"Advocate R2: {advocate_r2.text}\n"
-        f"Devil R2: {devil_r2.text}"
-    )
+    debate_rounds: list[DebateRound] = []
+    steel_mans: list[SteelMan] = []
+    judgment: DebateJudgment | None = None
 
-    advocate_steel_task = call_llm(
-        system_prompt=ADVOCATE_PROMPT,
-        user_message=(
-            f"Round 3: MANDATORY STEEL-MAN. First, present the STRONGEST possible argument "
-            f"AGAINST your proposal. Be honest and charitable. Then present your final argument.\n\n"
-            f"Full debate so far:\n{debate_transcript}"
-        ),
-        response_model=SteelMan,
-        temperature=advocate_temperature,
-    )
-
-    devil_steel_task = call_llm(
-        system_prompt=DEVIL_ADVOCATE_PROMPT,
-        user_message=(
-            f"Round 3: MANDATORY STEEL-MAN. First, present the STRONGEST possible argument "
-            f"FOR the status quo. Be honest and charitable. Then present your final argument "
-            f"for why change is still needed.\n\n"
-            f"Full debate so far:\n{debate_transcript}"
-        ),
-        response_model=SteelMan,
-        temperature=devil_temperature,
-    )
+    for n in range(1, rounds + 1):
+        if n == 1:
+            # Opening arguments
+            advocate, devil = await asyncio.gather(
+                ask(
+                    ADVOCATE_PROMPT,
+                    f"Round 1: Present your opening case for this proposal.\n\n"
+                    f"Proposal:\n{ctx.proposal_for('advocate')}\n\n"
+                    f"Enterprise context:\n{ctx.context_for('advocate')}",
+                    ArgumentText, advocate_temperature,
+                ),
+                ask(
+                    DEVIL_ADVOCATE_PROMPT,
+                    f"Round 1: Attack the status quo. Here is the current enterprise context "
+                    f"and the proposal being considered as a replacement.\n\n"
+                    f"Enterprise context:\n{ctx.context_for('devil')}\n\n"
+                    f"Proposal under consideration:\n{ctx.proposal_for('devil')}",
+                    ArgumentText, devil_temperature,
+                ),
+            )
+        elif n == rounds:
+            # Steel-man + final arguments
+            transcript = ctx.transcript()
+            advocate_steel, devil_steel = await asyncio.gather(
+                ask(
+                    ADVOCATE_PROMPT,
+                    f"Round {n}: MANDATORY STEEL-MAN. First, present the STRONGEST possible argument "
+                    f"AGAINST your proposal. Be honest and charitable. Then present your final argument.\n\n"
+                    f"Full debate so far:\n{transcript}",
+                    SteelMan, advocate_temperature,
+                ),
+                ask(
+                    DEVIL_ADVOCATE_PROMPT,
+                    f"Round {n}: MANDATORY STEEL-MAN. First, present the STRONGEST possible argument "
+                    f"FOR the status quo. Be honest and charitable. Then present your final argument "
+                    f"for why change is still needed.\n\n"
+                    f"Full debate so far:\n{transcript}",
+                    SteelMan, devil_temperature,
+                ),
+            )
+            # Ensure agent_role fields are set correctly
+            advocate_steel.agent_role = "advocate"
+            devil_steel.agent_role = "devil_advocate"
+            steel_mans = [advocate_steel, devil_steel]
+            break
+        elif n == 2:
+            # Cross-examination
+            last = debate_rounds[-1]
+            advocate, devil = await asyncio.gather(
+                ask(
+                    ADVOCATE_PROMPT,
+                    f"Round 2: Address the physics critic annotations and known risks.\n\n"
+                    f"Your Round 1 argument:\n{last.advocate_argument}\n\n"
+                    f"Devil's advocate Round 1 (attacking status quo):\n{last.devil_advocate_argument}\n\n"
+                    f"Physics critic annotations:\n{ctx.annotations()}",
+                    ArgumentText, advocate_temperature,
+                ),
+                ask(
+                    DEVIL_ADVOCATE_PROMPT,
+                    f"Round 2: The advocate has addressed the risks. Now argue why the status quo "
+                    f"has WORSE versions of similar problems.\n\n"
+                    f"Advocate's risk mitigation argument:\n{last.advocate_argument}\n\n"
+                    f"Enterprise context (evidence of status quo problems):\n{ctx.context_for('devil')}",
+                    ArgumentText, devil_temperature,
+                ),
+            )
+        else:
+            # Further cross-examination: rebut the other side's latest round
+            transcript = ctx.transcript()
+            advocate, devil = await asyncio.gather(
+                ask(
+                    ADVOCATE_PROMPT,
+                    f"Round {n}: Rebuttal. Answer the points from the latest round that you have not "
+                    f"yet addressed, including any unresolved physics critic annotations.\n\n"
+                    f"Debate so far:\n{transcript}\n\n"
+                    f"Physics critic annotations:\n{ctx.annotations()}",
+                    ArgumentText, advocate_temperature,
+                ),
+                ask(
+                    DEVIL_ADVOCATE_PROMPT,
+                    f"Round {n}: Rebuttal. Answer the advocate's latest arguments with further "
+                    f"evidence that the status quo is worse.\n\n"
+                    f"Debate so far:\n{transcript}\n\n"
+                    f"Enterprise context (evidence of status quo problems):\n{ctx.context_for('devil')}",
+                    ArgumentText, devil_temperature,
+                ),
+            )
 
-    advocate_steel, devil_steel = await asyncio.gather(
-        advocate_steel_task, devil_steel_task
-    )
+        debate_rounds.append(DebateRound(
+            round_number=n,
+            advocate_argument=advocate.text,
+            devil_advocate_argument=devil.text,
+        ))
+        ctx.add_round(f"ROUND {n}", advocate.text, devil.text)
 
-    # Ensure agent_role fields are set correctly
-    advocate_steel.agent_role = "advocate"
-    devil_steel.agent_role = "devil_advocate"
+        if early_exit and n < rounds:
+            interim = await ask(
+                INTERIM_JUDGE_PROMPT,
+                f"Judge the following debate about this proposal after round {n} of {rounds}:\n\n"
+                f"PROPOSAL:\n{ctx.proposal_for('judge')}\n\n"
+                f"{ctx.transcript()}",
+                DebateJudgment, judge_temperature,
+            )
+            if interim.confidence >= early_exit_confidence:
+                judgment = interim
+                break
 
-    # Judge evaluates the full transcript
-    judgment = await call_llm(
-        system_prompt=JUDGE_PROMPT,
-        user_message=(
+    if judgment is None:
+        # Judge evaluates the transcript
+        final_round = ""
+        if steel_mans:
+            advocate_steel, devil_steel = steel_mans
+            final_round = (
+                f"\n\nROUND {rounds} (Steel-mans + Finals):\n"
+                f"  Advocate steel-man of opposition: {advocate_steel.steel_man_of_opposition}\n"
+                f"  Advocate final: {advocate_steel.final_argument}\n"
+                f"  Devil steel-man of status quo: {devil_steel.steel_man_of_opposition}\n"
+                f"  Devil final: {devil_steel.final_argument}"
+            )
+        judgment = await ask(
+            JUDGE_PROMPT,
             f"Judge the following debate about this proposal:\n\n"
-            f"PROPOSAL:\n{proposal_text}\n\n"
-            f"ROUND 1:\n  Advocate: {advocate_r1.text}\n  Devil's Advocate: {devil_r1.text}\n\n"
-            f"ROUND 2:\n  Advocate: {advocate_r2.text}\n  Devil's Advocate: {devil_r2.text}\n\n"
-            f"ROUND 3 (Steel-mans + Finals):\n"
-            f"  Advocate steel-man of opposition: {advocate_steel.steel_man_of_opposition}\n"
-            f"  Advocate final: {advocate_steel.final_argument}\n"
-            f"  Devil steel-man of status quo: {devil_steel.steel_man_of_opposition}\n"
-            f"  Devil final: {devil_steel.final_argument}"
-        ),
-        response_model=DebateJudgment,
-        temperature=judge_temperature,
-        stage="structured_debate",
-    )
+            f"PROPOSAL:\n{ctx.proposal_for('judge')}\n\n"
+            f"{ctx.transcript()}{final_round}",
+            DebateJudgment, judge_temperature,
+        )
 
     # Ensure architecture_name is set on the judgment
     judgment.architecture_name = arch_name
+    rounds_completed = len(debate_rounds) + (1 if steel_mans else 0)
 
     logger.info(
-        f"Debate: '{arch_name}' — Winner: {judgment.debate_winner}, "
-        f"Innovation defense: {judgment.innovation_defense_strength}/10"
+        f"Debate: '{arch_name}' — Winner: {judgment.debate_winner} "
+        f"(confidence {judgment.confidence:.2f}), "
+        f"Innovation defense: {judgment.innovation_defense_strength}/10 "
+        f"({rounds_completed}/{rounds} rounds, {ctx.calls} calls, "
+        f"~{ctx.input_tokens} input tokens, {context_mode} context)"
     )
 
     return DebateResult(
         architecture_name=arch_name,
-        rounds=[
-            DebateRound(
-                round_number=1,
-                advocate_argument=advocate_r1.text,
-                devil_advocate_argument=devil_r1.text,
-            ),
-            DebateRound(
-                round_number=2,
-                advocate_argument=advocate_r2.text,
-                devil_advocate_argument=devil_r2.text,
-            ),
-        ],
-        steel_mans=[advocate_steel, devil_steel],
+        rounds=debate_rounds,
+        steel_mans=steel_mans,
         judgment=judgment,
+        input_tokens=ctx.input_tokens,
+        rounds_completed=rounds_completed,
+        llm_calls=ctx.calls,
     )
 
 
@@ -190,29 +253,71 @@ async def run_structured_debate(
     advocate_temperature: float = 0.6,
     devil_temperature: float = 0.6,
     judge_temperature: float = 0.3,
+    max_concurrent_debates: int = 3,
+    progress_callback: Callable[[int, int, dict], None] | None = None,
+    context_mode: str = "rolling",
+    summary_sentences: int = 3,
+    context_digest_tokens: int = 800,
+    rounds: int = 3,
+    early_exit: bool = False,
+    early_exit_confidence: float = 0.8,
 ) -> list[DebateResult]:
-    """Run debates for all proposals SEQUENTIALLY (one at a time to avoid rate limits)."""
-    logger.info(f"Structured Debate: Running {len(annotated_proposals)} debates sequentially...")
+    """Run debates for all proposals concurrently, at most `max_concurrent_debates` at once.
+
+    `progress_callback` is called as (completed, total, details) after each
+    debate finishes. Results keep the input order; failed debates are skipped.
+    """
+    total = len(annotated_proposals)
+    logger.info(
+        f"Structured Debate: Running {total} debates of up to {rounds} rounds "
+        f"({max_concurrent_debates} at a time"
+        + (f", early exit at confidence {early_exit_confidence:g}" if early_exit else "")
+        + ")..."
+    )
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrent_debates))
+    completed = 0
 
-    debate_results = []
-    for ap in annotated_proposals:
+    async def debate(ap: AnnotatedProposal) -> DebateResult | None:
+        nonlocal completed
         arch_name = ap.proposal.architecture_name
-        try:
-            result = await run_debate_for_proposal(
-                ap, enterprise_context,
-                advocate_temperature=advocate_temperature,
-                devil_temperature=devil_temperature,
-                judge_temperature=judge_temperature,
-            )
-            debate_results.append(result)
-        except Exception as e:
-            logger.error(f"Debate failed for '{arch_name}': {e}")
-            continue
+        async with semaphore:
+            try:
+                result = await run_debate_for_proposal(
+                    ap, enterprise_context,
+                    advocate_temperature=advocate_temperature,
+                    devil_temperature=devil_temperature,
+                    judge_temperature=judge_temperature,
+                    context_mode=context_mode,
+                    summary_sentences=summary_sentences,
+                    context_digest_tokens=context_digest_tokens,
+                    rounds=rounds,
+                    early_exit=early_exit,
+                    early_exit_confidence=early_exit_confidence,
+                )
+                details = {"architecture_name": arch_name, "winner": result.judgment.debate_winner}
+            except Exception as e:
+                logger.error(f"Debate failed for '{arch_name}': {e}")
+                result = None
+                details = {"architecture_name": arch_name, "error": str(e)}
+        completed += 1
+        if progress_callback:
+            progress_callback(completed, total, details)
+        return result
+
+    results = await asyncio.gather(*(debate(ap) for ap in annotated_proposals))
+    debate_results = [r for r in results if r is not None]
 
     won = sum(1 for d in debate_results if d.judgment.debate_winner == "innovation")
+    calls = sum(d.llm_calls for d in debate_results)
+    saved = full_debate_calls(rounds) * len(debate_results) - calls
+    stopped = sum(1 for d in debate_results if d.rounds_completed < rounds)
     logger.info(
         f"Structured Debate: {len(debate_results)} debates complete. "
-        f"Innovation won {won}/{len(debate_results)}."
+        f"Innovation won {won}/{len(debate_results)}. "
+        f"{calls} LLM calls ({saved:+d} saved vs. running all {rounds} rounds; "
+        f"{stopped} stopped early), "
+        f"~{sum(d.input_tokens for d in debate_results)} input tokens ({context_mode} context)."
     )
 
     return debate_results
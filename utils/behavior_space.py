@@ -0,0 +1,153 @@
+"""Pluggable behavior spaces for the MAP-Elites archive.
+
+A behavior space maps a proposal's named descriptor values (by default the
+`DiversityScores` dimensions) to a hashable archive cell:
+
+- `GridBehaviorSpace`: a regular N-dimensional grid with per-dimension
+  resolution. The default 5x5x5 grid over the three LLM-scored dimensions
+  reproduces the original archive exactly.
+- `CvtBehaviorSpace`: centroidal Voronoi tessellation (CVT-MAP-Elites). A
+  fixed number of centroids covers the space, so adding dimensions does not
+  multiply the cell count; insertion is a KD-tree nearest-centroid lookup.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+from pydantic import BaseModel, Field
+from scipy.spatial import cKDTree
+
+Cell = tuple[int, ...]
+
+
+class BehaviorDimension(BaseModel):
+    """One axis of the behavior space."""
+    name: str = Field(description="Descriptor name (e.g. 'paradigm_novelty')")
+    low: float = 1.0
+    high: float = 5.0
+    bins: int = Field(default=5, ge=1, description="Grid resolution along this axis")
+
+
+DEFAULT_DIMENSIONS = [
+    BehaviorDimension(name="paradigm_novelty"),
+    BehaviorDimension(name="structural_complexity"),
+    BehaviorDimension(name="migration_distance"),
+]
+
+
+class BehaviorSpace(ABC):
+    """Base class: descriptor vectors, normalization and cell geometry."""
+
+    kind = "base"
+
+    def __init__(self, dimensions: list[BehaviorDimension] | None = None):
+        self.dimensions = list(dimensions or DEFAULT_DIMENSIONS)
+        self.names = [d.name for d in self.dimensions]
+        self._low = np.array([d.low for d in self.dimensions], dtype=np.float64)
+        span = np.array([d.high - d.low for d in self.dimensions], dtype=np.float64)
+        self._span = np.where(span > 0, span, 1.0)
+
+    @property
+    @abstractmethod
+    def n_cells(self) -> int:
+        """Number of cells in the space."""
+
+    def descriptor(self, values: dict[str, float]) -> np.ndarray:
+        """Descriptor vector in dimension order (raises KeyError if one is missing)."""
+        return np.array([float(values[name]) for name in self.names], dtype=np.float64)
+
+    def normalize(self, points: np.ndarray) -> np.ndarray:
+        """Map raw descriptor values into the unit hypercube (clipped)."""
+        return np.clip((np.asarray(points, dtype=np.float64) - self._low) / self._span, 0.0, 1.0)
+
+    @abstractmethod
+    def cell(self, values: dict[str, float]) -> Cell:
+        """Archive cell of a proposal's descriptor values."""
+
+    @abstractmethod
+    def cell_center(self, cell: Cell) -> np.ndarray:
+        """Representative point of a cell, in raw descriptor units."""
+
+
+class GridBehaviorSpace(BehaviorSpace):
+    """Regular grid; each value snaps to the nearest of `bins` evenly spaced levels.
+
+    With low=1, high=5, bins=5 the levels are exactly the rubric scores 1..5,
+    so cells coincide with the original (novelty, complexity, distance) tuples.
+    """
+
+    kind = "grid"
+
+    def __init__(self, dimensions: list[BehaviorDimension] | None = None):
+        super().__init__(dimensions)
+        self._steps = np.array([max(d.bins - 1, 1) for d in self.dimensions], dtype=np.float64)
+        self._bins = np.array([d.bins for d in self.dimensions])
+
+    @property
+    def n_cells(self) -> int:
+        return int(np.prod(self._bins))
+
+    def cell(self, values: dict[str, float]) -> Cell:
+        idx = np.rint(self.normalize(self.descriptor(values)) * self._steps).astype(int)
+        return tuple(int(i) for i in np.minimum(idx, self._bins - 1))
+
+    def cell_center(self, cell: Cell) -> np.ndarray:
+        return self._low + np.asarray(cell, dtype=np.float64) / self._steps * self._span
+
+
+class CvtBehaviorSpace(BehaviorSpace):
+    """Centroidal Voronoi tessellation with KD-tree nearest-centroid insertion."""
+
+    kind = "cvt"
+
+    def __init__(
+        self,
+        dimensions: list[BehaviorDimension] | None = None,
+        n_centroids: int = 512,
+        seed: int = 0,
+        samples_per_centroid: int = 20,
+        iterations: int = 15,
+    ):
+        super().__init__(dimensions)
+        rng = np.random.default_rng(seed)
+        d = len(self.dimensions)
+        samples = rng.random((n_centroids * samples_per_centroid, d))
+        centroids = samples[rng.choice(len(samples), n_centroids, replace=False)]
+
+        # Lloyd's algorithm over uniform samples of the unit hypercube
+        for _ in range(iterations):
+            _, assignment = cKDTree(centroids).query(samples)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, samples)
+            counts = np.bincount(assignment, minlength=n_centroids)[:, None]
+            centroids = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+
+        self.centroids = centroids
+        self._tree = cKDTree(centroids)
+
+    @property
+    def n_cells(self) -> int:
+        return len(self.centroids)
+
+    def cell(self, values: dict[str, float]) -> Cell:
+        _, idx = self._tree.query(self.normalize(self.descriptor(values)))
+        return (int(idx),)
+
+    def cell_center(self, cell: Cell) -> np.ndarray:
+        return self._low + self.centroids[cell[0]] * self._span
+
+
+def build_behavior_space(cfg: dict | None = None) -> BehaviorSpace:
+    """Build a behavior space from a `diversity_archive.behavior_space` config block."""
+    cfg = cfg or {}
+    dimensions = [BehaviorDimension(**d) for d in cfg.get("dimensions", [])] or None
+    space_type = cfg.get("type", "grid")
+    if space_type == "grid":
+        return GridBehaviorSpace(dimensions)
+    if space_type == "cvt":
+        return CvtBehaviorSpace(
+            dimensions,
+            n_centroids=cfg.get("cvt_centroids", 512),
+            seed=cfg.get("seed", 0),
+        )
+    raise ValueError(f"Unknown behavior space type '{space_type}' (expected 'grid' or 'cvt')")
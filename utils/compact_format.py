@@ -0,0 +1,206 @@
+"""Compact, reversible text encoding of proposals for prompts.
+
+`model_dump_json(indent=2)` spends most of a proposal's prompt tokens on
+indentation, quotes, repeated keys ("step_number", "from_component", ...)
+and null optional fields. The compact form is line-based:
+
+    architecture_name: Log-Centric Event Mesh
+    core_thesis: Make the event log the system of record.
+    components[name|role|technology_suggestion]:
+    - Event Gateway|Validates and publishes events|
+    - Kafka Log|Durable ordered event log|Kafka
+    data_flow[step_number|from_component|to_component|description|pattern]:
+    - 1|Event Gateway|Kafka Log|Publishes validated events|pub-sub
+    key_innovations:
+    - Views are rebuilt from the log on demand
+
+- Scalars are `key: value` lines; lists of strings are `key:` followed
+  by `- item` lines.
+- Lists of models are tables: the column names appear once in the
+  header, and each row holds `|`-separated cells. An empty cell is None
+  (an empty string is written `\\0`), and a list inside a cell is
+  `,`-separated.
+- Nested models (AnnotatedProposal.proposal) are flattened into their
+  parent.
+- None and empty lists are dropped.
+- Newlines and separators inside values are backslash-escaped.
+
+`from_compact` decodes the text back into the model class, so
+`from_compact(to_compact(m), type(m)) == m`.
+"""
+
+import types
+import typing
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+# "\0" marks an empty string in a cell, where an empty cell means None
+_ESCAPES = {"n": "\n", "r": "\r", "0": ""}
+
+
+def _escape(text: str, specials: str = "") -> str:
+    text = text.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+    for ch in specials:
+        text = text.replace(ch, "\\" + ch)
+    return text
+
+
+def _unescape(text: str) -> str:
+    out, i = [], 0
+    while i < len(text):
+        if text[i] == "\\" and i + 1 < len(text):
+            out.append(_ESCAPES.get(text[i + 1], text[i + 1]))
+            i += 2
+        else:
+            out.append(text[i])
+            i += 1
+    return "".join(out)
+
+
+def _split(text: str, sep: str) -> list[str]:
+    """Split on unescaped `sep`, leaving escapes in place."""
+    parts, current, i = [], [], 0
+    while i < len(text):
+        if text[i] == "\\" and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if text[i] == sep:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(text[i])
+        i += 1
+    parts.append("".join(current))
+    return parts
+
+
+def _kind(annotation: Any) -> tuple[str, Any]:
+    """("model" | "table" | "list" | "scalar", inner type) of a field annotation."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        annotation = args[0] if len(args) == 1 else str
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return "model", annotation
+    if typing.get_origin(annotation) is list:
+        (item,) = typing.get_args(annotation) or (str,)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return "table", item
+        return "list", item
+    if typing.get_origin(annotation) is dict:
+        raise TypeError(f"Compact format does not support dict fields ({annotation})")
+    return "scalar", annotation
+
+
+def _scalar(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def _cell_item(value: Any, specials: str) -> str:
+    text = _escape(_scalar(value), specials)
+    if text.startswith(" "):
+        text = "\\" + text  # Keeps the space from being read as part of the ", " separator
+    return text or "\\0"
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(_cell_item(v, ",|") for v in value)
+    return _cell_item(value, "|")
+
+
+def _drops_empty(field) -> bool:
+    """Empty lists are dropped unless they'd decode differently (an Optional list defaulting to None)."""
+    return field.is_required() or field.get_default(call_default_factory=True) == []
+
+
+def _encode_fields(model: BaseModel, lines: list[str], include: set[str] | None) -> None:
+    for name, field in type(model).model_fields.items():
+        if include is not None and name not in include:
+            continue
+        value = getattr(model, name)
+        kind, inner = _kind(field.annotation)
+        if value is None or (value == [] and _drops_empty(field)):
+            continue
+        if kind == "model":
+            _encode_fields(value, lines, None)
+        elif kind == "table":
+            columns = list(inner.model_fields)
+            lines.append(f"{name}[{'|'.join(columns)}]:")
+            lines.extend("- " + "|".join(_cell(getattr(row, c)) for c in columns) for row in value)
+        elif kind == "list":
+            lines.append(f"{name}:")
+            lines.extend(f"- {_escape(_scalar(v))}" for v in value)
+        else:
+            lines.append(f"{name}: {_escape(_scalar(value))}")
+
+
+def to_compact(model: BaseModel, include: set[str] | None = None) -> str:
+    """Compact prompt encoding of a model (optionally only the `include` top-level fields)."""
+    lines: list[str] = []
+    _encode_fields(model, lines, include)
+    return "\n".join(lines)
+
+
+def _parse(text: str) -> dict[str, Any]:
+    """Raw entries: scalar -> str, list -> [str], table -> (columns, [row str])."""
+    raw: dict[str, Any] = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith("- ") and current is not None:
+            current.append(line[2:])
+        elif line.endswith(":") and ": " not in line:
+            header = line[:-1]
+            name, _, columns = header.partition("[")
+            current = []
+            raw[name] = (columns.rstrip("]").split("|"), current) if columns else current
+        elif ": " in line:
+            name, _, value = line.partition(":")
+            raw[name] = value[1:] if value.startswith(" ") else value
+            current = None
+    return raw
+
+
+def _decode_cell(cell: str, field) -> Any:
+    kind, _ = _kind(field.annotation)
+    if cell == "" and not field.is_required() and field.default is None:
+        return None
+    if kind == "list":
+        return [_unescape(v[1:] if v.startswith(" ") else v) for v in _split(cell, ",")] if cell else []
+    return _unescape(cell)
+
+
+def _build(model_cls: type[BaseModel], raw: dict[str, Any]) -> dict[str, Any]:
+    values: dict[str, Any] = {}
+    for name, field in model_cls.model_fields.items():
+        kind, inner = _kind(field.annotation)
+        if kind == "model":
+            values[name] = _build(inner, raw)
+            continue
+        if name not in raw:
+            if kind in ("table", "list") and field.is_required():
+                values[name] = []
+            continue
+        entry = raw[name]
+        if kind == "table":
+            columns, rows = entry
+            values[name] = [
+                {c: _decode_cell(cell, inner.model_fields[c])
+                 for c, cell in zip(columns, _split(row, "|")) if c in inner.model_fields}
+                for row in rows
+            ]
+        elif kind == "list":
+            values[name] = [_unescape(v) for v in entry]
+        else:
+            values[name] = _unescape(entry)
+    return values
+
+
+def from_compact(text: str, model_cls: type[M]) -> M:
+    """Decode `to_compact` output back into `model_cls` (validated)."""
+    return model_cls.model_validate(_build(model_cls, _parse(text)))
@@ -0,0 +1,173 @@
+"""Prompt context for one structured debate, with rolling summaries.
+
+In "full" mode a debate resends the whole proposal and enterprise context
+in several rounds and re-embeds the raw transcript. In "rolling" mode each
+role receives the full proposal and enterprise context only the first time
+it speaks; after that it (and the judge) gets compact digests. The
+transcript keeps the latest round verbatim and replaces earlier rounds
+with short extractive summaries. All summaries are computed locally and
+cached, and every prompt sent through the context is counted, so the
+input-token footprint of both modes can be compared.
+"""
+
+import functools
+import re
+
+from models.schemas import AnnotatedProposal
+from utils.compact_format import to_compact
+from utils.tokens import estimate_tokens
+
+CONTEXT_MODES = ("full", "rolling")
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_SECTION_SEPARATOR = "\n\n---\n\n"
+
+
+def summarize_text(text: str, sentences: int = 3) -> str:
+    """Extractive summary: the first `sentences` sentences of `text`."""
+    parts = _SENTENCE_RE.split(text.strip())
+    summary = " ".join(parts[:sentences])
+    return summary if len(parts) <= sentences else summary + " […]"
+
+
+@functools.lru_cache(maxsize=8)
+def context_digest(enterprise_context: str, token_budget: int = 800) -> str:
+    """Compact digest of the enterprise context, shared by every debate.
+
+    The budget is split evenly across the context's sections; each keeps
+    its heading and as many leading non-empty lines as fit.
+    """
+    sections = enterprise_context.split(_SECTION_SEPARATOR)
+    per_section = max(token_budget // max(len(sections), 1), 1)
+    digests = []
+    for section in sections:
+        kept, used = [], 0
+        for line in (l for l in section.splitlines() if l.strip()):
+            tokens = estimate_tokens(line)
+            if kept and used + tokens > per_section:
+                break
+            kept.append(line)
+            used += tokens
+        digests.append("\n".join(kept))
+    return "\n\n".join(digests)
+
+
+def proposal_digest(ap: AnnotatedProposal) -> str:
+    """Compact proposal summary for later rounds and the judge."""
+    p = ap.proposal
+    components = ", ".join(
+        f"{c.name} ({c.technology_suggestion})" if c.technology_suggestion else c.name
+        for c in p.components
+    )
+    lines = [
+        f"{p.architecture_name} [{p.paradigm_source}]",
+        f"Thesis: {p.core_thesis}",
+        f"Components: {components}",
+        "Data flow: " + "; ".join(
+            f"{s.from_component}->{s.to_component} ({s.pattern})" for s in p.data_flow
+        ),
+        "Innovations: " + "; ".join(p.key_innovations),
+        "Assumptions: " + "; ".join(p.assumptions),
+        "Risks: " + "; ".join(f"[{r.severity}] {r.description}" for r in p.risks),
+        f"Feasibility: {ap.overall_feasibility_note} "
+        f"({ap.hard_constraint_violations} critical constraint flags)",
+    ]
+    return "\n".join(lines)
+
+
+def annotations_digest(ap: AnnotatedProposal) -> str:
+    """One line per constraint annotation."""
+    if not ap.annotations:
+        return "(none)"
+    return "\n".join(
+        f"- [{a.severity}] {a.constraint_type}: {a.description}"
+        + (f" (mitigation: {a.suggested_mitigation})" if a.suggested_mitigation else "")
+        for a in ap.annotations
+    )
+
+
+class DebateContext:
+    """Builds the per-round context of one debate and counts its input tokens."""
+
+    def __init__(
+        self,
+        annotated_proposal: AnnotatedProposal,
+        enterprise_context: str,
+        mode: str = "rolling",
+        summary_sentences: int = 3,
+        context_digest_tokens: int = 800,
+    ):
+        if mode not in CONTEXT_MODES:
+            raise ValueError(f"Unknown debate context mode '{mode}' (expected one of {CONTEXT_MODES})")
+        self.annotated_proposal = annotated_proposal
+        self.enterprise_context = enterprise_context
+        self.mode = mode
+        self.summary_sentences = summary_sentences
+        self.context_digest_tokens = context_digest_tokens
+        self.input_tokens = 0
+        self.calls = 0
+        self._seen: set[tuple[str, str]] = set()  # (role, "proposal" | "context")
+        self._rounds: list[tuple[str, str, str]] = []  # (label, advocate, devil)
+        self._summaries: dict[str, str] = {}
+
+    @functools.cached_property
+    def full_proposal(self) -> str:
+        return to_compact(self.annotated_proposal)
+
+    @functools.cached_property
+    def compact_proposal(self) -> str:
+        return proposal_digest(self.annotated_proposal)
+
+    def _first_time(self, role: str, what: str) -> bool:
+        first = (role, what) not in self._seen
+        self._seen.add((role, what))
+        return first
+
+    def proposal_for(self, role: str) -> str:
+        """Full proposal the first time a debater sees it (always in "full" mode).
+
+        In "rolling" mode the judge only gets the compact proposal.
+        """
+        if self.mode == "full":
+            return self.full_proposal
+        if role != "judge" and self._first_time(role, "proposal"):
+            return self.full_proposal
+        return self.compact_proposal
+
+    def context_for(self, role: str) -> str:
+        """Full enterprise context the first time a role sees it (always in "full" mode)."""
+        if self.mode == "full" or self._first_time(role, "context"):
+            return self.enterprise_context
+        return context_digest(self.enterprise_context, self.context_digest_tokens)
+
+    def annotations(self) -> str:
+        if self.mode == "full":
+            return to_compact(self.annotated_proposal, include={"annotations"})
+        return annotations_digest(self.annotated_proposal)
+
+    def summary(self, text: str) -> str:
+        """Cached extractive summary of an argument."""
+        if text not in self._summaries:
+            self._summaries[text] = summarize_text(text, self.summary_sentences)
+        return self._summaries[text]
+
+    def add_round(self, label: str, advocate: str, devil: str) -> None:
+        self._rounds.append((label, advocate, devil))
+
+    def transcript(self) -> str:
+        """Debate so far: verbatim in "full" mode; otherwise only the latest
+        round is verbatim and earlier rounds are summarized."""
+        lines = []
+        for i, (label, advocate, devil) in enumerate(self._rounds):
+            if self.mode == "rolling" and i < len(self._rounds) - 1:
+                lines.append(f"{label} (summary):\n  Advocate: {self.summary(advocate)}\n"
+                             f"  Devil's Advocate: {self.summary(devil)}")
+            else:
+                lines.append(f"{label}:\n  Advocate: {advocate}\n  Devil's Advocate: {devil}")
+        return "\n\n".join(lines)
+
+    def record(self, system_prompt: str, user_message: str) -> str:
+        """Count a prompt's input tokens; returns the user message unchanged."""
+        self.calls += 1
+        self.input_tokens += estimate_tokens(system_prompt) + estimate_tokens(user_message)
+        return user_message
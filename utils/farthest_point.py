@@ -0,0 +1,86 @@
+"""Vectorized farthest-point selection over behavioral descriptors.
+
+Greedy max-min (farthest-point) sampling: each pick is the candidate whose
+distance to its nearest already-selected point is largest. A running
+min-distance vector is updated once per pick, so selecting k of n points
+costs O(k·n) vectorized work instead of re-sorting all candidates per pick.
+"""
+
+import numpy as np
+
+NORMALIZATIONS = ("none", "range", "std")
+
+
+def prepare_descriptors(
+    points: np.ndarray,
+    weights: np.ndarray | list[float] | None = None,
+    normalize: str = "none",
+) -> np.ndarray:
+    """Normalize descriptors per dimension and fold in distance weights.
+
+    Weighted Euclidean distance sqrt(sum(w * (a - b)^2)) equals the plain
+    Euclidean distance after scaling each dimension by sqrt(w).
+    """
+    if normalize not in NORMALIZATIONS:
+        raise ValueError(f"Unknown normalization '{normalize}' (expected one of {NORMALIZATIONS})")
+    X = np.asarray(points, dtype=np.float64)
+    if X.ndim != 2:
+        raise ValueError(f"Descriptors must be a 2-D array, got shape {X.shape}")
+
+    if normalize == "range" and len(X):
+        span = X.max(axis=0) - X.min(axis=0)
+        X = (X - X.min(axis=0)) / np.where(span > 0, span, 1.0)
+    elif normalize == "std" and len(X):
+        std = X.std(axis=0)
+        X = (X - X.mean(axis=0)) / np.where(std > 0, std, 1.0)
+
+    if weights is not None:
+        w = np.asarray(weights, dtype=np.float64)
+        if w.shape != (X.shape[1],):
+            raise ValueError(f"Expected {X.shape[1]} distance weights, got {w.shape}")
+        X = X * np.sqrt(w)
+    return X
+
+
+def farthest_point_selection(
+    X: np.ndarray,
+    k: int,
+    anchors: np.ndarray | None = None,
+    first: int | None = None,
+) -> list[int]:
+    """Select up to k row indices of X by greedy farthest-point sampling.
+
+    Args:
+        X: (n, d) prepared descriptors (see prepare_descriptors).
+        k: Number of rows to select.
+        anchors: (m, d) already-selected points (e.g. starred proposals) that
+                 candidates must keep their distance from. Not returned.
+        first: Row to pick first when there are no anchors (defaults to 0).
+
+    Returns:
+        Selected row indices in pick order.
+    """
+    n = len(X)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    min_dist = np.full(n, np.inf)
+    if anchors is not None and len(anchors):
+        for anchor in np.asarray(anchors, dtype=np.float64):
+            np.minimum(min_dist, np.sqrt(((X - anchor) ** 2).sum(axis=1)), out=min_dist)
+        idx = int(np.argmax(min_dist))
+    else:
+        idx = 0 if first is None else first
+
+    selected: list[int] = []
+    taken = np.zeros(n, dtype=bool)
+    while True:
+        selected.append(idx)
+        taken[idx] = True
+        if len(selected) >= k:
+            break
+        np.minimum(min_dist, np.sqrt(((X - X[idx]) ** 2).sum(axis=1)), out=min_dist)
+        min_dist[taken] = -np.inf
+        idx = int(np.argmax(min_dist))
+    return selected
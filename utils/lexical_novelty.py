@@ -0,0 +1,115 @@
+"""Lexical novelty estimates against the knowledge base and the current architecture.
+
+A proposal's thesis, innovations and components are compared (TF-IDF
+cosine, see utils/text_index.py) with the knowledge-base pattern sections
+and with the current architecture document:
+
+- high similarity to a known pattern   -> low paradigm_novelty
+- high similarity to the status quo    -> low migration_distance
+
+The estimates pre-score those two diversity dimensions in milliseconds,
+either replacing the LLM diversity call ("prescore") or deciding which
+proposals still need one ("gate").
+"""
+
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from models.schemas import Proposal
+from utils.text_index import TfidfIndex, load_or_build_index
+
+PRESCORE_MODES = ("off", "prescore", "gate")
+
+# Similarity at or above the i-th cutoff maps to level i + 1; below all cutoffs is 5
+DEFAULT_SIMILARITY_CUTOFFS = (0.40, 0.30, 0.20, 0.10)
+
+
+class LexicalEstimate(BaseModel):
+    """Lexical pre-score of one proposal."""
+    pattern_similarity: float
+    nearest_pattern: str
+    status_quo_similarity: float
+    paradigm_novelty: int
+    migration_distance: int
+
+
+def proposal_query_text(p: Proposal) -> str:
+    """The parts of a proposal compared against the corpus."""
+    parts = [p.core_thesis, *p.key_innovations]
+    for c in p.components:
+        parts.append(f"{c.name} {c.role} {c.technology_suggestion or ''}")
+    return "\n".join(parts)
+
+
+class NoveltyPrescorer:
+    """Maps lexical similarity to the 1-5 paradigm_novelty / migration_distance rubrics."""
+
+    def __init__(
+        self,
+        index: TfidfIndex,
+        mode: str = "prescore",
+        similarity_cutoffs: tuple[float, ...] = DEFAULT_SIMILARITY_CUTOFFS,
+        gate_min_novelty: int = 4,
+    ):
+        if mode not in PRESCORE_MODES:
+            raise ValueError(f"Unknown prescore mode '{mode}' (expected one of {PRESCORE_MODES})")
+        self.index = index
+        self.mode = mode
+        self.similarity_cutoffs = tuple(similarity_cutoffs)
+        self.gate_min_novelty = gate_min_novelty
+
+    def _level(self, similarity: float) -> int:
+        for level, cutoff in enumerate(self.similarity_cutoffs, start=1):
+            if similarity >= cutoff:
+                return level
+        return len(self.similarity_cutoffs) + 1
+
+    def estimate(self, p: Proposal) -> LexicalEstimate:
+        text = proposal_query_text(p)
+        pattern_sims, pattern_labels = self.index.similarities(text, kind="pattern")
+        status_sims, _ = self.index.similarities(text, kind="status_quo")
+        best = int(pattern_sims.argmax()) if len(pattern_sims) else -1
+        pattern_similarity = float(pattern_sims[best]) if best >= 0 else 0.0
+        status_quo_similarity = float(status_sims.max()) if len(status_sims) else 0.0
+        return LexicalEstimate(
+            pattern_similarity=pattern_similarity,
+            nearest_pattern=pattern_labels[best] if best >= 0 else "",
+            status_quo_similarity=status_quo_similarity,
+            paradigm_novelty=self._level(pattern_similarity),
+            migration_distance=self._level(status_quo_similarity),
+        )
+
+    def needs_llm(self, estimate: LexicalEstimate) -> bool:
+        """Whether a proposal still gets an LLM diversity call.
+
+        In "gate" mode only lexically novel proposals (where a bag-of-words
+        comparison is least reliable) are sent to the LLM.
+        """
+        return self.mode == "gate" and estimate.paradigm_novelty >= self.gate_min_novelty
+
+
+def build_novelty_prescorer(cfg: dict | None, base_dir: Path) -> NoveltyPrescorer | None:
+    """Build a prescorer from a `diversity_archive.lexical_novelty` config block.
+
+    Returns None when the mode is "off" or the knowledge base is missing.
+    """
+    cfg = cfg or {}
+    mode = cfg.get("mode", "off")
+    if mode == "off":
+        return None
+    patterns = sorted((base_dir / "knowledge_base").glob("*.md"))
+    status_quo = [p for p in [base_dir / "input/enterprise_docs/architecture.md"] if p.exists()]
+    if not patterns:
+        return None
+    cache_dir = cfg.get("cache_dir")
+    index = load_or_build_index(
+        {"pattern": patterns, "status_quo": status_quo},
+        cache_dir=base_dir / cache_dir if cache_dir else None,
+    )
+    return NoveltyPrescorer(
+        index,
+        mode=mode,
+        similarity_cutoffs=tuple(cfg.get("similarity_cutoffs", DEFAULT_SIMILARITY_CUTOFFS)),
+        gate_min_novelty=cfg.get("gate_min_novelty", 4),
+    )
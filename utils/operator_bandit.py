@@ -0,0 +1,174 @@
+"""Adaptive mutation-operator selection via a multi-armed bandit.
+
+Each mutation operator is an arm. Every mutation call is a pull; its reward
+(in [0, 1]) is assigned later, once we know what happened to the child:
+
+- Diversity archive: SELECTION_REWARD (0.5) once the child is selected or
+  placed as an elite; children never selected keep 0.0.
+- Stage 5: children that reached the portfolio are upgraded to
+  SELECTION_REWARD + 0.05 * composite_score (0.5-1.0), so reaching the
+  portfolio never pays less than selection and better-ranked children pay
+  more.
+
+Per-operator statistics persist across runs in a small JSON store, so the
+policy keeps learning which operators yield archive-worthy children.
+"""
+
+import json
+import logging
+import math
+import os
+import random
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("ucb1", "thompson")
+
+# Reward for a selected / elite child; the portfolio reward builds on it
+SELECTION_REWARD = 0.5
+
+
+class OperatorBandit:
+    """UCB1 / Thompson-sampling selector over mutation operators."""
+
+    def __init__(
+        self,
+        operators: list[str],
+        policy: str = "ucb1",
+        exploration: float = 1.0,
+        store_path: Path | None = None,
+        seed: int | None = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown bandit policy '{policy}' (expected one of {POLICIES})")
+        self.policy = policy
+        self.exploration = exploration
+        self.store_path = Path(store_path) if store_path else None
+        self.stats: dict[str, dict[str, float]] = {
+            op: {"pulls": 0, "reward_sum": 0.0} for op in operators
+        }
+        # child architecture_name -> (operator, reward currently credited);
+        # callers keep child names unique and report renames (rename_child)
+        self._children: dict[str, tuple[str, float]] = {}
+        self._rng = random.Random(seed)
+
+    # ── Selection ──
+
+    def _index(self, op: str, extra_pulls: int, total_pulls: int) -> float:
+        pulls = self.stats[op]["pulls"] + extra_pulls
+        reward_sum = self.stats[op]["reward_sum"]
+        if self.policy == "thompson":
+            # Beta posterior over fractional rewards
+            return self._rng.betavariate(1 + reward_sum, 1 + max(pulls - reward_sum, 0))
+        if pulls == 0:
+            return math.inf
+        mean = reward_sum / pulls
+        return mean + self.exploration * math.sqrt(2 * math.log(max(total_pulls, 1)) / pulls)
+
+    def select(self, available: list[str], k: int, distinct: bool = True) -> list[str]:
+        """Pick k operators. Picks within one call count as provisional pulls,
+        so UCB1 spreads a batch instead of repeating the current leader."""
+        for op in available:
+            self.stats.setdefault(op, {"pulls": 0, "reward_sum": 0.0})
+        if distinct:
+            k = min(k, len(available))
+
+        chosen: list[str] = []
+        provisional: dict[str, int] = {}
+        total = sum(int(self.stats[op]["pulls"]) for op in available)
+        for _ in range(k):
+            candidates = [op for op in available if not (distinct and op in chosen)]
+            scored = [
+                (self._index(op, provisional.get(op, 0), total + len(chosen)), self._rng.random(), op)
+                for op in candidates
+            ]
+            best = max(scored)[2]
+            chosen.append(best)
+            provisional[best] = provisional.get(best, 0) + 1
+        return chosen
+
+    # ── Rewards ──
+
+    def record_pull(self, op: str, child_name: str | None) -> None:
+        """Count a mutation call. Failed calls (no child) count with zero reward."""
+        self.stats.setdefault(op, {"pulls": 0, "reward_sum": 0.0})
+        self.stats[op]["pulls"] += 1
+        if child_name is not None:
+            self._children[child_name] = (op, 0.0)
+
+    def reward_child(self, child_name: str, reward: float) -> None:
+        """Set the reward credited for a child (replacing any earlier reward)."""
+        if child_name not in self._children:
+            return
+        op, previous = self._children[child_name]
+        reward = min(max(reward, 0.0), 1.0)
+        self.stats[op]["reward_sum"] += reward - previous
+        self._children[child_name] = (op, reward)
+
+    def rename_child(self, old_name: str, new_name: str) -> None:
+        """Follow a child whose architecture_name changed after the pull (e.g. in refinement)."""
+        if old_name == new_name or old_name not in self._children:
+            return
+        if new_name in self._children:
+            logger.warning(f"Operator bandit: cannot track '{old_name}' as '{new_name}' (name taken)")
+            return
+        self._children[new_name] = self._children.pop(old_name)
+
+    def reward_selection(self, selected_names: set[str]) -> None:
+        """Diversity-archive reward: credit selected / elite children with SELECTION_REWARD.
+
+        Children already credited more (e.g. by an earlier selection) keep
+        their reward; unselected children are left unchanged.
+        """
+        for name in selected_names & self._children.keys():
+            self.reward_child(name, max(self._children[name][1], SELECTION_REWARD))
+
+    def reward_scores(self, composite_scores: dict[str, float]) -> None:
+        """Stage 5 reward: upgrade children that reached the portfolio by composite score."""
+        for name, composite in composite_scores.items():
+            self.reward_child(name, SELECTION_REWARD + 0.05 * composite)
+
+    # ── Persistence ──
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {
+            op: {
+                "pulls": int(s["pulls"]),
+                "mean_reward": round(s["reward_sum"] / s["pulls"], 3) if s["pulls"] else 0.0,
+            }
+            for op, s in self.stats.items()
+        }
+
+    def save(self) -> None:
+        """Persist per-operator statistics (no-op if no store path is set)."""
+        if self.store_path is None:
+            return
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.store_path.with_suffix(self.store_path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"policy": self.policy, "operators": self.stats}, f, indent=2)
+        os.replace(tmp_path, self.store_path)
+
+    @classmethod
+    def load(
+        cls,
+        store_path: Path,
+        operators: list[str],
+        policy: str = "ucb1",
+        exploration: float = 1.0,
+    ) -> "OperatorBandit":
+        """Create a bandit, restoring statistics from `store_path` if it exists."""
+        bandit = cls(operators, policy=policy, exploration=exploration, store_path=store_path)
+        if bandit.store_path.exists():
+            try:
+                with open(bandit.store_path, encoding="utf-8") as f:
+                    saved = json.load(f).get("operators", {})
+                for op, s in saved.items():
+                    bandit.stats[op] = {
+                        "pulls": int(s.get("pulls", 0)),
+                        "reward_sum": float(s.get("reward_sum", 0.0)),
+                    }
+            except Exception as e:
+                logger.warning(f"Could not load operator stats from {store_path}: {e}")
+        return bandit
@@ -0,0 +1,121 @@
+"""Local application of LLM-produced proposal patches.
+
+In patch response mode the LLM returns a `ProposalPatch` (what changed)
+instead of regenerating the full proposal. `apply_patch` applies it to the
+input proposal and re-validates the result, raising `PatchError` when the
+patch does not fit the proposal (unknown names, flow steps referencing
+components that don't exist, a result that fails validation).
+"""
+
+from pydantic import BaseModel, ValidationError
+
+from models.schemas import DataFlowStep, Proposal, ProposalPatch
+
+# Fields that only exist on patch subclasses (e.g. mutation_description)
+_PATCH_FIELDS = set(ProposalPatch.model_fields)
+
+
+class PatchError(ValueError):
+    """A patch could not be applied to its base proposal."""
+
+
+def _apply_components(base: Proposal, patch: ProposalPatch) -> list:
+    components = [c.model_copy() for c in base.components]
+    names = {c.name for c in components}
+
+    for name in patch.remove_components:
+        if name not in names:
+            raise PatchError(f"Cannot remove unknown component '{name}'")
+    components = [c for c in components if c.name not in set(patch.remove_components)]
+
+    index = {c.name: i for i, c in enumerate(components)}
+    for replacement in patch.replace_components:
+        if replacement.name not in index:
+            raise PatchError(f"Cannot replace unknown component '{replacement.name}'")
+        components[index[replacement.name]] = replacement
+
+    for added in patch.add_components:
+        if added.name in index:
+            # Adding an existing name is treated as a replacement
+            components[index[added.name]] = added
+        else:
+            index[added.name] = len(components)
+            components.append(added)
+
+    return components
+
+
+def _apply_flow(base: Proposal, patch: ProposalPatch) -> list[DataFlowStep]:
+    by_number = {step.step_number: step.model_copy() for step in base.data_flow}
+
+    for number in patch.remove_flow_steps:
+        if number not in by_number:
+            raise PatchError(f"Cannot remove unknown data flow step {number}")
+        del by_number[number]
+
+    for replacement in patch.replace_flow_steps:
+        if replacement.step_number not in by_number:
+            raise PatchError(f"Cannot replace unknown data flow step {replacement.step_number}")
+        by_number[replacement.step_number] = replacement
+
+    # Added steps go before the current step with the same number (or at the end)
+    keyed = [(float(n), 1, i, step) for i, (n, step) in enumerate(by_number.items())]
+    keyed += [(float(step.step_number), 0, i, step) for i, step in enumerate(patch.add_flow_steps)]
+    keyed.sort(key=lambda x: x[:3])
+
+    flow = []
+    for new_number, (_, _, _, step) in enumerate(keyed, start=1):
+        flow.append(step.model_copy(update={"step_number": new_number}))
+    return flow
+
+
+def apply_patch(
+    base: Proposal,
+    patch: ProposalPatch,
+    result_model: type[BaseModel],
+    **extra_fields,
+) -> BaseModel:
+    """Apply `patch` to `base` and validate the result as `result_model`.
+
+    Patch-subclass fields (e.g. `mutation_description`, `refinements_made`)
+    and `extra_fields` are copied onto the result.
+
+    Raises:
+        PatchError: If the patch references components or steps that don't
+            exist, leaves data flow steps pointing at components that are not
+            in the result, or produces an invalid `result_model`.
+    """
+    components = _apply_components(base, patch)
+    flow = _apply_flow(base, patch)
+
+    names = {c.name for c in components}
+    for step in flow:
+        dangling = {step.from_component, step.to_component} - names
+        if dangling:
+            raise PatchError(
+                f"Data flow step {step.step_number} references unknown "
+                f"component(s): {', '.join(sorted(dangling))}"
+            )
+
+    data = base.model_dump()
+    data.update(
+        components=[c.model_dump() for c in components],
+        data_flow=[s.model_dump() for s in flow],
+    )
+    for field in ("architecture_name", "core_thesis", "key_innovations", "assumptions", "risks"):
+        value = getattr(patch, field)
+        if value is not None:
+            data[field] = value if not isinstance(value, list) else [
+                v.model_dump() if isinstance(v, BaseModel) else v for v in value
+            ]
+
+    data.update({
+        name: getattr(patch, name)
+        for name in type(patch).model_fields
+        if name not in _PATCH_FIELDS
+    })
+    data.update(extra_fields)
+    try:
+        return result_model.model_validate(data)
+    except ValidationError as e:
+        raise PatchError(f"Patched proposal is invalid: {e}") from e
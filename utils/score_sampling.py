@@ -0,0 +1,73 @@
+"""Confidence intervals and stopping rule for repeated proposal scoring.
+
+A proposal scored k times gets a normal-approximation interval
+mean ± z * s / sqrt(k). One or two samples say little about the spread, so
+s is pooled across all proposals (the noise comes from the same ranker at
+the same temperature) and shrunk towards a prior:
+
+    s^2 = (PRIOR_DF * prior_sd^2 + sum_i sum_j (x_ij - mean_i)^2)
+          / (PRIOR_DF + sum_i (k_i - 1))
+
+`contested` flags the proposals whose intervals still matter for the
+portfolio's decisions: the innovation interval straddles a tier cutoff
+(or the samples disagree on the tier), or the composite interval overlaps
+the leader of the proposal's tier. Sampling stops once nothing is flagged.
+"""
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+# Composite / dimension noise (score points) assumed before any repeats
+PRIOR_SD = 1.0
+# Weight of the prior, in degrees of freedom
+PRIOR_DF = 2
+
+
+def interval_half_widths(
+    values: list[np.ndarray],
+    confidence: float = 0.9,
+    prior_sd: float = PRIOR_SD,
+) -> np.ndarray:
+    """Half-width of each sample set's confidence interval for its mean (pooled s)."""
+    if not values:
+        return np.zeros(0)
+    sum_squares = sum(float(((v - v.mean()) ** 2).sum()) for v in values)
+    df = sum(len(v) - 1 for v in values)
+    s = math.sqrt((PRIOR_DF * prior_sd ** 2 + sum_squares) / (PRIOR_DF + df))
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return np.array([z * s / math.sqrt(len(v)) for v in values])
+
+
+def contested(
+    composite: np.ndarray,
+    composite_hw: np.ndarray,
+    innovation: np.ndarray,
+    innovation_hw: np.ndarray,
+    tiers: list[str],
+    tier_cutoffs: tuple[float, ...],
+    split_tiers: np.ndarray | None = None,
+) -> np.ndarray:
+    """Boolean mask of proposals whose tier or top-pick decision is not yet separated.
+
+    Args:
+        composite, composite_hw: Composite means and interval half-widths.
+        innovation, innovation_hw: Innovation means and half-widths.
+        tiers: Current tier of each proposal.
+        tier_cutoffs: Innovation cutoffs between tiers (empty when tiers are
+            the ranker's labels).
+        split_tiers: Proposals whose samples disagree on the tier label.
+    """
+    flags = np.zeros(len(composite), dtype=bool) if split_tiers is None else split_tiers.copy()
+    for cutoff in tier_cutoffs:
+        flags |= (innovation - innovation_hw < cutoff) & (innovation + innovation_hw >= cutoff)
+
+    tiers = np.asarray(tiers)
+    for tier in set(tiers.tolist()):
+        members = np.flatnonzero(tiers == tier)
+        leader = members[np.argmax(composite[members])]
+        rivals = members[composite[members] + composite_hw[members] >= composite[leader] - composite_hw[leader]]
+        if len(rivals) > 1:
+            flags[rivals] = True
+    return flags
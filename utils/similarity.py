@@ -0,0 +1,96 @@
+"""Local, LLM-free near-duplicate detection for proposals.
+
+Proposals are reduced to word shingles over their structural content
+(components, data flow, key innovations), summarized with MinHash
+signatures, and bucketed with LSH banding so that only likely duplicates
+are compared pairwise.
+"""
+
+import random
+import re
+import zlib
+
+from models.schemas import Proposal
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def proposal_text(p: Proposal) -> str:
+    """Serialize the structural parts of a proposal used for similarity."""
+    parts = []
+    for c in p.components:
+        parts.append(f"component {c.name} {c.role} {c.technology_suggestion or ''}")
+    for step in p.data_flow:
+        parts.append(
+            f"flow {step.from_component} {step.to_component} {step.pattern} {step.description}"
+        )
+    for innovation in p.key_innovations:
+        parts.append(f"innovation {innovation}")
+    return "\n".join(parts)
+
+
+def shingles(text: str, k: int = 3) -> set[str]:
+    """Word k-gram shingles of lowercased text."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < k:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+class MinHasher:
+    """MinHash signatures using universal hashing (a*x + b) mod p."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set: set[str]) -> list[int]:
+        """MinHash signature of a shingle set (all-max for the empty set)."""
+        if not shingle_set:
+            return [_MAX_HASH] * self.num_perm
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingle_set]
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        ]
+
+
+def estimate_jaccard(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimated Jaccard similarity: fraction of matching signature slots."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class LshIndex:
+    """LSH banding index over MinHash signatures.
+
+    With `bands` bands of `rows` rows each, two signatures become candidates
+    when any band matches exactly; the detection threshold is roughly
+    (1 / bands) ** (1 / rows).
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: list[dict[tuple[int, ...], list[str]]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, sig: list[int]):
+        for i in range(self.bands):
+            yield i, tuple(sig[i * self.rows:(i + 1) * self.rows])
+
+    def add(self, key: str, sig: list[int]) -> None:
+        for i, band in self._band_keys(sig):
+            self._buckets[i].setdefault(band, []).append(key)
+
+    def candidates(self, sig: list[int]) -> set[str]:
+        found: set[str] = set()
+        for i, band in self._band_keys(sig):
+            found.update(self._buckets[i].get(band, ()))
+        return found
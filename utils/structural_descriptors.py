@@ -0,0 +1,167 @@
+"""Local, LLM-free structural descriptors for proposals.
+
+Derives structural metrics directly from `Proposal.components` and
+`Proposal.data_flow`: component count, flow-graph depth, fan-in/fan-out,
+cycle presence and the asynchronous (pub-sub, event, push) versus
+synchronous (request-response, pull) pattern mix. The diversity archive
+uses them as behavioral descriptors, and the component-count rubric
+replaces the LLM-scored `structural_complexity` in local scoring modes.
+"""
+
+from pydantic import BaseModel
+
+from models.schemas import Proposal
+
+# Upper bounds of the structural_complexity rubric levels 1-4 (component counts);
+# anything larger is level 5. Mirrors the DiversityScores field description.
+_COMPLEXITY_BOUNDS = (4, 7, 12, 18)
+
+_ASYNC_MARKERS = ("pub-sub", "pub/sub", "pubsub", "publish", "subscribe", "event",
+                  "stream", "push", "async", "queue", "broadcast", "message")
+_SYNC_MARKERS = ("request", "response", "rpc", "pull", "query", "sync", "http",
+                 "rest", "call", "poll")
+
+
+class StructuralMetrics(BaseModel):
+    """Structural metrics of one proposal's component/data-flow graph."""
+    component_count: int
+    flow_steps: int
+    flow_depth: int  # Longest chain of flow edges, counting each cycle once
+    max_fan_in: int
+    max_fan_out: int
+    has_cycle: bool
+    async_ratio: float  # Share of classified flow steps that are async (0.5 if none)
+
+    @property
+    def complexity_level(self) -> int:
+        """The 1-5 structural_complexity rubric level for the component count."""
+        for level, bound in enumerate(_COMPLEXITY_BOUNDS, start=1):
+            if self.component_count <= bound:
+                return level
+        return 5
+
+    def descriptors(self) -> dict[str, float]:
+        """Named descriptor values for the diversity archive's behavior space."""
+        return {
+            "component_count": float(self.component_count),
+            "flow_depth": float(self.flow_depth),
+            "max_fan_in": float(self.max_fan_in),
+            "max_fan_out": float(self.max_fan_out),
+            "has_cycle": float(self.has_cycle),
+            "async_ratio": self.async_ratio,
+            "structural_level": float(self.complexity_level),
+        }
+
+
+def classify_pattern(pattern: str) -> str | None:
+    """Classify a data flow pattern as "async", "sync", or None if unrecognized.
+
+    Async markers win, so e.g. "async request" counts as async.
+    """
+    text = pattern.lower()
+    if any(marker in text for marker in _ASYNC_MARKERS):
+        return "async"
+    if any(marker in text for marker in _SYNC_MARKERS):
+        return "sync"
+    return None
+
+
+def _strongly_connected(nodes: list[str], edges: dict[str, set[str]]) -> dict[str, int]:
+    """Map each node to its strongly connected component id (iterative Tarjan)."""
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    component: dict[str, int] = {}
+    counter = 0
+    n_components = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(edges[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for succ in successors:
+                if succ not in index:
+                    index[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(edges[succ])))
+                    advanced = True
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component[member] = n_components
+                    if member == node:
+                        break
+                n_components += 1
+    return component
+
+
+def structural_metrics(p: Proposal) -> StructuralMetrics:
+    """Compute structural metrics from a proposal's components and data flow.
+
+    Flow endpoints that are not listed as components still count as graph
+    nodes. Depth is the longest path in the condensation graph (each cycle
+    collapsed to a single node), measured in edges.
+    """
+    nodes = [c.name for c in p.components]
+    edges: dict[str, set[str]] = {name: set() for name in nodes}
+    for step in p.data_flow:
+        for name in (step.from_component, step.to_component):
+            if name not in edges:
+                edges[name] = set()
+                nodes.append(name)
+        edges[step.from_component].add(step.to_component)
+
+    fan_in: dict[str, int] = {name: 0 for name in nodes}
+    for successors in edges.values():
+        for succ in successors:
+            fan_in[succ] += 1
+
+    scc = _strongly_connected(nodes, edges)
+    has_cycle = len(set(scc.values())) < len(nodes) or any(
+        name in successors for name, successors in edges.items()
+    )
+
+    # Longest path over the condensation DAG. Tarjan emits components in
+    # reverse topological order, so successors always have lower ids.
+    dag: dict[int, set[int]] = {}
+    for name, successors in edges.items():
+        for succ in successors:
+            if scc[name] != scc[succ]:
+                dag.setdefault(scc[name], set()).add(scc[succ])
+    depth: dict[int, int] = {}
+    for scc_id in sorted(set(scc.values())):
+        depth[scc_id] = max((depth[s] + 1 for s in dag.get(scc_id, ())), default=0)
+
+    kinds = [classify_pattern(step.pattern) for step in p.data_flow]
+    n_async = kinds.count("async")
+    n_classified = n_async + kinds.count("sync")
+
+    return StructuralMetrics(
+        component_count=len(p.components),
+        flow_steps=len(p.data_flow),
+        flow_depth=max(depth.values(), default=0),
+        max_fan_in=max(fan_in.values(), default=0),
+        max_fan_out=max((len(s) for s in edges.values()), default=0),
+        has_cycle=has_cycle,
+        async_ratio=n_async / n_classified if n_classified else 0.5,
+    )
@@ -0,0 +1,410 @@
+"""Local text indexes over markdown documents, cached on disk per corpus version.
+
+`TfidfIndex`: markdown files are split into sections at `## ` headings; each
+section is a document. Section vectors use sublinear term frequency times
+smoothed IDF and are L2-normalized, so `similarities()` returns cosine
+similarities in [0, 1].
+
+`Bm25Index`: sections are cut further into chunks of a few hundred tokens
+(`split_chunks`) and stored as an inverted index (term -> postings of
+chunk ids and term frequencies). `top_chunks()` ranks chunks by Okapi
+BM25 and picks the best ones within a token budget, for retrieval instead
+of whole-file injection.
+
+Fitted indexes are saved as compressed .npz files keyed by a hash of the
+source files' names and contents, so they are rebuilt only when the
+knowledge base changes.
+"""
+
+import hashlib
+import logging
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_HEADING_RE = re.compile(r"^## +(.+)$", re.M)
+_STOPWORDS = frozenset("""
+a an and are as at be by can for from has have in into is it its of on or that the
+their them then there these this to was were which will with within without via
+e g eg ie not no more most than such each all any also but so if when where while
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased alphanumeric tokens, minus stopwords and single characters."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def split_sections(path: Path) -> list[tuple[str, str]]:
+    """Split a markdown file into (label, text) sections at `## ` headings.
+
+    Text before the first heading is kept as its own section.
+    """
+    text = path.read_text(encoding="utf-8")
+    matches = list(_HEADING_RE.finditer(text))
+    sections = []
+    preamble = text[:matches[0].start()] if matches else text
+    if preamble.strip():
+        sections.append((path.stem, preamble))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections.append((f"{path.stem}#{match.group(1).strip()}", text[match.start():end]))
+    return sections
+
+
+def split_chunks(path: Path, chunk_tokens: int = 250) -> list[tuple[str, str]]:
+    """Split a markdown file into (label, text) chunks of about `chunk_tokens` tokens.
+
+    Each `## ` section is cut at its top-level lines (unindented bullets or
+    paragraphs, keeping their nested lines) and consecutive blocks are
+    packed up to the size. Every chunk starts with its section heading so
+    it reads on its own; the document title is dropped.
+    """
+    chunks = []
+    for label, text in split_sections(path):
+        lines = [line for line in text.strip().splitlines() if line.strip() and not line.startswith("# ")]
+        heading = lines[0] if lines and lines[0].startswith("## ") else ""
+        blocks: list[list[str]] = []
+        for line in lines[1:] if heading else lines:
+            if blocks and line[:1].isspace():
+                blocks[-1].append(line)
+            else:
+                blocks.append([line])
+
+        current: list[str] = []
+        size = 0
+        for block in ("\n".join(b) for b in blocks):
+            tokens = estimate_tokens(block)
+            if current and size + tokens > chunk_tokens:
+                chunks.append((label, "\n".join([heading, *current]).strip()))
+                current, size = [], 0
+            current.append(block)
+            size += tokens
+        if current:
+            chunks.append((label, "\n".join([heading, *current]).strip()))
+    return chunks
+
+
+def corpus_version(paths: list[Path]) -> str:
+    """Hash of the source files' names and contents (the cache key)."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class TfidfIndex:
+    """TF-IDF vectors for labeled document sections, grouped by source kind."""
+
+    def __init__(
+        self,
+        vocabulary: list[str],
+        idf: np.ndarray,
+        matrix: np.ndarray,
+        labels: list[str],
+        kinds: list[str],
+        version: str = "",
+    ):
+        self.vocabulary = vocabulary
+        self.term_ids = {term: i for i, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.matrix = matrix
+        self.labels = labels
+        self.kinds = np.array(kinds)
+        self.version = version
+
+    @classmethod
+    def fit(cls, documents: list[tuple[str, str, str]], version: str = "") -> "TfidfIndex":
+        """Fit on (kind, label, text) documents."""
+        tokenized = [tokenize(text) for _, _, text in documents]
+        vocabulary = sorted({t for tokens in tokenized for t in tokens})
+        term_ids = {term: i for i, term in enumerate(vocabulary)}
+
+        counts = np.zeros((len(documents), len(vocabulary)), dtype=np.float64)
+        for row, tokens in enumerate(tokenized):
+            for token in tokens:
+                counts[row, term_ids[token]] += 1
+
+        df = (counts > 0).sum(axis=0)
+        idf = np.log((1 + len(documents)) / (1 + df)) + 1.0
+        matrix = _l2_normalize(np.log1p(counts) * idf)
+        return cls(
+            vocabulary, idf, matrix,
+            labels=[label for _, label, _ in documents],
+            kinds=[kind for kind, _, _ in documents],
+            version=version,
+        )
+
+    def vectorize(self, text: str) -> np.ndarray:
+        """TF-IDF vector of a query in this index's vocabulary (unknown terms dropped)."""
+        vec = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for token in tokenize(text):
+            i = self.term_ids.get(token)
+            if i is not None:
+                vec[i] += 1
+        return _l2_normalize((np.log1p(vec) * self.idf)[None, :])[0]
+
+    def similarities(self, text: str, kind: str | None = None) -> tuple[np.ndarray, list[str]]:
+        """Cosine similarity of `text` to every section (optionally of one kind)."""
+        mask = np.ones(len(self.labels), dtype=bool) if kind is None else self.kinds == kind
+        sims = self.matrix[mask] @ self.vectorize(text)
+        labels = [label for label, keep in zip(self.labels, mask) if keep]
+        return sims, labels
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            vocabulary=np.array(self.vocabulary),
+            idf=self.idf,
+            matrix=self.matrix,
+            labels=np.array(self.labels),
+            kinds=self.kinds,
+            version=np.array(self.version),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TfidfIndex":
+        with np.load(path) as data:
+            return cls(
+                data["vocabulary"].tolist(),
+                data["idf"],
+                data["matrix"],
+                labels=data["labels"].tolist(),
+                kinds=data["kinds"].tolist(),
+                version=str(data["version"]),
+            )
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def load_or_build_index(
+    sources: dict[str, list[Path]],
+    cache_dir: Path | None = None,
+) -> TfidfIndex:
+    """Build (or load from cache) an index over markdown files grouped by kind.
+
+    Args:
+        sources: Maps a kind (e.g. "pattern", "status_quo") to its markdown files.
+        cache_dir: Where fitted indexes are cached, keyed by corpus version.
+                   None disables caching.
+    """
+    paths = [p for files in sources.values() for p in files]
+    version = corpus_version(paths)
+    cache_path = Path(cache_dir) / f"text_index_{version}.npz" if cache_dir else None
+
+    if cache_path is not None and cache_path.exists():
+        try:
+            return TfidfIndex.load(cache_path)
+        except Exception as e:
+            logger.warning(f"Could not load cached text index {cache_path} ({e}); rebuilding.")
+
+    documents = [
+        (kind, label, text)
+        for kind, files in sources.items()
+        for path in sorted(files)
+        for label, text in split_sections(path)
+    ]
+    index = TfidfIndex.fit(documents, version=version)
+    logger.info(
+        f"Built text index over {len(documents)} sections from {len(paths)} files "
+        f"({len(index.vocabulary)} terms, version {version})"
+    )
+    if cache_path is not None:
+        index.save(cache_path)
+    return index
+
+
+class Bm25Index:
+    """Okapi BM25 over text chunks, grouped by source kind (inverted index)."""
+
+    def __init__(
+        self,
+        vocabulary: list[str],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        term_freqs: np.ndarray,
+        doc_lengths: np.ndarray,
+        labels: list[str],
+        kinds: list[str],
+        texts: list[str],
+        version: str = "",
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.vocabulary = vocabulary
+        self.term_ids = {term: i for i, term in enumerate(vocabulary)}
+        # Postings of term i: doc_ids / term_freqs[indptr[i]:indptr[i + 1]]
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.labels = labels
+        self.kinds = np.array(kinds)
+        self.texts = texts
+        self.version = version
+        self.k1 = k1
+        self.b = b
+
+        n = len(texts)
+        df = np.diff(indptr)
+        self.idf = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        avg_length = doc_lengths.mean() if n else 1.0
+        self._length_norm = k1 * (1 - b + b * doc_lengths / max(avg_length, 1e-9))
+        self.tokens = np.array([estimate_tokens(t) for t in texts], dtype=np.int64)
+
+    @classmethod
+    def fit(cls, documents: list[tuple[str, str, str]], version: str = "", **params) -> "Bm25Index":
+        """Fit on (kind, label, text) chunks."""
+        tokenized = [tokenize(text) for _, _, text in documents]
+        vocabulary = sorted({t for tokens in tokenized for t in tokens})
+        term_ids = {term: i for i, term in enumerate(vocabulary)}
+
+        terms, docs, freqs = [], [], []
+        for doc, tokens in enumerate(tokenized):
+            for term, count in Counter(tokens).items():
+                terms.append(term_ids[term])
+                docs.append(doc)
+                freqs.append(count)
+        terms_arr = np.array(terms, dtype=np.int64)
+        order = np.lexsort((np.array(docs, dtype=np.int64), terms_arr))
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(terms_arr, minlength=len(vocabulary)))])
+        return cls(
+            vocabulary,
+            indptr.astype(np.int64),
+            np.array(docs, dtype=np.int64)[order],
+            np.array(freqs, dtype=np.float64)[order],
+            np.array([len(tokens) for tokens in tokenized], dtype=np.float64),
+            labels=[label for _, label, _ in documents],
+            kinds=[kind for kind, _, _ in documents],
+            texts=[text for _, _, text in documents],
+            version=version,
+            **params,
+        )
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every chunk for `query` (each distinct query term counted once)."""
+        scores = np.zeros(len(self.texts), dtype=np.float64)
+        for term in set(tokenize(query)):
+            i = self.term_ids.get(term)
+            if i is None:
+                continue
+            docs = self.doc_ids[self.indptr[i]:self.indptr[i + 1]]
+            tf = self.term_freqs[self.indptr[i]:self.indptr[i + 1]]
+            scores[docs] += self.idf[i] * tf * (self.k1 + 1) / (tf + self._length_norm[docs])
+        return scores
+
+    def top_chunks(
+        self,
+        query: str,
+        kinds: set[str] | None = None,
+        top_k: int = 6,
+        token_budget: int | None = None,
+    ) -> list[int]:
+        """Ids of the best-scoring chunks (optionally of some kinds), in document order.
+
+        Chunks are taken by descending score; one that would overflow the
+        token budget is skipped in favour of smaller, lower-ranked ones.
+        Chunks sharing no term with the query are never returned.
+        """
+        scores = self.scores(query)
+        if kinds is not None:
+            scores[~np.isin(self.kinds, list(kinds))] = 0.0
+        picked: list[int] = []
+        remaining = token_budget if token_budget is not None else float("inf")
+        for i in np.argsort(-scores, kind="stable"):
+            if len(picked) >= top_k or scores[i] <= 0:
+                break
+            if self.tokens[i] <= remaining:
+                picked.append(int(i))
+                remaining -= self.tokens[i]
+        return sorted(picked)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            vocabulary=np.array(self.vocabulary),
+            indptr=self.indptr,
+            doc_ids=self.doc_ids,
+            term_freqs=self.term_freqs,
+            doc_lengths=self.doc_lengths,
+            labels=np.array(self.labels),
+            kinds=self.kinds,
+            texts=np.array(self.texts),
+            version=np.array(self.version),
+            params=np.array([self.k1, self.b]),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Bm25Index":
+        with np.load(path) as data:
+            k1, b = data["params"].tolist()
+            return cls(
+                data["vocabulary"].tolist(),
+                data["indptr"],
+                data["doc_ids"],
+                data["term_freqs"],
+                data["doc_lengths"],
+                labels=data["labels"].tolist(),
+                kinds=data["kinds"].tolist(),
+                texts=data["texts"].tolist(),
+                version=str(data["version"]),
+                k1=k1,
+                b=b,
+            )
+
+
+def load_or_build_chunk_index(
+    sources: dict[str, list[Path]],
+    cache_dir: Path | None = None,
+    chunk_tokens: int = 250,
+) -> Bm25Index:
+    """Build (or load from cache) a BM25 chunk index over markdown files grouped by kind.
+
+    Args:
+        sources: Maps a kind (e.g. a knowledge-base file stem) to its markdown files.
+        cache_dir: Where fitted indexes are cached, keyed by corpus version
+                   and chunk size. None disables caching.
+        chunk_tokens: Approximate chunk size.
+    """
+    paths = [p for files in sources.values() for p in files]
+    version = f"{corpus_version(paths)}-{chunk_tokens}"
+    cache_path = Path(cache_dir) / f"bm25_index_{version}.npz" if cache_dir else None
+
+    if cache_path is not None and cache_path.exists():
+        try:
+            return Bm25Index.load(cache_path)
+        except Exception as e:
+            logger.warning(f"Could not load cached chunk index {cache_path} ({e}); rebuilding.")
+
+    documents = [
+        (kind, label, text)
+        for kind, files in sources.items()
+        for path in sorted(files)
+        for label, text in split_chunks(path, chunk_tokens)
+    ]
+    index = Bm25Index.fit(documents, version=version)
+    logger.info(
+        f"Built BM25 chunk index over {len(documents)} chunks from {len(paths)} files "
+        f"({len(index.vocabulary)} terms, version {version})"
+    )
+    if cache_path is not None:
+        index.save(cache_path)
+    return index
@@ -0,0 +1,10 @@
+"""Token estimates for prompt budgeting.
+
+Kept free of LLM-client imports, so budgeting helpers (utils/text_index.py,
+utils/debate_context.py) can be imported without loading config or litellm.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for prompt budgeting."""
+    return len(text) // 4 + 1
@@ -0,0 +1,131 @@
+"""Bounded, prioritized async work pool with retry and streaming results.
+
+A fixed number of workers pull jobs from a priority queue (lower priority
+value first, FIFO within a priority). A job that raises is re-enqueued
+after an exponential backoff with full jitter until it has used
+`max_attempts`; only then is it reported as failed. Results are streamed
+from `as_completed()` as jobs finish, and jobs may be submitted while the
+pool is running (e.g. follow-up work derived from an earlier result).
+
+    pool = WorkPool(max_workers=4)
+    pool.submit(lambda: call_llm(...), priority=0, key="a")
+    async for result in pool.as_completed():
+        ...
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class WorkResult(NamedTuple):
+    """Outcome of one job: `value` on success, `error` after the last failed attempt."""
+    key: Hashable
+    value: Any
+    error: BaseException | None
+    attempts: int
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class WorkPool:
+    """Runs submitted coroutine factories on at most `max_workers` workers."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_attempts: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        name: str = "work pool",
+        seed: int | None = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.name = name
+        self.retries = 0
+        self._rng = random.Random(seed)
+        self._counter = itertools.count()
+        self._queue: asyncio.PriorityQueue | None = None
+        self._results: asyncio.Queue | None = None
+        self._pending: list[tuple] = []  # Jobs submitted before the pool started
+        self._outstanding = 0  # Submitted jobs without a final result yet
+
+    def submit(
+        self,
+        job: Callable[[], Awaitable[Any]],
+        priority: float = 0,
+        key: Hashable = None,
+    ) -> None:
+        """Queue a job. `job` is called (once per attempt) to create the coroutine."""
+        self._outstanding += 1
+        entry = (priority, next(self._counter), key, job, 1)
+        if self._queue is None:
+            self._pending.append(entry)
+        else:
+            self._queue.put_nowait(entry)
+
+    def _backoff(self, attempt: int) -> float:
+        return self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    async def _requeue_later(self, entry: tuple, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._queue.put_nowait(entry)
+
+    async def _worker(self, timers: set[asyncio.Task]) -> None:
+        while True:
+            priority, seq, key, job, attempt = await self._queue.get()
+            try:
+                value = await job()
+            except Exception as e:
+                if attempt < self.max_attempts:
+                    delay = self._backoff(attempt)
+                    self.retries += 1
+                    logger.warning(
+                        f"{self.name}: job {key!r} failed (attempt {attempt}/{self.max_attempts}: "
+                        f"{e}); retrying in {delay:.1f}s"
+                    )
+                    timer = asyncio.create_task(self._requeue_later(
+                        (priority, seq, key, job, attempt + 1), delay,
+                    ))
+                    timers.add(timer)
+                    timer.add_done_callback(timers.discard)
+                else:
+                    self._results.put_nowait(WorkResult(key, None, e, attempt))
+            else:
+                self._results.put_nowait(WorkResult(key, value, None, attempt))
+            finally:
+                self._queue.task_done()
+
+    async def as_completed(self) -> AsyncIterator[WorkResult]:
+        """Run the pool, yielding each job's final result as it completes.
+
+        Returns once every submitted job (including jobs submitted while
+        iterating) has a result.
+        """
+        self._queue = asyncio.PriorityQueue()
+        self._results = asyncio.Queue()
+        for entry in self._pending:
+            self._queue.put_nowait(entry)
+        self._pending.clear()
+
+        timers: set[asyncio.Task] = set()
+        workers = [asyncio.create_task(self._worker(timers)) for _ in range(self.max_workers)]
+        try:
+            while self._outstanding > 0:
+                result = await self._results.get()
+                self._outstanding -= 1
+                yield result
+        finally:
+            for task in [*workers, *timers]:
+                task.cancel()
+            await asyncio.gather(*workers, *timers, return_exceptions=True)
+            self._queue = self._results = None